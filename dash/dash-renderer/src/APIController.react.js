@@ -134,7 +134,21 @@ const UnconnectedContainer = props => {
     );
 };
 
-function storeEffect(props, events, setErrorLoading) {
+/**
+ * Layout or callback graph embedded in the index page by the server with
+ * `inline_initial_data`. The element is removed so it is only used once,
+ * later reloads fetch the current data.
+ */
+function takeInlineData(id) {
+    const element = document.getElementById(id);
+    if (!element) {
+        return null;
+    }
+    element.remove();
+    return JSON.parse(element.textContent);
+}
+
+export function storeEffect(props, events, setErrorLoading) {
     const {
         appLifecycle,
         dependenciesRequest,
@@ -151,7 +165,15 @@ function storeEffect(props, events, setErrorLoading) {
             if (typeof hooks.layout_pre === 'function') {
                 hooks.layout_pre();
             }
-            dispatch(apiThunk('_dash-layout', 'GET', 'layoutRequest'));
+            const inlineLayout = takeInlineData('_dash-inline-layout');
+            if (inlineLayout) {
+                dispatch({
+                    type: 'layoutRequest',
+                    payload: {status: STATUS.OK, content: inlineLayout}
+                });
+            } else {
+                dispatch(apiThunk('_dash-layout', 'GET', 'layoutRequest'));
+            }
         } else if (layoutRequest.status === STATUS.OK) {
             if (isEmpty(layout)) {
                 if (typeof hooks.layout_post === 'function') {
@@ -171,9 +193,19 @@ function storeEffect(props, events, setErrorLoading) {
         }
 
         if (isEmpty(dependenciesRequest)) {
-            dispatch(
-                apiThunk('_dash-dependencies', 'GET', 'dependenciesRequest')
+            const inlineDependencies = takeInlineData(
+                '_dash-inline-dependencies'
             );
+            if (inlineDependencies) {
+                dispatch({
+                    type: 'dependenciesRequest',
+                    payload: {status: STATUS.OK, content: inlineDependencies}
+                });
+            } else {
+                dispatch(
+                    apiThunk('_dash-dependencies', 'GET', 'dependenciesRequest')
+                );
+            }
         } else if (
             dependenciesRequest.status === STATUS.OK &&
             (isEmpty(graphs) || graphs.reset)
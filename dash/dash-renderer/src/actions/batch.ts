@@ -0,0 +1,89 @@
+import {urlBase} from './utils';
+
+type Queued = {
+    init: RequestInit;
+    resolve: (res: Response) => void;
+    reject: (err: Error) => void;
+};
+
+type BatchItem = {
+    status: number;
+    data: any;
+};
+
+// the callbacks fired together on page load are sent as one request
+let initialLoad = true;
+let queued: Queued[] | null = null;
+
+function itemResponse({status, data}: BatchItem): Response {
+    if (status === 204) {
+        return new Response(null, {status});
+    }
+    return status === 200
+        ? new Response(JSON.stringify(data), {
+              status,
+              headers: {'Content-Type': 'application/json'}
+          })
+        : new Response(data, {status});
+}
+
+function send(config: any, requests: Queued[]) {
+    const [first] = requests;
+    if (requests.length === 1) {
+        fetch(`${urlBase(config)}_dash-update-component`, first.init).then(
+            first.resolve,
+            first.reject
+        );
+        return;
+    }
+
+    fetch(`${urlBase(config)}_dash-update-component-batch`, {
+        ...first.init,
+        body: `[${requests.map(({init}) => init.body).join(',')}]`
+    })
+        .then(async res => {
+            if (res.status !== 200) {
+                // answered like each request got the same error
+                const text = await res.text();
+                requests.forEach(({resolve}) =>
+                    resolve(new Response(text, {status: res.status}))
+                );
+                return;
+            }
+            const items: BatchItem[] = await res.json();
+            requests.forEach(({resolve}, i) => resolve(itemResponse(items[i])));
+        })
+        .catch(err => requests.forEach(({reject}) => reject(err)));
+}
+
+/**
+ * Queue a `_dash-update-component` request of the initial load. The ones
+ * made before the next task are sent together to
+ * `_dash-update-component-batch` and each gets its own `Response` back.
+ * Returns `null` once the initial load is over or when the server has no
+ * batch endpoint, the request is then sent on its own.
+ */
+export function requestInBatch(
+    config: any,
+    init: RequestInit
+): Promise<Response> | null {
+    if (!config.batch_callbacks || !initialLoad) {
+        return null;
+    }
+    if (!queued) {
+        const requests: Queued[] = (queued = []);
+        setTimeout(() => {
+            initialLoad = false;
+            queued = null;
+            // the server refuses batches above its `max_batch_size`
+            const size = config.max_batch_size || requests.length;
+            for (let i = 0; i < requests.length; i += size) {
+                send(config, requests.slice(i, i + size));
+            }
+        }, 0);
+    }
+    const requests = queued;
+    return new Promise((resolve, reject) =>
+        requests.push({init, resolve, reject})
+    );
+}
@@ -45,6 +45,8 @@ import {handlePatch, isPatch} from './patch';
 import {getPath} from './paths';
 
 import {requestDependencies} from './requestDependencies';
+import {getSocket} from './socket';
+import {requestInBatch} from './batch';
 
 import {loadLibrary} from '../utils/libraries';
 
@@ -52,6 +54,11 @@ import {parsePMCId} from './patternMatching';
 import {replacePMC} from './patternMatching';
 import {loaded, loading} from './loading';
 
+// Identifies this page to the server, lets it drop superseded callback requests
+const CLIENT_ID_HEADER = 'X-Dash-Client-Id';
+const CLIENT_ID =
+    Math.random().toString(36).slice(2) + Date.now().toString(36);
+
 export const addBlockedCallbacks = createAction<IBlockedCallback[]>(
     CallbackActionType.AddBlocked
 );
@@ -443,6 +450,7 @@ function handleServerside(
 
     const fetchCallback = () => {
         const headers = getCSRFHeader() as any;
+        headers[CLIENT_ID_HEADER] = CLIENT_ID;
         let url = `${urlBase(config)}_dash-update-component`;
         let newBody = body;
 
@@ -473,14 +481,25 @@ function handleServerside(
             moreArgs = moreArgs.filter(([_, __, single]) => !single);
         }
 
-        return fetch(
-            url,
-            mergeDeepRight(config.fetch, {
-                method: 'POST',
-                headers,
-                body: newBody
-            })
-        );
+        if (config.websocket && !background && url.indexOf('?') < 0) {
+            return getSocket(config).request(newBody, {
+                ...config.fetch?.headers,
+                ...headers
+            });
+        }
+
+        const init = mergeDeepRight(config.fetch, {
+            method: 'POST',
+            headers,
+            body: newBody
+        });
+        if (!background && url.indexOf('?') < 0) {
+            const batched = requestInBatch(config, init);
+            if (batched) {
+                return batched;
+            }
+        }
+        return fetch(url, init);
     };
 
     return new Promise((resolve, reject) => {
@@ -612,7 +631,11 @@ function handleServerside(
                         );
                     }
                 });
-            } else if (status === STATUS.PREVENT_UPDATE) {
+            } else if (
+                status === STATUS.PREVENT_UPDATE ||
+                status === STATUS.TOO_MANY_REQUESTS ||
+                status === STATUS.SERVICE_UNAVAILABLE
+            ) {
                 completeJob();
                 recordProfile({});
                 resolve({});
@@ -0,0 +1,128 @@
+import {urlBase} from './utils';
+
+type Pending = {
+    resolve: (res: Response) => void;
+    reject: (err: Error) => void;
+};
+type Listener = (data: string) => void;
+
+/**
+ * The websocket of the page when the app runs with `websocket=True`. It
+ * carries the callback requests and the `event_callback` streams, each
+ * message of the server is a JSON header line with its type and the id of
+ * the request or stream, followed by the raw payload.
+ */
+class FlashSocket {
+    private opened: Promise<WebSocket> | null = null;
+    private pending = new Map<string, Pending>();
+    private streams = new Map<string, Listener>();
+    private counter = 0;
+
+    constructor(private readonly url: string) {}
+
+    private connect(): Promise<WebSocket> {
+        if (!this.opened) {
+            this.opened = new Promise((resolve, reject) => {
+                const socket = new WebSocket(this.url);
+                socket.onopen = () => resolve(socket);
+                socket.onmessage = (e: MessageEvent) => this.receive(e.data);
+                socket.onclose = () => {
+                    reject(new Error('Websocket closed'));
+                    this.closed();
+                };
+            });
+        }
+        return this.opened;
+    }
+
+    private closed() {
+        this.opened = null;
+        // answered like a failed fetch, the next request opens a new socket
+        this.pending.forEach(({reject}) =>
+            reject(new Error('Websocket closed'))
+        );
+        this.pending.clear();
+        this.streams.forEach(listener => listener('[DONE]'));
+        this.streams.clear();
+    }
+
+    private receive(text: string) {
+        const split = text.indexOf('\n');
+        const header = JSON.parse(split < 0 ? text : text.slice(0, split));
+        const payload = split < 0 ? '' : text.slice(split + 1);
+        const {type, id} = header;
+
+        const request = this.pending.get(id);
+        if (request) {
+            this.pending.delete(id);
+            // a cancelled request is a prevented update
+            const status =
+                type === 'response'
+                    ? header.status
+                    : type === 'cancel'
+                    ? 204
+                    : 500;
+            request.resolve(
+                new Response(status === 204 ? null : payload, {
+                    status,
+                    headers: {'Content-Type': 'application/json'}
+                })
+            );
+            return;
+        }
+
+        const listener = this.streams.get(id);
+        if (listener) {
+            if (type === 'event') {
+                listener(payload);
+            } else {
+                this.streams.delete(id);
+                listener('[DONE]');
+            }
+        }
+    }
+
+    private send(message: string) {
+        return this.connect().then(socket => socket.send(message));
+    }
+
+    request(body: string, headers: Record<string, string>): Promise<Response> {
+        const id = `${++this.counter}`;
+        return new Promise((resolve, reject) => {
+            this.pending.set(id, {resolve, reject});
+            // the body is already JSON, no need to parse it again
+            this.send(
+                `{"type":"callback","id":"${id}","headers":${JSON.stringify(
+                    headers
+                )},"body":${body}}`
+            ).catch(err => {
+                this.pending.delete(id);
+                reject(err);
+            });
+        });
+    }
+
+    start(content: any, listener: Listener): string {
+        const id = `s${++this.counter}`;
+        this.streams.set(id, listener);
+        this.send(JSON.stringify({type: 'start', id, content})).catch(() =>
+            this.streams.delete(id)
+        );
+        return id;
+    }
+
+    stop(id: string) {
+        if (this.streams.delete(id) && this.opened) {
+            this.send(JSON.stringify({type: 'cancel', id}));
+        }
+    }
+}
+
+const sockets: Record<string, FlashSocket> = {};
+
+export function getSocket(config: any): FlashSocket {
+    const url = new URL(`${urlBase(config)}_flash/ws`, window.location.href);
+    url.protocol = url.protocol === 'https:' ? 'wss:' : 'ws:';
+    const key = url.toString();
+    return (sockets[key] = sockets[key] || new FlashSocket(key));
+}
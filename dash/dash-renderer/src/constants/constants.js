@@ -10,6 +10,9 @@ export const STATUS = {
     // they reserve 401 for cases that require user action
     BAD_REQUEST: 400,
     UNAUTHORIZED: 401,
+    // Load shedding responses of a busy server, handled like PREVENT_UPDATE
+    TOO_MANY_REQUESTS: 429,
+    SERVICE_UNAVAILABLE: 503,
     CLIENTSIDE_ERROR: 'CLIENTSIDE_ERROR',
     NO_RESPONSE: 'NO_RESPONSE'
 };
@@ -4,6 +4,7 @@ import {getPath} from './actions/paths';
 import {getStores} from './utils/stores';
 import ExternalWrapper from './wrapper/ExternalWrapper';
 import {stringifyId} from './actions/dependencies';
+import {getSocket} from './actions/socket';
 
 /**
  * Get the dash props from a component path or id.
@@ -29,10 +30,18 @@ function getLayout(componentPathOrId: string[] | string): any {
     }
 }
 
+/**
+ * The websocket of the page, for components streaming over it.
+ */
+function getPageSocket() {
+    return getSocket(getStores()[0].getState().config);
+}
+
 (window as any).dash_component_api = {
     ExternalWrapper,
     DashContext,
     useDashContext,
     getLayout,
-    stringifyId
+    stringifyId,
+    getSocket: getPageSocket
 };
@@ -0,0 +1,73 @@
+import {expect} from 'chai';
+import {afterEach, describe, it} from 'mocha';
+import {storeEffect} from '../src/APIController.react';
+import {STATUS} from '../src/constants/constants';
+import {getAppState} from '../src/reducers/constants';
+
+const addInlineData = (id, data) => {
+    const element = document.createElement('script');
+    element.id = id;
+    element.type = 'application/json';
+    element.textContent = JSON.stringify(data);
+    document.body.appendChild(element);
+};
+
+const runStoreEffect = () => {
+    const actions = [];
+    storeEffect(
+        {
+            appLifecycle: getAppState('STARTED'),
+            dependenciesRequest: {},
+            dispatch: action => actions.push(action),
+            error: {frontEnd: [], backEnd: []},
+            graphs: {},
+            hooks: {},
+            layout: {},
+            layoutRequest: {}
+        },
+        {current: null},
+        () => {}
+    );
+    return actions;
+};
+
+describe('inline initial data', () => {
+    const ids = ['_dash-inline-layout', '_dash-inline-dependencies'];
+
+    afterEach(() => {
+        ids.forEach(id => {
+            const element = document.getElementById(id);
+            if (element) {
+                element.remove();
+            }
+        });
+    });
+
+    it('starts from the inlined data without fetching it', () => {
+        const layout = {type: 'Div', namespace: 'dash_html_components'};
+        const dependencies = [{output: 'out.children', inputs: []}];
+        addInlineData('_dash-inline-layout', layout);
+        addInlineData('_dash-inline-dependencies', dependencies);
+
+        expect(runStoreEffect()).to.deep.equal([
+            {
+                type: 'layoutRequest',
+                payload: {status: STATUS.OK, content: layout}
+            },
+            {
+                type: 'dependenciesRequest',
+                payload: {status: STATUS.OK, content: dependencies}
+            }
+        ]);
+        // later reloads fetch the current data
+        ids.forEach(id => expect(document.getElementById(id)).to.equal(null));
+    });
+
+    it('fetches the data when the page has none', () => {
+        const actions = runStoreEffect();
+
+        expect(actions).to.have.length(2);
+        // the `_dash-layout` and `_dash-dependencies` requests are thunks
+        actions.forEach(action => expect(action).to.be.a('function'));
+    });
+});
@@ -58,6 +58,11 @@ class SSE(Component):
         - debug (boolean; optional):
             - debugging flag.
 
+    - transport (a value equal to: 'sse', 'multiplex', 'websocket'; default 'sse'):
+        How the stream is received. `'sse'` opens a connection per stream,
+        `'multiplex'` shares one connection per page between every stream,
+        `'websocket'` streams over the websocket of the page.
+
     - update_component (boolean; optional):
         A boolean indicating if the strea, should update components.
 
@@ -93,6 +98,7 @@ class SSE(Component):
         value: typing.Optional[str] = None,
         done: typing.Optional[bool] = None,
         update_component: typing.Optional[bool] = None,
+        transport: typing.Optional[Literal["sse", "multiplex", "websocket"]] = None,
         **kwargs
     ):
         self._prop_names = [
@@ -100,6 +106,7 @@ class SSE(Component):
             "concat",
             "done",
             "options",
+            "transport",
             "update_component",
             "url",
             "value",
@@ -110,6 +117,7 @@ class SSE(Component):
             "concat",
             "done",
             "options",
+            "transport",
             "update_component",
             "url",
             "value",
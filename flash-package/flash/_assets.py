@@ -0,0 +1,66 @@
+import hashlib
+
+import quart
+from dash.fingerprint import build_fingerprint, check_fingerprint
+from dash.version import __version__
+
+# enough to tell apart every version of a file
+HASH_LENGTH = 16
+
+
+def content_hash(file_path):
+    with open(file_path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()[:HASH_LENGTH]
+
+
+class AssetManifest:
+    """
+    Content hashed names of the files in the assets folder, built by
+    `Flash._walk_assets_directory` and kept up to date by
+    `Flash._on_assets_change`.
+    """
+
+    def __init__(self):
+        self._fingerprints = {}
+
+    def update(self, asset_path, file_path):
+        if "." not in asset_path.rsplit("/", 1)[-1]:
+            # the fingerprint goes before the extension
+            return
+        try:
+            file_hash = content_hash(file_path)
+        except OSError:
+            self.remove(asset_path)
+            return
+        self._fingerprints[asset_path] = build_fingerprint(
+            asset_path, __version__, file_hash
+        )
+
+    def remove(self, asset_path):
+        self._fingerprints.pop(asset_path, None)
+
+    def get(self, asset_path):
+        """Fingerprinted path of `asset_path`, ``None`` if it isn't hashed."""
+        return self._fingerprints.get(asset_path)
+
+
+class AssetsBlueprint(quart.Blueprint):
+    """
+    Static blueprint of the assets folder, strips the fingerprints and lets
+    browsers keep the current versions of the files forever.
+    """
+
+    def __init__(self, *args, manifest: AssetManifest, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.manifest = manifest
+
+    async def send_static_file(self, filename):
+        asset_path, has_fingerprint = check_fingerprint(filename)
+        response = await super().send_static_file(asset_path)
+
+        # an outdated fingerprint gets the current file, revalidated as usual
+        if has_fingerprint and self.manifest.get(asset_path) == filename:
+            response.cache_control.public = True
+            response.cache_control.max_age = 31536000  # 1 year
+            response.cache_control.immutable = True
+        return response
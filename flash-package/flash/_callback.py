@@ -1,6 +1,9 @@
+import asyncio
 import collections
 import hashlib
-from functools import wraps
+import inspect
+import time
+from functools import partial, wraps
 
 from typing import Callable, Optional, Any, List, Tuple, Union
 
@@ -32,7 +35,6 @@ from dash._grouping import (
 from dash._utils import (
     create_callback_id,
     stringify_id,
-    to_json,
     coerce_to_list,
     AttributeDict,
     clean_property_name,
@@ -41,7 +43,12 @@ from dash._utils import (
 from dash import _validate
 from dash.background_callback.managers import BaseBackgroundCallbackManager
 from ._callback_context import context_value
-from ._utils import _invoke_callback
+from . import _json
+from . import _limits
+from . import _memoize
+from . import _metrics
+from ._memoize import CallbackCache
+from ._utils import _invoke_callback, _run_callback
 
 
 class NoUpdate:
@@ -77,6 +84,14 @@ def callback(
     api_endpoint: Optional[str] = None,
     optional: Optional[bool] = False,
     hidden: Optional[bool] = False,
+    memoize: Optional[Union[bool, int, dict, CallbackCache]] = None,
+    memoize_key: Optional[Union[Callable[[], Any], List[Callable[[], Any]]]] = None,
+    single_flight: bool = False,
+    executor: Optional[str] = None,
+    max_concurrency: Optional[int] = None,
+    max_queue: Optional[int] = None,
+    timeout: Optional[float] = None,
+    supersede: bool = False,
     **_kwargs,
 ):
     """
@@ -140,6 +155,53 @@ def callback(
             progress. If `progress_default` is not provided, all the dependency
             properties specified in `progress` will be set to `None` when the
             callback is not running.
+        :param memoize:
+            Cache the serialized responses of the callback, so identical requests
+            skip both the function and the response encoding. ``True`` uses an
+            in memory `CallbackCache` of 128 entries, an int sets its size, a dict
+            is passed to `CallbackCache` (``maxsize``, ``ttl``). Also accepts a
+            cache instance like `DiskcacheCallbackCache` to share responses between
+            processes. Keys follow ``cache_args_to_ignore`` and
+            ``cache_ignore_triggered``. Cookies and headers set on
+            ``ctx.response`` are not replayed on a cache hit.
+            The key ignores who sent the request, so a response is served to
+            every user: only memoize callbacks whose result is the same for
+            all of them, or set ``memoize_key``.
+        :param memoize_key:
+            Callable, or list of callables, called with the callback context
+            set. Their return values are part of the ``memoize`` key, so a
+            callback depending on the user is cached per user, e.g.
+            ``lambda: ctx.cookies.get("session")``.
+        :param single_flight:
+            Concurrent requests with the same inputs, outputs, cookies and
+            ``Authorization`` header await a single invocation of the callback
+            and share its response, including ``set_props`` updates and cookies
+            set on ``ctx.response``. Only for side effect free callbacks whose
+            result depends on nothing else of the request. Not used for
+            background callbacks.
+        :param executor:
+            Name of the executor running a synchronous callback: ``"threads"``,
+            ``"processes"`` or a name given to ``Flash(executors=...)``. By
+            default sync callbacks run in the event loop's default thread pool.
+            Callbacks in a process pool must be module level functions and can't
+            use ``callback_context`` or ``set_props``.
+        :param max_concurrency:
+            Maximum number of invocations of this callback running at the same
+            time, further requests wait for a free slot.
+        :param max_queue:
+            Maximum number of requests waiting for a slot when
+            ``max_concurrency`` is set. Requests beyond it get an empty 429
+            response, which the renderer treats like ``PreventUpdate``.
+        :param timeout:
+            Seconds the request may take, including the time waiting for a
+            ``max_concurrency`` slot. Once exceeded the callback is cancelled and
+            the request gets a 504. Overrides ``Flash(callback_timeout=...)``.
+            Sync callbacks running in a thread are abandoned, not stopped.
+        :param supersede:
+            Only keep the latest request per page for the same outputs: a newer
+            request cancels the one still running or queued, which returns an
+            empty 204. Pages are identified by the ``X-Dash-Client-Id`` header
+            the renderer sends, requests without it are never superseded.
         :param cache_args_to_ignore:
             Arguments to ignore when caching is enabled. If callback is configured
             with keyword arguments (Input/State provided in a dict),
@@ -221,6 +283,16 @@ def callback(
         api_endpoint=api_endpoint,
         optional=optional,
         hidden=hidden,
+        memoize=memoize,
+        memoize_key=memoize_key,
+        single_flight=single_flight,
+        executor=executor,
+        max_concurrency=max_concurrency,
+        max_queue=max_queue,
+        timeout=timeout,
+        supersede=supersede,
+        cache_args_to_ignore=cache_args_to_ignore,
+        cache_ignore_triggered=cache_ignore_triggered,
     )
 
 
@@ -305,6 +377,7 @@ def insert_callback(
         "background": background,
         "output": output,
         "raw_inputs": inputs,
+        "raw_state": state,
         "manager": manager,
         "allow_dynamic_callbacks": dynamic_creator,
         "no_output": no_output,
@@ -420,7 +493,7 @@ def _setup_background_callback(
         data["progressDefault"] = {
             str(o): x for o, x in zip(progress_outputs, progress_default)
         }
-    return to_json(data)
+    return _json.dumps(data)
 
 
 def _progress_background_callback(response, callback_manager, background):
@@ -504,7 +577,7 @@ def _handle_rest_background_callback(
         has_update = True
 
     if output_value is callback_manager.UNDEFINED:
-        return to_json(response), has_update, True
+        return _json.dumps(response), has_update, True
     return output_value, has_update, False
 
 
@@ -585,6 +658,81 @@ def _prepare_response(
     return response.update({"response": component_ids})
 
 
+def _single_flight_key(args, kwargs):
+    callback_ctx = kwargs.get("callback_context") or {}
+    request_identity = (
+        callback_ctx.get("cookies"),
+        (callback_ctx.get("headers") or {}).get("Authorization"),
+    )
+    key = (
+        args,
+        kwargs.get("outputs_list"),
+        callback_ctx.get("triggered_inputs"),
+        request_identity,
+    )
+    return hashlib.sha256(str(key).encode("utf-8")).hexdigest()
+
+
+class _InFlight:
+    __slots__ = ("task", "callback_context", "waiters")
+
+    def __init__(self, task, callback_context):
+        self.task = task
+        self.callback_context = callback_context
+        self.waiters = 0
+
+    async def wait(self):
+        self.waiters += 1
+        try:
+            # shielded so the other requests still get a response if one of
+            # them goes away, the invocation is only cancelled with the last.
+            return await asyncio.shield(self.task)
+        finally:
+            self.waiters -= 1
+            if self.waiters == 0 and not self.task.done():
+                self.task.cancel()
+
+
+def _single_flight(add_context):
+    """
+    Wrap `add_context` so concurrent calls with the same key await the
+    invocation already in flight instead of starting another one.
+    """
+    in_flight = {}
+
+    def _forget(key, entry):
+        def done(task):
+            if in_flight.get(key) is entry:
+                del in_flight[key]
+            if not task.cancelled():
+                # retrieved by the awaiting requests, avoid the asyncio warning
+                # when all of them went away.
+                task.exception()
+
+        return done
+
+    @wraps(add_context)
+    async def single_flight_context(*args, **kwargs):
+        key = _single_flight_key(args, kwargs)
+        entry = in_flight.get(key)
+        if entry is None:
+            task = asyncio.ensure_future(add_context(*args, **kwargs))
+            entry = in_flight[key] = _InFlight(task, kwargs.get("callback_context"))
+            task.add_done_callback(_forget(key, entry))
+            return await entry.wait()
+
+        response = await entry.wait()
+
+        leader_response = (entry.callback_context or {}).get("dash_response")
+        own_response = (kwargs.get("callback_context") or {}).get("dash_response")
+        if leader_response is not None and own_response is not None:
+            for cookie in leader_response.headers.getlist("Set-Cookie"):
+                own_response.headers.add("Set-Cookie", cookie)
+        return response
+
+    return single_flight_context
+
+
 # pylint: disable=too-many-branches,too-many-statements
 def register_callback(
     callback_list,
@@ -615,6 +763,17 @@ def register_callback(
     manager = _kwargs.get("manager")
     running = _kwargs.get("running")
     on_error = _kwargs.get("on_error")
+    memoize = _memoize.get_callback_cache(_kwargs.get("memoize"))
+    if memoize is not None and background is not None:
+        raise ValueError(
+            "memoize can not be used with background callbacks, "
+            "use the cache_by option of the background callback manager."
+        )
+    memoize_identity = _kwargs.get("memoize_key") or []
+    if callable(memoize_identity):
+        memoize_identity = [memoize_identity]
+    memoize_args_to_ignore = _kwargs.get("cache_args_to_ignore") or []
+    memoize_ignore_triggered = _kwargs.get("cache_ignore_triggered", True)
     if running is not None:
         if not isinstance(running[0], (list, tuple)):
             running = [running]
@@ -644,6 +803,16 @@ def register_callback(
         hidden=_kwargs.get("hidden", False),
     )
 
+    limiter = _limits.CallbackLimiter.from_options(
+        _kwargs.get("max_concurrency"), _kwargs.get("max_queue"), name=callback_id
+    )
+    if limiter is not None:
+        callback_map[callback_id]["limiter"] = limiter
+    if _kwargs.get("timeout") is not None:
+        callback_map[callback_id]["timeout"] = _kwargs["timeout"]
+    if _kwargs.get("supersede"):
+        callback_map[callback_id]["supersede"] = True
+
     # pylint: disable=too-many-locals
     def wrap_func(func):
         if _kwargs.get("api_endpoint"):
@@ -657,33 +826,69 @@ def register_callback(
                 callback_id,
             )
 
+        is_coroutine = inspect.iscoroutinefunction(func)
+        executor = _kwargs.get("executor")
+        if executor is not None:
+            if is_coroutine:
+                raise ValueError(
+                    f"executor is only used by sync callbacks, '{func.__name__}' "
+                    "is a coroutine function."
+                )
+            callback_map[callback_id]["executor"] = executor
+        if memoize is not None:
+            memoize_fn_hash = _memoize.function_hash(func, callback_id)
+
         @wraps(func)
         async def add_context(*args, **kwargs):
             output_spec = kwargs.pop("outputs_list")
+            dispatch_plan = kwargs.pop("dispatch_plan", None)
             app_callback_manager = kwargs.pop("background_callback_manager", None)
 
             callback_ctx = kwargs.pop(
                 "callback_context", AttributeDict({"updated_props": {}})
             )
             app = kwargs.pop("app", None)
+            json_engine = getattr(app, "json_engine", None)
             callback_manager = background and background.get(
                 "manager", app_callback_manager
             )
             error_handler = on_error or kwargs.pop("app_on_error", None)
             original_packages = set(ComponentRegistry.registry)
 
-            if has_output:
-                _validate.validate_output_spec(insert_output, output_spec, Output)
-
             context_value.set(callback_ctx)
 
-            func_args, func_kwargs = _validate.validate_and_group_input_args(
-                args, inputs_state_indices
-            )
+            if dispatch_plan is not None:
+                if has_output:
+                    dispatch_plan.validate_output_spec(output_spec)
+                func_args, func_kwargs = dispatch_plan.group_input_args(args)
+            else:
+                if has_output:
+                    _validate.validate_output_spec(insert_output, output_spec, Output)
+                func_args, func_kwargs = _validate.validate_and_group_input_args(
+                    args, inputs_state_indices
+                )
 
             response: dict = {"multi": True}
             has_update = False
 
+            memoize_key = None
+            if memoize is not None:
+                memoize_key = _memoize.build_cache_key(
+                    memoize_fn_hash,
+                    func_args if func_args else func_kwargs,
+                    memoize_args_to_ignore,
+                    output_spec,
+                    (
+                        None
+                        if memoize_ignore_triggered
+                        else callback_ctx.get("triggered_inputs", [])
+                    ),
+                    [get_key() for get_key in memoize_identity],
+                )
+                cached_response = memoize.get(memoize_key)
+                if cached_response is not None:
+                    return cached_response
+
             if background is not None:
                 if not callback_manager:
                     raise MissingLongCallbackManagerError(
@@ -757,7 +962,7 @@ def register_callback(
                             str(o): x
                             for o, x in zip(progress_outputs, progress_default)
                         }
-                    return to_json(data)
+                    return _json.dumps(data, json_engine)
                 if progress_outputs:
                     # Get the progress before the result as it would be erased after the results.
                     progress = callback_manager.get_progress(cache_key)
@@ -811,16 +1016,27 @@ def register_callback(
                     has_update = True
 
                 if output_value is callback_manager.UNDEFINED:
-                    return to_json(response)
+                    return _json.dumps(response, json_engine)
             else:
+                execute_started = time.perf_counter()
                 try:
-                    output_value = await _invoke_callback(
-                        func, *func_args, **func_kwargs
+                    output_value = await _run_callback(
+                        func,
+                        is_coroutine,
+                        func_args,
+                        func_kwargs,
+                        executor=(
+                            partial(app.executors.run, executor)
+                            if executor is not None and app is not None
+                            else None
+                        ),
                     )
                 except PreventUpdate as err:
                     raise err
                 except Exception as err:  # pylint: disable=broad-exception-caught
                     if error_handler:
+                        # error handler responses are not memoized
+                        memoize_key = None
                         output_value = await _invoke_callback(error_handler, err)
 
                         # If the error returns nothing, automatically puts NoUpdate for response.
@@ -828,7 +1044,12 @@ def register_callback(
                             output_value = NoUpdate()
                     else:
                         raise err
+                finally:
+                    _metrics.record_phase(
+                        callback_ctx, "execute", time.perf_counter() - execute_started
+                    )
 
+            serialize_started = time.perf_counter()
             _prepare_response(
                 output_value,
                 output_spec,
@@ -846,13 +1067,23 @@ def register_callback(
             )
 
             try:
-                jsonResponse = to_json(response)
+                jsonResponse = _json.dumps(response, json_engine)
             except TypeError:
                 _validate.fail_callback_output(output_value, output)
 
+            _metrics.record_phase(
+                callback_ctx, "serialize", time.perf_counter() - serialize_started
+            )
+
+            if memoize_key is not None:
+                memoize.set(memoize_key, jsonResponse)
+
             return jsonResponse
 
-        callback_map[callback_id]["callback"] = add_context
+        if background is None and _kwargs.get("single_flight"):
+            callback_map[callback_id]["callback"] = _single_flight(add_context)
+        else:
+            callback_map[callback_id]["callback"] = add_context
 
         return func
 
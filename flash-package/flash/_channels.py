@@ -0,0 +1,180 @@
+import asyncio
+import contextvars
+import logging
+import secrets
+import typing as _t
+
+from ._pubsub import LEASE_TTL, PubSubBackend
+
+logger = logging.getLogger(__name__)
+
+# frames waiting for a subscriber before its oldest ones are dropped, whatever
+# the ``overflow`` of the event callback
+SUBSCRIBER_QUEUE_SIZE = 256
+
+_END: _t.Final = object()
+# published when the producer of a channel is done, frames are never empty
+_END_MESSAGE: _t.Final = b""
+
+
+def channel_topic(name: str) -> str:
+    return f"flash:channel:{name}"
+
+
+class Channel:
+    """
+    A broadcast channel, every frame published is sent to all subscribers of
+    every worker through the pub/sub backend.
+
+    Each subscriber reads from its own bounded queue, a slow one loses its
+    oldest frames instead of holding back the producer and the others.
+    """
+
+    def __init__(
+        self, name: str, backend: PubSubBackend, on_empty: _t.Callable[[str], None]
+    ):
+        self.name = name
+        self.topic = channel_topic(name)
+        self.backend = backend
+        self.subscribers: _t.Set[asyncio.Queue] = set()
+        # frames dropped for slow subscribers
+        self.dropped = 0
+        self._on_empty = on_empty
+        self._subscription = None
+        self._listener: _t.Optional[asyncio.Task] = None
+        self._leader: _t.Optional[asyncio.Task] = None
+
+    def _fan_out(self, frame):
+        for queue in self.subscribers:
+            if queue.full():
+                queue.get_nowait()
+                if not self.dropped:
+                    logger.warning(
+                        "Slow subscriber of channel %s, dropping frames", self.name
+                    )
+                self.dropped += 1
+            queue.put_nowait(frame)
+
+    async def _listen(self):
+        async for message in self._subscription:
+            self._fan_out(_END if message == _END_MESSAGE else message)
+
+    async def _produce(self, frames: _t.AsyncIterator):
+        async for frame in frames:
+            await self.backend.publish(self.topic, frame)
+        await self.backend.publish(self.topic, _END_MESSAGE)
+
+    async def _lead(self, producer: _t.Callable[[], _t.AsyncIterator]):
+        """
+        Run `producer` while holding the lease of the channel, so a single
+        worker runs it. The others try again in case its worker goes away.
+        """
+        lease = f"{self.topic}:producer"
+        token = secrets.token_hex(8)
+        while True:
+            if await self.backend.acquire(lease, token, LEASE_TTL):
+                produce = asyncio.ensure_future(self._produce(producer()))
+                try:
+                    while not produce.done():
+                        await asyncio.wait((produce,), timeout=LEASE_TTL / 3)
+                        if not produce.done() and not await self.backend.renew(
+                            lease, token, LEASE_TTL
+                        ):
+                            produce.cancel("lease lost")
+                    if not produce.cancelled():
+                        produce.result()
+                        return
+                finally:
+                    if not produce.done():
+                        produce.cancel()
+                    await asyncio.wait((produce,))
+                    await self.backend.release(lease, token)
+            await asyncio.sleep(LEASE_TTL / 2)
+
+    async def subscribe(
+        self, producer: _t.Optional[_t.Callable[[], _t.AsyncIterator]] = None
+    ):
+        """
+        Frames of the channel from now on. The first subscriber starts
+        `producer`, in an empty context, once the channel is received, and the
+        last one to leave stops it.
+        """
+        queue: asyncio.Queue = asyncio.Queue(SUBSCRIBER_QUEUE_SIZE)
+        self.subscribers.add(queue)
+        if self._subscription is None:
+            self._subscription = self.backend.subscribe(self.topic)
+            self._listener = asyncio.ensure_future(self._listen())
+        subscription = self._subscription
+        try:
+            # the first frames and the end of a short producer would be lost
+            await subscription.ready
+            if (
+                producer is not None
+                and self._leader is None
+                and self._subscription is subscription
+            ):
+                # outside the context of this subscriber, the producer outlives
+                # its request and serves every other subscriber as well
+                self._leader = contextvars.Context().run(
+                    asyncio.ensure_future, self._lead(producer)
+                )
+            while True:
+                frame = await queue.get()
+                if frame is _END:
+                    return
+                yield frame
+        finally:
+            self.subscribers.discard(queue)
+            if not self.subscribers:
+                self.close("unsubscribed")
+
+    def close(self, reason: str = "unsubscribed"):
+        for task in (self._leader, self._listener):
+            if task is not None:
+                task.cancel(reason)
+        self._leader = self._listener = None
+        if self._subscription is not None:
+            self._subscription.close()
+            self._subscription = None
+        self._fan_out(_END)
+        self._on_empty(self.name)
+
+
+class ChannelHub:
+    """
+    The broadcast channels of an app, available as `Flash.channels`.
+
+    Frames published to a channel reach every page subscribed to it, from an
+    ``event_callback(..., channel=...)`` producer or from anywhere else::
+
+        await app.channels.publish("prices", stream_props("ticker", {"children": p}))
+    """
+
+    def __init__(self, backend: PubSubBackend):
+        self.backend = backend
+        self.channels: _t.Dict[str, Channel] = {}
+
+    def get(self, name: str) -> Channel:
+        channel = self.channels.get(name)
+        if channel is None:
+            channel = self.channels[name] = Channel(name, self.backend, self._remove)
+        return channel
+
+    async def publish(self, name: str, frame):
+        """Send `frame` to the subscribers of the channel `name`, on every worker."""
+        await self.backend.publish(channel_topic(name), frame)
+
+    def subscribe(self, name: str, producer=None):
+        return self.get(name).subscribe(producer)
+
+    def subscribers(self, name: str) -> int:
+        """Subscribers of the channel `name` on this worker."""
+        channel = self.channels.get(name)
+        return len(channel.subscribers) if channel is not None else 0
+
+    def _remove(self, name: str):
+        self.channels.pop(name, None)
+
+    def close(self):
+        for channel in list(self.channels.values()):
+            channel.close("shutdown")
@@ -0,0 +1,188 @@
+import operator
+
+from dash._grouping import grouping_len, update_args_group
+from dash._utils import AttributeDict, stringify_id, clean_property_name
+from dash.dependencies import Output
+from dash.exceptions import CallbackException
+from dash import _validate
+
+
+def _compile_grouping(indices):
+    """
+    Compile an index grouping into a function that maps a flat list onto the
+    grouping structure. Equivalent to
+    ``map_grouping(lambda ind: flat[ind], indices)`` without walking the
+    grouping on every call.
+    """
+    if isinstance(indices, (tuple, list)):
+        if all(isinstance(i, int) for i in indices) and list(indices) == list(
+            range(len(indices))
+        ):
+            size = len(indices)
+            return lambda flat: list(flat[:size])
+
+        getters = [_compile_grouping(i) for i in indices]
+        return lambda flat: [get(flat) for get in getters]
+
+    if isinstance(indices, dict):
+        getters = [(key, _compile_grouping(value)) for key, value in indices.items()]
+        return lambda flat: AttributeDict({key: get(flat) for key, get in getters})
+
+    return operator.itemgetter(indices)
+
+
+class _CompiledGrouping:
+    __slots__ = ("_getter", "using_grouping")
+
+    def __init__(self, indices):
+        self._getter = _compile_grouping(indices)
+        self.using_grouping = not isinstance(indices, int) and indices != list(
+            range(grouping_len(indices))
+        )
+
+    def __call__(self, data_list):
+        flat_data = data_list if isinstance(data_list, list) else [data_list]
+        if not flat_data:
+            return [], False
+        return self._getter(flat_data), self.using_grouping
+
+
+def _static_dependency(dependency):
+    """Request independent id information of a dependency without wildcards."""
+    if dependency.has_wildcard():
+        return None
+    component_id = dependency.component_id
+    str_id = stringify_id(component_id)
+    return component_id, str_id, f"{str_id}.{dependency.component_property}"
+
+
+class DispatchPlan:
+    """
+    Everything about a server callback that does not depend on the request,
+    computed once so `Flash.async_dispatch` and `add_context` only have to
+    fill the request values into it.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, callback_id, callback_spec):
+        self.callback_id = callback_id
+        self.func = callback_spec["callback"]
+        self.no_output = bool(callback_spec.get("no_output"))
+        self.is_background = bool(callback_spec.get("background"))
+        self.limiter = callback_spec.get("limiter")
+        self.timeout = callback_spec.get("timeout")
+        self.supersede = bool(callback_spec.get("supersede"))
+
+        inputs_state_indices = callback_spec["inputs_state_indices"]
+        self.args_grouping = _CompiledGrouping(inputs_state_indices)
+        self.outputs_grouping = _CompiledGrouping(
+            callback_spec.get("outputs_indices", [])
+        )
+
+        self._n_args = grouping_len(inputs_state_indices)
+        self._group_args = _compile_grouping(inputs_state_indices)
+        self._args_error = None
+        if isinstance(inputs_state_indices, dict):
+            self._args_kind = "kwargs"
+            for key in inputs_state_indices:
+                if not key.isidentifier():
+                    self._args_error = f"{key} is not a valid Python variable name"
+        elif isinstance(inputs_state_indices, (tuple, list)):
+            self._args_kind = "args"
+        else:
+            self._args_kind = "scalar"
+
+        self._dependencies = [
+            _static_dependency(dep)
+            for dep in list(callback_spec.get("raw_inputs", []))
+            + list(callback_spec.get("raw_state", []))
+        ]
+
+        output = callback_spec["output"]
+        self._output = output
+        self._multi_output = isinstance(output, (list, tuple))
+        self._output_keys = [
+            (
+                None
+                if out.has_wildcard()
+                else (out.component_id, out.component_property)
+            )
+            for out in (output if self._multi_output else [output])
+        ]
+
+    def prepare_args(self, inputs_state, changed_prop_ids):
+        """
+        Convert the request inputs and state to `AttributeDict`s carrying the
+        `str_id`, `id` and `triggered` keys used by `ctx.args_grouping`.
+        """
+        triggered = set(changed_prop_ids)
+        prepared = []
+        for item, static in zip(inputs_state, self._dependencies):
+            if isinstance(item, list):
+                items = [AttributeDict(i) for i in item]
+                for i in items:
+                    update_args_group(i, triggered)
+                prepared.append(items)
+                continue
+
+            item = AttributeDict(item)
+            if static is None:
+                update_args_group(item, triggered)
+            else:
+                component_id, str_id, prop_id = static
+                item["value"] = item.get("value")
+                item["str_id"] = str_id
+                item["triggered"] = prop_id in triggered
+                item["id"] = (
+                    AttributeDict(component_id)
+                    if isinstance(component_id, dict)
+                    else component_id
+                )
+            prepared.append(item)
+        return prepared
+
+    def validate_output_spec(self, output_spec):
+        """Fast equivalent of `_validate.validate_output_spec`."""
+        if not self._multi_output:
+            output_spec = [output_spec]
+        elif len(self._output) != len(output_spec):
+            raise CallbackException("Wrong length output_spec")
+
+        for out, expected, speci in zip(
+            self._output if self._multi_output else [self._output],
+            self._output_keys,
+            output_spec,
+        ):
+            if expected is None:
+                _validate.validate_output_spec([out], [speci], Output)
+                continue
+
+            component_id, component_property = expected
+            for specij in speci if isinstance(speci, (list, tuple)) else [speci]:
+                if (
+                    specij["id"] != component_id
+                    or clean_property_name(specij["property"]) != component_property
+                ):
+                    raise CallbackException("Output does not match callback definition")
+
+    def group_input_args(self, flat_args):
+        """Fast equivalent of `_validate.validate_and_group_input_args`."""
+        if len(flat_args) != self._n_args:
+            raise CallbackException("Inputs do not match callback definition")
+        if self._args_error:
+            raise CallbackException(self._args_error)
+
+        args_grouping = self._group_args(flat_args)
+        if self._args_kind == "kwargs":
+            return [], args_grouping
+        if self._args_kind == "args":
+            return args_grouping, {}
+        return [args_grouping], {}
+
+
+def build_dispatch_plans(callback_map):
+    return {
+        callback_id: DispatchPlan(callback_id, callback_spec)
+        for callback_id, callback_spec in callback_map.items()
+        if "callback" in callback_spec
+    }
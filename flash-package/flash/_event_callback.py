@@ -1,5 +1,7 @@
 from ._hooks import hooks
-from ._utils import recursive_to_plotly_json
+from ._get_app import get_app
+from . import _json
+from ._replay import REPLAY_SIZE
 from ._callback import clientside_callback
 from .SSE import SSE
 from dataclasses import dataclass
@@ -21,6 +23,10 @@ ERROR_TOKEN: _t.Final = "[ERROR]"
 SINGLE_UPDATE_TOKEN: _t.Final = "[SINGLE]"
 BATCH_UPDATE_TOKEN: _t.Final = "[BATCH]"
 
+# frames a stream produces ahead of its client, by default
+STREAM_QUEUE_SIZE = 64
+OVERFLOW_POLICIES: _t.Final = ("block", "drop-oldest", "coalesce")
+
 signal_type: _t.TypeAlias = _t.Literal["[ERROR]", "[SINGLE]", "[BATCH]"]
 batch_props_type: _t.TypeAlias = _t.List[
     _t.Tuple[str | _t.Dict[str, _t.Any], _t.Dict[str, _t.Any]]
@@ -40,15 +46,34 @@ class SSECallbackComponent(html.Div):
         sse = lambda idx: {"type": "dash-event-stream", "index": idx}
         store = lambda idx: {"type": "dash-event-stream-store", "index": idx}
 
-    def __init__(self, callback_id: str, concat: bool = True):
+    def __init__(self, callback_id: str, concat: bool = True, transport: str = "sse"):
         super().__init__(
             [
-                SSE(id=self.ids.sse(callback_id), concat=concat, update_component=True),
+                SSE(
+                    id=self.ids.sse(callback_id),
+                    concat=concat,
+                    update_component=True,
+                    transport=transport,
+                ),
                 Store(id=self.ids.store(callback_id), data={}, storage_type="memory"),
             ],
         )
 
 
+_DATA_FIELD: _t.Final = b"data: "
+_EVENT_END: _t.Final = b"\n\n"
+
+
+def _frame(data: bytes | str) -> bytearray:
+    """An SSE event carrying `data`, a JSON document without line breaks."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    frame = bytearray(_DATA_FIELD)
+    frame += data
+    frame += _EVENT_END
+    return frame
+
+
 @dataclass
 class ServerSentEvent:
     data: str
@@ -57,15 +82,31 @@ class ServerSentEvent:
     retry: int | None = None
 
     def encode(self) -> bytes:
-        message = f"data: {self.data}"
-        if self.event is not None:
-            message = f"{message}\nevent: {self.event}"
-        if self.id is not None:
-            message = f"{message}\nid: {self.id}"
-        if self.retry is not None:
-            message = f"{message}\nretry: {self.retry}"
-        message = f"{message}\n\n"
-        return message.encode("utf-8")
+        frame = _frame(self.data)
+        del frame[-1:]
+        for field, value in (
+            (b"event: ", self.event),
+            (b"id: ", self.id),
+            (b"retry: ", self.retry),
+        ):
+            if value is not None:
+                frame += field + str(value).encode("utf-8") + b"\n"
+        frame += b"\n"
+        return bytes(frame)
+
+
+class StreamFrame(bytes):
+    """
+    An encoded `stream_props` message, along with the ``(component_id,
+    props)`` updates it carries so pending frames can be merged.
+    """
+
+    updates: batch_props_type
+
+
+def error_signal(payload: _t.Dict[str, _t.Any]) -> bytes:
+    """SSE message telling the client the stream failed."""
+    return bytes(_frame(_json.dumps([ERROR_TOKEN, None, payload])))
 
 
 @dataclass
@@ -73,6 +114,12 @@ class _SSEServerObject:
     func: _t.Callable
     on_error: _t.Optional[_t.Callable]
     reset_props: batch_props_type
+    min_interval: _t.Optional[float] = None
+    resumable: bool = False
+    replay_size: int = REPLAY_SIZE
+    channel: _t.Optional[str] = None
+    queue_size: int = STREAM_QUEUE_SIZE
+    overflow: str = "block"
 
     @property
     def func_name(self):
@@ -227,21 +274,21 @@ def generate_deterministic_id(func: _t.Callable, dependencies: _t.Tuple) -> str:
 @_t.overload
 def stream_props(
     component_id: str | dict[str, _t.Any], props: dict[str, _t.Any], /
-) -> bytes:
+) -> StreamFrame:
     ...
 
 
 @_t.overload
 def stream_props(
     batch: list[tuple[str | dict[str, _t.Any], dict[str, _t.Any]]], /
-) -> bytes:
+) -> StreamFrame:
     ...
 
 
 @_t.overload
 def stream_props(
     *, batch: list[tuple[str | dict[str, _t.Any], dict[str, _t.Any]]]
-) -> bytes:
+) -> StreamFrame:
     ...
 
 
@@ -254,7 +301,7 @@ def stream_props(
     /,
     *,
     batch: list[tuple[str | dict[str, _t.Any], dict[str, _t.Any]]] | None = None,
-) -> bytes:
+) -> StreamFrame:
     """
     Create an SSE message to update one or many components.
 
@@ -268,8 +315,9 @@ def stream_props(
         response = [
             BATCH_UPDATE_TOKEN,
             None,
-            [(cid, recursive_to_plotly_json(p)) for cid, p in batch],
+            batch,
         ]
+        updates = batch
 
     elif props is None:
         if not isinstance(arg1, list):
@@ -280,8 +328,9 @@ def stream_props(
         response = [
             BATCH_UPDATE_TOKEN,
             None,
-            [(cid, recursive_to_plotly_json(p)) for cid, p in arg1],
+            arg1,
         ]
+        updates = arg1
 
     else:
         if arg1 is None or isinstance(arg1, list):
@@ -291,11 +340,19 @@ def stream_props(
         response = [
             SINGLE_UPDATE_TOKEN,
             component_id,
-            recursive_to_plotly_json(props),
+            props,
         ]
+        updates = [(component_id, props)]
+
+    try:
+        data = _json.dumps(response)
+    except TypeError:
+        # types no engine knows about, keep the lenient str() conversion
+        data = json.dumps(_json.jsonable(response))
 
-    event = ServerSentEvent(json.dumps(response))
-    return event.encode()
+    frame = StreamFrame(_frame(data))
+    frame.updates = updates
+    return frame
 
 
 def event_callback(
@@ -305,7 +362,57 @@ def event_callback(
     reset_props: batch_props_type = [],
     prevent_initial_call=True,
     concat: bool = True,
+    min_interval: _t.Optional[float] = None,
+    max_fps: _t.Optional[float] = None,
+    resumable: bool = False,
+    replay_size: int = REPLAY_SIZE,
+    channel: _t.Optional[str] = None,
+    queue_size: int = STREAM_QUEUE_SIZE,
+    overflow: str = "block",
 ):
+    """
+    Stream the messages of an async generator to the page.
+
+    ``min_interval`` (seconds) or ``max_fps`` cap how often messages are
+    sent. When the generator produces faster, the `stream_props` updates
+    waiting in between are merged, keeping only the latest value of each
+    component prop, and sent as one ``[BATCH]`` frame.
+
+    A ``resumable`` stream outlives its connection: its frames get event ids
+    and the last ``replay_size`` are kept, a client reconnecting with
+    ``Last-Event-ID`` gets the frames it missed instead of a new run of the
+    generator. Only with ``stream_transport="sse"``.
+
+    With a ``channel``, every page shares one run of the generator, started
+    with the arguments of the first page to subscribe and stopped when the
+    last one leaves. It runs in the app context, without a request: use the
+    arguments it gets rather than ``quart.request`` or cookies. Frames
+    published to the channel with `Flash.channels` are sent to the pages as
+    well.
+
+    Frames wait in a queue of ``queue_size`` frames between the generator
+    and the client. When a slow client lets it fill up, ``overflow`` decides:
+    ``"block"`` pauses the generator, ``"drop-oldest"`` drops the oldest
+    waiting frame and ``"coalesce"`` merges the waiting `stream_props`
+    updates, keeping the latest value of each component prop.
+
+    Only the ``"sse"`` and ``"websocket"`` transports pace the generator on
+    the client. A ``channel`` or a ``"multiplex"`` session delivers the frames
+    to every page through a queue of its own, which loses its oldest frames
+    when the page falls behind whatever the ``overflow``, so a slow page
+    never holds back the others.
+    """
+    if overflow not in OVERFLOW_POLICIES:
+        raise ValueError(
+            f"Unknown overflow {overflow!r}, expected one of {OVERFLOW_POLICIES}."
+        )
+    if queue_size < 1:
+        raise ValueError("queue_size must be at least 1.")
+    if max_fps is not None:
+        if min_interval is not None:
+            raise ValueError("Use either min_interval or max_fps, not both.")
+        min_interval = 1 / max_fps
+
     def decorator(func: _t.Callable) -> _t.Callable:
         if not inspect.isasyncgenfunction(func):
             raise ValueError("Event callback must be a generator function")
@@ -314,7 +421,17 @@ def event_callback(
         param_names = list(sig.parameters.keys())
         callback_id = generate_deterministic_id(func, dependencies)
 
-        sse_obj = _SSEServerObject(func, on_error, reset_props)
+        sse_obj = _SSEServerObject(
+            func,
+            on_error,
+            reset_props,
+            min_interval,
+            resumable,
+            replay_size,
+            channel,
+            queue_size,
+            overflow,
+        )
         sse_url = get_relative_path(SSE_CALLBACK_ENDPOINT)
         _SSEServerObjects.add_func(sse_obj, callback_id)
 
@@ -353,9 +470,11 @@ def event_callback(
                 )
 
 
-        @hooks.layout()
+        @hooks.layout(static=True)
         def add_sse_component(layout):
-            component = SSECallbackComponent(callback_id, concat)
+            component = SSECallbackComponent(
+                callback_id, concat, get_app().stream_transport
+            )
             return (
                 [component] + layout
                 if isinstance(layout, list)
@@ -0,0 +1,109 @@
+import asyncio
+import functools
+import os
+import pickle
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextvars import copy_context
+
+
+def _noop():
+    return None
+
+
+def _call_pickled(payload):
+    return pickle.loads(payload)()
+
+
+class CallbackExecutors:
+    """
+    Named executors for synchronous callbacks selected with
+    ``@callback(..., executor=name)``.
+
+    ``"threads"`` is a bounded thread pool and ``"processes"`` a process pool
+    using every core, both created on first use unless overridden in
+    ``executors``.
+    """
+
+    def __init__(self, executors=None):
+        executors = dict(executors or {})
+        for name, executor in executors.items():
+            if not isinstance(executor, Executor):
+                raise ValueError(
+                    f"Executor '{name}' must be a concurrent.futures.Executor, "
+                    f"got {type(executor).__name__}."
+                )
+        self._executors = executors
+        self._owned = []
+        self._picklable = set()
+
+    def _create_default(self, name):
+        if name == "threads":
+            return ThreadPoolExecutor(
+                max_workers=min(32, (os.cpu_count() or 1) + 4),
+                thread_name_prefix="flash-callback",
+            )
+        if name == "processes":
+            return ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+        raise KeyError(
+            f"Unknown callback executor '{name}', "
+            f"pass it to Flash(executors={{'{name}': ...}})."
+        )
+
+    def get(self, name) -> Executor:
+        executor = self._executors.get(name)
+        if executor is None:
+            executor = self._executors[name] = self._create_default(name)
+            self._owned.append(executor)
+        return executor
+
+    def _check_picklable(self, func):
+        if func in self._picklable:
+            return
+        try:
+            pickle.dumps(func)
+        except (pickle.PicklingError, AttributeError, TypeError) as err:
+            raise ValueError(
+                f"Callback '{func.__name__}' runs in a process pool and must be "
+                "a module level function that can be pickled."
+            ) from err
+        self._picklable.add(func)
+
+    async def run(self, name, func, func_args, func_kwargs):
+        """Run the sync `func` in the executor registered as `name`."""
+        executor = self.get(name)
+        call = functools.partial(func, *func_args, **func_kwargs)
+        loop = asyncio.get_running_loop()
+
+        if isinstance(executor, ProcessPoolExecutor):
+            # The callback context can't cross the process boundary, only the
+            # function and its arguments are pickled.
+            self._check_picklable(func)
+            try:
+                payload = pickle.dumps(call)
+            except (pickle.PicklingError, AttributeError, TypeError) as err:
+                raise ValueError(
+                    f"The arguments of callback '{func.__name__}' can't be "
+                    "pickled to run in a process pool."
+                ) from err
+            return await loop.run_in_executor(executor, _call_pickled, payload)
+
+        return await loop.run_in_executor(executor, copy_context().run, call)
+
+    async def warm(self, names):
+        """Create the executors in `names` and start the process pool workers."""
+        waiting = []
+        for name in names:
+            executor = self.get(name)
+            if isinstance(executor, ProcessPoolExecutor):
+                # pylint: disable=protected-access
+                workers = executor._max_workers
+                loop = asyncio.get_running_loop()
+                waiting.extend(
+                    loop.run_in_executor(executor, _noop) for _ in range(workers)
+                )
+        await asyncio.gather(*waiting)
+
+    async def shutdown(self):
+        """Shut down the default executors, user executors are left alone."""
+        for executor in self._owned:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -27,11 +27,20 @@ DevtoolPosition = _tx.Literal["right", "left"]
 
 # pylint: disable=too-few-public-methods
 class _Hook(_tx.Generic[HookDataType]):
-    def __init__(self, func, priority=0, final=False, data: HookDataType = None):
+    def __init__(
+        self,
+        func,
+        priority=0,
+        final=False,
+        data: HookDataType = None,
+        static: bool = False,
+    ):
         self.func = func
         self.final = final
         self.data = data
         self.priority = priority
+        # the output only depends on the input, not on the request
+        self.static = static
 
     def __call__(self, *args, **kwargs):
         return self.func(*args, **kwargs)
@@ -64,12 +73,13 @@ class _Hooks:
         priority: _t.Optional[int] = None,
         final=False,
         data=None,
+        static=False,
     ):
         if final:
             existing = self._finals.get(hook)
             if existing:
                 raise HookError("Final hook already present")
-            self._finals[hook] = _Hook(func, final, data=data)
+            self._finals[hook] = _Hook(func, final, data=data, static=static)
             return
         hks = self._ns.get(hook, [])
 
@@ -78,7 +88,7 @@ class _Hooks:
             priority_max = max(h.priority for h in hks)
             p = priority_max - 1
 
-        hks.append(_Hook(func, priority=p, data=data))
+        hks.append(_Hook(func, priority=p, data=data, static=static))
         self._ns[hook] = sorted(hks, reverse=True, key=lambda h: h.priority)
 
     def get_hooks(self, hook: str) -> _t.List[_Hook]:
@@ -89,14 +99,23 @@ class _Hooks:
             final = []
         return self._ns.get(hook, []) + final
 
-    def layout(self, priority: _t.Optional[int] = None, final: bool = False):
+    def layout(
+        self,
+        priority: _t.Optional[int] = None,
+        final: bool = False,
+        static: bool = False,
+    ):
         """
         Run a function when serving the layout, the return value
-        will be used as the layout.
+        will be used as the layout. A ``static`` hook only depends on the
+        layout it gets, not on the request, so a static layout stays cached
+        with its output.
         """
 
         def _wrap(func: _t.Callable[[LayoutType], LayoutType]):
-            self.add_hook("layout", func, priority=priority, final=final)
+            self.add_hook(
+                "layout", func, priority=priority, final=final, static=static
+            )
             return func
 
         return _wrap
@@ -21,6 +21,7 @@ from dash.dependencies import (  # noqa: F401,E402
 )
 
 from ._callback import callback, clientside_callback
+from ._memoize import CallbackCache, DiskcacheCallbackCache
 from ._callback_context import callback_context, set_props
 from ._get_app import get_app
 from ._hooks import hooks
@@ -47,6 +48,8 @@ __all__ = [
     "ClientsideFunction",
     "callback",
     "clientside_callback",
+    "CallbackCache",
+    "DiskcacheCallbackCache",
     "callback_context",
     "set_props",
     "get_app",
@@ -0,0 +1,248 @@
+import datetime
+import decimal
+import sys
+
+from dash._utils import to_json as _plotly_to_json
+
+from ._get_app import app_context
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+_ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY if orjson else None
+)
+
+# Same escaping plotly applies, so the output is safe to embed in a html page
+_SAFE_SWAPS = (
+    (b"<", b"\\u003c"),
+    (b">", b"\\u003e"),
+    (b"/", b"\\u002f"),
+    ("\u2028".encode("utf-8"), b"\\u2028"),
+    ("\u2029".encode("utf-8"), b"\\u2029"),
+)
+
+
+def safe(data):
+    for char, escaped in _SAFE_SWAPS:
+        if char in data:
+            data = data.replace(char, escaped)
+    return data
+
+
+class _UnknownType(TypeError):
+    pass
+
+
+def _unknown(obj):
+    raise _UnknownType(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _isoformat(obj):
+    return obj.isoformat()
+
+
+def _to_none(_obj):
+    return None
+
+
+def _to_plotly_json(obj):
+    return obj.to_plotly_json()
+
+
+def _tolist(obj):
+    return obj.tolist()
+
+
+def _encode_ndarray(obj):
+    if obj.dtype.kind == "M":
+        return sys.modules["numpy"].datetime_as_string(obj).tolist()
+    return obj.tolist()
+
+
+def _encode_numpy_scalar(obj):
+    if obj.dtype.kind == "M":
+        return str(obj)
+    return obj.item()
+
+
+def _encode_series(obj):
+    if obj.dtype.kind in "biuf":
+        return sys.modules["numpy"].ascontiguousarray(obj.to_numpy())
+    return obj.tolist()
+
+
+def _encode_dataframe(obj):
+    return obj.to_dict()
+
+
+# type -> encoder, filled lazily per concrete type so every later value of
+# that type costs a single dict lookup
+_ENCODERS = {decimal.Decimal: float}
+
+
+def _resolve_encoder(cls):
+    # pylint: disable=too-many-return-statements
+    if hasattr(cls, "to_plotly_json"):
+        return _to_plotly_json
+
+    # only look at numpy / pandas if the app already imported them
+    np = sys.modules.get("numpy")
+    if np is not None:
+        if issubclass(cls, np.ndarray):
+            return _encode_ndarray
+        if issubclass(cls, np.generic):
+            return _encode_numpy_scalar
+
+    pd = sys.modules.get("pandas")
+    if pd is not None:
+        if issubclass(cls, (pd.Series, pd.Index)):
+            return _encode_series
+        if issubclass(cls, pd.DataFrame):
+            return _encode_dataframe
+        if cls is type(pd.NaT) or cls is type(pd.NA):
+            return _to_none
+
+    if issubclass(cls, (datetime.date, datetime.time)):
+        return _isoformat
+    if issubclass(cls, decimal.Decimal):
+        return float
+    if hasattr(cls, "tolist"):
+        return _tolist
+    return _unknown
+
+
+def _default(obj):
+    cls = type(obj)
+    encoder = _ENCODERS.get(cls)
+    if encoder is None:
+        encoder = _ENCODERS[cls] = _resolve_encoder(cls)
+    return encoder(obj)
+
+
+def _to_dict(obj):
+    return obj.to_dict()
+
+
+def _same(obj):
+    return obj
+
+
+def _jsonable_dict(obj):
+    return {
+        key if type(key) in _KEY_TYPES else str(key): jsonable(value)
+        for key, value in obj.items()
+    }
+
+
+def _jsonable_list(obj):
+    return [jsonable(item) for item in obj]
+
+
+_KEY_TYPES = frozenset((str, int, float, bool, type(None)))
+
+# type -> converter of `jsonable`, filled lazily like `_ENCODERS`
+_CONVERTERS = {
+    str: _same,
+    int: _same,
+    float: _same,
+    bool: _same,
+    type(None): _same,
+    dict: _jsonable_dict,
+    list: _jsonable_list,
+    tuple: _jsonable_list,
+}
+
+
+def _resolve_converter(cls):
+    if not hasattr(cls, "to_plotly_json"):
+        for base in (dict, list, tuple, str, int, float):
+            if issubclass(cls, base):
+                return _CONVERTERS[base]
+
+    encoder = _resolve_encoder(cls)
+    if encoder is _unknown:
+        if not hasattr(cls, "to_dict"):
+            return str
+        encoder = _to_dict
+
+    def convert(obj):
+        return jsonable(encoder(obj))
+
+    return convert
+
+
+def jsonable(obj):
+    """
+    A copy of ``obj`` made of JSON types only, for values the engines can't
+    encode. ``obj`` is left untouched and types nobody knows how to encode
+    become their ``str()``.
+    """
+    cls = type(obj)
+    converter = _CONVERTERS.get(cls)
+    if converter is None:
+        converter = _CONVERTERS[cls] = _resolve_converter(cls)
+    return converter(obj)
+
+
+def _orjson_dumps(obj):
+    try:
+        return safe(orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS))
+    except orjson.JSONEncodeError as err:
+        if isinstance(err.__cause__, _UnknownType):
+            return _plotly_to_json(obj)
+        raise
+
+
+JSON_ENGINES = {
+    "orjson": _orjson_dumps,
+    "plotly": _plotly_to_json,
+}
+
+
+def get_engine(json_engine):
+    """
+    Resolve the ``json_engine`` argument of `Flash` to a function that turns a
+    value into a ``str`` or ``bytes`` JSON document.
+    """
+    if json_engine is None or json_engine == "auto":
+        return _orjson_dumps if orjson else _plotly_to_json
+    if callable(json_engine):
+        return json_engine
+    if callable(getattr(json_engine, "dumps", None)):
+        return json_engine.dumps
+    if json_engine == "orjson" and orjson is None:
+        raise ImportError(
+            "json_engine='orjson' requires orjson, install it with `pip install orjson`."
+        )
+    if json_engine not in JSON_ENGINES:
+        raise ValueError(
+            f"Unknown json_engine {json_engine!r}, "
+            f"expected one of {['auto', *JSON_ENGINES]} or a callable."
+        )
+    return JSON_ENGINES[json_engine]
+
+
+DEFAULT_ENGINE = get_engine("auto")
+
+
+def current_engine():
+    """The engine of the app handling the current request, or the default one."""
+    return getattr(app_context.get(None), "json_engine", None) or DEFAULT_ENGINE
+
+
+def dumps(obj, engine=None):
+    """
+    Encode ``obj`` with ``engine``, the one of the current app if not given,
+    returns ``str`` or ``bytes``.
+    """
+    return (engine or current_engine())(obj)
+
+
+def to_json(obj, engine=None):
+    """Encode ``obj`` like `dumps`, always returns ``str``."""
+    data = dumps(obj, engine)
+    return data.decode("utf-8") if isinstance(data, bytes) else data
@@ -0,0 +1,95 @@
+import asyncio
+import contextlib
+import time
+from typing import Optional
+
+
+class CallbackQueueFull(Exception):
+    """Raised when a request can't be queued, answered with `status`."""
+
+    def __init__(self, message, status=429):
+        super().__init__(message)
+        self.status = status
+
+
+class CallbackTimeout(Exception):
+    """Raised when a callback exceeds its timeout, answered with a 504."""
+
+
+class CallbackLimiter:
+    """
+    Bound the number of concurrent invocations, requests beyond
+    ``max_concurrency`` wait in a FIFO queue of at most ``max_queue`` requests
+    and are rejected once it is full.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue: Optional[int] = None,
+        name: str = "",
+        status: int = 429,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if max_queue is not None and max_queue < 0:
+            raise ValueError("max_queue can't be negative")
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.name = name
+        self.status = status
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+        self.admitted = 0
+        self.queue_time = 0.0
+
+    @classmethod
+    def from_options(cls, max_concurrency, max_queue, **kwargs):
+        if max_concurrency is None:
+            if max_queue is not None:
+                raise ValueError("max_queue requires max_concurrency")
+            return None
+        return cls(max_concurrency, max_queue, **kwargs)
+
+    @contextlib.asynccontextmanager
+    async def slot(self):
+        if (
+            self.max_queue is not None
+            and self._semaphore.locked()
+            and self.waiting >= self.max_queue
+        ):
+            self.rejected += 1
+            raise CallbackQueueFull(
+                f"Too many pending requests for {self.name or 'the app'}",
+                self.status,
+            )
+
+        start = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.admitted += 1
+        self.queue_time += time.perf_counter() - start
+
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+
+    def stats(self):
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+            "admitted": self.admitted,
+            "queue_time": self.queue_time,
+        }
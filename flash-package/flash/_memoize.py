@@ -0,0 +1,147 @@
+import collections
+import hashlib
+import inspect
+import time
+from typing import Any, Optional
+
+
+class CallbackCache:
+    """
+    In memory LRU cache for the serialized responses of ``memoize`` callbacks.
+
+    :param maxsize:
+        Maximum number of responses kept, the least recently used response is
+        dropped first. ``None`` keeps every response.
+    :param ttl:
+        Seconds a response stays valid. ``None`` keeps responses until they
+        are evicted.
+    """
+
+    def __init__(self, maxsize: Optional[int] = 128, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = collections.OrderedDict()
+
+    def get(self, key: str) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires is not None and expires < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any):
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        self._data[key] = (expires, value)
+        self._data.move_to_end(key)
+        if self.maxsize is not None:
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+
+
+class DiskcacheCallbackCache(CallbackCache):
+    """
+    ``memoize`` cache stored with diskcache, so the responses are shared by
+    every worker process using the same cache directory.
+
+    :param cache:
+        A diskcache.Cache or diskcache.FanoutCache instance. If not provided,
+        a diskcache.Cache instance will be created with default values.
+    :param ttl:
+        Seconds a response stays valid. ``None`` keeps responses until the
+        cache evicts them.
+    """
+
+    # pylint: disable=super-init-not-called
+    def __init__(self, cache=None, ttl: Optional[float] = None):
+        try:
+            import diskcache  # type: ignore[reportMissingImports]; pylint: disable=import-outside-toplevel
+        except ImportError as missing_imports:
+            raise ImportError(
+                """\
+DiskcacheCallbackCache requires extra dependencies which can be installed doing
+
+    $ pip install "dash[diskcache]"\n"""
+            ) from missing_imports
+
+        if cache is None:
+            self.handle = diskcache.Cache()
+        else:
+            if not isinstance(cache, (diskcache.Cache, diskcache.FanoutCache)):
+                raise ValueError(
+                    "First argument must be a diskcache.Cache "
+                    "or diskcache.FanoutCache object"
+                )
+            self.handle = cache
+        self.ttl = ttl
+
+    def get(self, key: str) -> Any:
+        return self.handle.get(key)
+
+    def set(self, key: str, value: Any):
+        self.handle.set(key, value, expire=self.ttl)
+
+    def clear(self):
+        self.handle.clear()
+
+
+def get_callback_cache(memoize):
+    """Resolve the ``memoize`` argument of `callback` to a cache instance."""
+    if memoize is None or memoize is False:
+        return None
+    if memoize is True:
+        return CallbackCache()
+    if isinstance(memoize, int):
+        return CallbackCache(maxsize=memoize)
+    if isinstance(memoize, dict):
+        return CallbackCache(**memoize)
+    if callable(getattr(memoize, "get", None)) and callable(
+        getattr(memoize, "set", None)
+    ):
+        return memoize
+    raise ValueError(
+        "memoize must be a bool, a maxsize int, a dict of CallbackCache "
+        "arguments or a cache with get and set methods."
+    )
+
+
+def function_hash(func, callback_id):
+    """Hash of the callback source, so persisted entries expire with code changes."""
+    try:
+        source = inspect.getsource(func)
+    except (OSError, TypeError):
+        source = getattr(func, "__qualname__", "")
+    return hashlib.sha256(f"{callback_id}{source}".encode("utf-8")).hexdigest()
+
+
+def build_cache_key(
+    fn_hash, args, cache_args_to_ignore, outputs_list, triggered, identity=None
+):
+    """
+    Same key rules as `BaseBackgroundCallbackManager.build_cache_key`, plus
+    the outputs so pattern matching callbacks are cached per component and
+    the ``memoize_key`` values identifying the user.
+    """
+    if not isinstance(cache_args_to_ignore, (list, tuple)):
+        cache_args_to_ignore = [cache_args_to_ignore]
+
+    if cache_args_to_ignore:
+        if isinstance(args, dict):
+            args = {k: v for k, v in args.items() if k not in cache_args_to_ignore}
+        else:
+            args = [arg for i, arg in enumerate(args) if i not in cache_args_to_ignore]
+
+    hash_dict = dict(
+        args=args,
+        fn_hash=fn_hash,
+        outputs=outputs_list,
+        triggered=triggered,
+        identity=identity,
+    )
+    return hashlib.sha256(str(hash_dict).encode("utf-8")).hexdigest()
@@ -0,0 +1,313 @@
+import bisect
+import collections
+
+SECONDS_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+CALLBACK_PHASES = ("parse", "execute", "serialize", "total")
+
+
+class Histogram:
+    """Cumulative histogram with fixed buckets, like a Prometheus histogram."""
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets=SECONDS_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self):
+        total = 0
+        for le, count in zip((*self.buckets, float("inf")), self.counts):
+            total += count
+            yield le, total
+
+    def snapshot(self):
+        return {
+            "buckets": dict(self.cumulative()),
+            "count": self.count,
+            "sum": self.sum,
+        }
+
+
+class CallbackStats:
+    __slots__ = ("phases", "response_bytes", "outcomes", "cancelled", "in_flight")
+
+    def __init__(self):
+        self.phases = {phase: Histogram() for phase in CALLBACK_PHASES}
+        self.response_bytes = Histogram(BYTES_BUCKETS)
+        self.outcomes = collections.Counter()
+        self.cancelled = collections.Counter()
+        self.in_flight = 0
+
+    def snapshot(self):
+        return {
+            "phases": {name: hist.snapshot() for name, hist in self.phases.items()},
+            "response_bytes": self.response_bytes.snapshot(),
+            "outcomes": dict(self.outcomes),
+            "cancelled": dict(self.cancelled),
+            "in_flight": self.in_flight,
+        }
+
+
+class StreamStats:
+    __slots__ = (
+        "duration",
+        "messages",
+        "bytes",
+        "coalesced",
+        "queued",
+        "dropped",
+        "errors",
+        "cancelled",
+        "in_flight",
+    )
+
+    def __init__(self):
+        self.duration = Histogram()
+        self.messages = 0
+        self.bytes = 0
+        self.coalesced = 0
+        # frames produced and waiting for a slow client, as of the last write
+        self.queued = 0
+        self.dropped = 0
+        self.errors = 0
+        self.cancelled = collections.Counter()
+        self.in_flight = 0
+
+    def snapshot(self):
+        return {
+            "duration": self.duration.snapshot(),
+            "messages": self.messages,
+            "bytes": self.bytes,
+            "coalesced": self.coalesced,
+            "queued": self.queued,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "cancelled": dict(self.cancelled),
+            "in_flight": self.in_flight,
+        }
+
+
+def record_phase(callback_context, phase, seconds):
+    """Store the duration of a phase measured in `add_context` on the request."""
+    phase_times = callback_context.get("phase_times")
+    if phase_times is None:
+        phase_times = callback_context["phase_times"] = {}
+    phase_times[phase] = seconds
+
+
+def _label(value):
+    value = str(value)
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{k}="{_label(v)}"' for k, v in labels.items()) + "}"
+
+
+class FlashMetrics:
+    """
+    Per callback latency, size and outcome metrics of an app, available as a
+    dict with `snapshot` and in the Prometheus text format with `render`.
+
+    :param queue_stats:
+        Function returning the concurrency limiter counters, see
+        `Flash.callback_queue_stats`.
+    """
+
+    def __init__(self, queue_stats=None):
+        self.callbacks = {}
+        self.streams = {}
+        self._queue_stats = queue_stats
+
+    def callback(self, callback_id) -> CallbackStats:
+        stats = self.callbacks.get(callback_id)
+        if stats is None:
+            stats = self.callbacks[callback_id] = CallbackStats()
+        return stats
+
+    def stream(self, callback_id) -> StreamStats:
+        stats = self.streams.get(callback_id)
+        if stats is None:
+            stats = self.streams[callback_id] = StreamStats()
+        return stats
+
+    def reset(self):
+        self.callbacks.clear()
+        self.streams.clear()
+
+    def snapshot(self):
+        return {
+            "callbacks": {k: v.snapshot() for k, v in self.callbacks.items()},
+            "streams": {k: v.snapshot() for k, v in self.streams.items()},
+            "queues": self._queue_stats() if self._queue_stats else {},
+        }
+
+    @staticmethod
+    def _histogram(lines, name, hist, **labels):
+        for le, count in hist.cumulative():
+            le = "+Inf" if le == float("inf") else repr(le)
+            lines.append(f"{name}_bucket{_labels(**labels, le=le)} {count}")
+        lines.append(f"{name}_sum{_labels(**labels)} {hist.sum}")
+        lines.append(f"{name}_count{_labels(**labels)} {hist.count}")
+
+    def render(self):
+        """Metrics in the Prometheus text exposition format."""
+        # pylint: disable=too-many-locals
+        lines = []
+
+        def header(name, kind, doc):
+            lines.append(f"# HELP {name} {doc}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        callbacks = list(self.callbacks.items())
+        header(
+            "flash_callback_seconds",
+            "histogram",
+            "Callback request time by phase.",
+        )
+        for callback_id, stats in callbacks:
+            for phase, hist in stats.phases.items():
+                self._histogram(
+                    lines,
+                    "flash_callback_seconds",
+                    hist,
+                    callback=callback_id,
+                    phase=phase,
+                )
+
+        header(
+            "flash_callback_response_bytes",
+            "histogram",
+            "Size of the callback responses.",
+        )
+        for callback_id, stats in callbacks:
+            self._histogram(
+                lines,
+                "flash_callback_response_bytes",
+                stats.response_bytes,
+                callback=callback_id,
+            )
+
+        header(
+            "flash_callback_requests_total",
+            "counter",
+            "Callback requests by outcome.",
+        )
+        for callback_id, stats in callbacks:
+            for outcome, count in stats.outcomes.items():
+                labels = _labels(callback=callback_id, outcome=outcome)
+                lines.append(f"flash_callback_requests_total{labels} {count}")
+
+        header(
+            "flash_callback_cancelled_total",
+            "counter",
+            "Abandoned callback invocations by reason.",
+        )
+        for callback_id, stats in callbacks:
+            for reason, count in stats.cancelled.items():
+                labels = _labels(callback=callback_id, reason=reason)
+                lines.append(f"flash_callback_cancelled_total{labels} {count}")
+
+        header(
+            "flash_callback_in_flight",
+            "gauge",
+            "Callback requests being processed.",
+        )
+        for callback_id, stats in callbacks:
+            labels = _labels(callback=callback_id)
+            lines.append(f"flash_callback_in_flight{labels} {stats.in_flight}")
+
+        queues = self._queue_stats() if self._queue_stats else {}
+        for name, kind, key, doc in (
+            ("flash_queue_waiting", "gauge", "waiting", "Requests waiting for a slot."),
+            ("flash_queue_active", "gauge", "active", "Requests holding a slot."),
+            (
+                "flash_queue_rejected_total",
+                "counter",
+                "rejected",
+                "Requests rejected with a full queue.",
+            ),
+            (
+                "flash_queue_wait_seconds_total",
+                "counter",
+                "queue_time",
+                "Total time requests waited for a slot.",
+            ),
+        ):
+            header(name, kind, doc)
+            for limiter, stats in queues.items():
+                lines.append(f"{name}{_labels(limiter=limiter)} {stats[key]}")
+
+        streams = list(self.streams.items())
+        header(
+            "flash_stream_seconds",
+            "histogram",
+            "Duration of the event_callback streams.",
+        )
+        for callback_id, stats in streams:
+            self._histogram(
+                lines, "flash_stream_seconds", stats.duration, callback=callback_id
+            )
+        for name, kind, attr, doc in (
+            ("flash_stream_in_flight", "gauge", "in_flight", "Open streams."),
+            ("flash_stream_messages_total", "counter", "messages", "Messages sent."),
+            ("flash_stream_bytes_total", "counter", "bytes", "Bytes sent."),
+            (
+                "flash_stream_coalesced_total",
+                "counter",
+                "coalesced",
+                "Updates replaced by a later value before being sent.",
+            ),
+            (
+                "flash_stream_queued",
+                "gauge",
+                "queued",
+                "Frames waiting to be written to slow clients.",
+            ),
+            (
+                "flash_stream_dropped_total",
+                "counter",
+                "dropped",
+                "Frames dropped for slow clients.",
+            ),
+            ("flash_stream_errors_total", "counter", "errors", "Stream errors."),
+        ):
+            header(name, kind, doc)
+            for callback_id, stats in streams:
+                value = getattr(stats, attr)
+                lines.append(f"{name}{_labels(callback=callback_id)} {value}")
+        header(
+            "flash_stream_cancelled_total",
+            "counter",
+            "Streams closed by the client.",
+        )
+        for callback_id, stats in streams:
+            for reason, count in stats.cancelled.items():
+                labels = _labels(callback=callback_id, reason=reason)
+                lines.append(f"flash_stream_cancelled_total{labels} {count}")
+
+        return "\n".join(lines) + "\n"
@@ -1,3 +1,4 @@
+from . import _get_app
 from ._get_app import get_app
 from ._callback_context import context_value
 from ._validate import validate_use_pages
@@ -162,8 +163,8 @@ def _create_redirect_function(redirect_to):
 
 
 def _set_redirect(redirect_from, path):
-    app = get_app()
     if redirect_from and len(redirect_from):
+        app = get_app()
         for redirect in redirect_from:
             fullname = app.get_relative_path(redirect)
             app.server.add_url_rule(
@@ -383,6 +384,11 @@ def register_page(
     ):
         PAGE_REGISTRY.move_to_end(page["module"])
 
+    # rebuild the index page with the new page, pages can also be registered
+    # before `init_app`, the index page is built later then
+    if _get_app.APP is not None or _get_app.app_context.get(None) is not None:
+        get_app().clear_index_cache()
+
 
 def _path_to_page(path_id):
     path_variables = None
@@ -0,0 +1,423 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+import typing as _t
+from urllib.parse import unquote, urlparse
+
+logger = logging.getLogger(__name__)
+
+# seconds a worker holds the lease of a channel producer without renewing it
+LEASE_TTL = 10.0
+# seconds between two connection attempts to the broker
+RECONNECT_DELAY = 1.0
+
+
+class Subscription:
+    """
+    Messages published to a topic once `ready` is done, read with
+    ``async for`` until `close`. With a `size`, a reader falling behind
+    loses the oldest messages waiting instead of growing the queue.
+    """
+
+    def __init__(
+        self,
+        topic: str,
+        on_close: _t.Callable[["Subscription"], None],
+        size: int = 0,
+    ):
+        self.topic = topic
+        self.queue: asyncio.Queue = asyncio.Queue(size)
+        # messages dropped for a slow reader
+        self.dropped = 0
+        # done once the backend receives the messages of the topic, those
+        # published before are not delivered
+        self.ready: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._on_close = on_close
+
+    def subscribed(self):
+        if not self.ready.done():
+            self.ready.set_result(None)
+
+    def deliver(self, data: bytes):
+        if self.queue.full():
+            self.queue.get_nowait()
+            if not self.dropped:
+                logger.warning("Slow reader of %s, dropping messages", self.topic)
+            self.dropped += 1
+        self.queue.put_nowait(data)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.queue.get()
+
+    def close(self):
+        self._on_close(self)
+
+
+class PubSubBackend(ABC):
+    """
+    Fan-out between the workers of an app, for the broadcast channels and the
+    multiplexed stream sessions. Backends publish bytes to topics and hold
+    leases, so a single worker runs the producer of a channel.
+    """
+
+    @abstractmethod
+    async def publish(self, topic: str, data: bytes):
+        raise NotImplementedError
+
+    @abstractmethod
+    def subscribe(self, topic: str, size: int = 0) -> Subscription:
+        """
+        Messages of `topic`, keeping at most `size` unread ones if set. Await
+        the `Subscription.ready` of the result before publishing anything its
+        reader waits for.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def acquire(self, name: str, token: str, ttl: float) -> bool:
+        """Take the lease `name` for `ttl` seconds if nobody holds it."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def renew(self, name: str, token: str, ttl: float) -> bool:
+        """Extend a lease held with `token`, ``False`` if it was lost."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def release(self, name: str, token: str):
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class MemoryBackend(PubSubBackend):
+    """Fan-out within the process, for apps running a single worker."""
+
+    def __init__(self):
+        self.topics: _t.Dict[str, _t.Set[Subscription]] = {}
+        self.leases: _t.Dict[str, _t.Tuple[str, float]] = {}
+
+    async def publish(self, topic, data):
+        for subscription in self.topics.get(topic, ()):
+            subscription.deliver(data)
+
+    def subscribe(self, topic, size=0):
+        subscription = Subscription(topic, self._unsubscribe, size)
+        self.topics.setdefault(topic, set()).add(subscription)
+        subscription.subscribed()
+        return subscription
+
+    def _unsubscribe(self, subscription):
+        subscriptions = self.topics.get(subscription.topic)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self.topics[subscription.topic]
+
+    def _holder(self, name):
+        holder, expires = self.leases.get(name, (None, 0.0))
+        return holder if expires > asyncio.get_running_loop().time() else None
+
+    async def acquire(self, name, token, ttl):
+        if self._holder(name) not in (None, token):
+            return False
+        self.leases[name] = (token, asyncio.get_running_loop().time() + ttl)
+        return True
+
+    async def renew(self, name, token, ttl):
+        if self._holder(name) != token:
+            return False
+        self.leases[name] = (token, asyncio.get_running_loop().time() + ttl)
+        return True
+
+    async def release(self, name, token):
+        if self._holder(name) == token:
+            del self.leases[name]
+
+
+class RespError(Exception):
+    """Error reply of the broker."""
+
+
+def encode_command(*args) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, str):
+            arg = arg.encode("utf-8")
+        elif not isinstance(arg, (bytes, bytearray)):
+            arg = str(arg).encode("utf-8")
+        parts.append(b"$%d\r\n" % len(arg))
+        parts.append(arg)
+        parts.append(b"\r\n")
+    return b"".join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader):
+    """Read one RESP2 reply, error replies are returned as `RespError`."""
+    line = await reader.readuntil(b"\r\n")
+    kind, value = line[:1], line[1:-2]
+    if kind == b"+":
+        return value.decode("utf-8")
+    if kind == b"-":
+        return RespError(value.decode("utf-8"))
+    if kind == b":":
+        return int(value)
+    if kind == b"$":
+        length = int(value)
+        if length < 0:
+            return None
+        return (await reader.readexactly(length + 2))[:-2]
+    if kind == b"*":
+        length = int(value)
+        if length < 0:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+    raise RespError(f"Unexpected reply {line!r}")
+
+
+class RespConnection:
+    """
+    A connection to a Redis protocol broker, one command at a time. A command
+    cancelled before its reply is read closes the connection, the reply would
+    otherwise be taken for the one of the next command.
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    async def open(cls, host, port, password=None, db=0):
+        reader, writer = await asyncio.open_connection(host, port)
+        connection = cls(reader, writer)
+        if password:
+            await connection.command("AUTH", password)
+        if db:
+            await connection.command("SELECT", db)
+        return connection
+
+    @property
+    def closed(self) -> bool:
+        return self.writer.is_closing()
+
+    async def command(self, *args):
+        async with self._lock:
+            if self.closed:
+                raise ConnectionResetError("The broker connection is closed.")
+            try:
+                self.writer.write(encode_command(*args))
+                await self.writer.drain()
+                reply = await read_reply(self.reader)
+            except asyncio.CancelledError:
+                self.writer.close()
+                raise
+        if isinstance(reply, RespError):
+            raise reply
+        return reply
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+
+# deletes or extends a lease only for the worker holding it
+_RENEW_SCRIPT = (
+    "if redis.call('get', KEYS[1]) == ARGV[1] then "
+    "return redis.call('pexpire', KEYS[1], ARGV[2]) else return 0 end"
+)
+_RELEASE_SCRIPT = (
+    "if redis.call('get', KEYS[1]) == ARGV[1] then "
+    "return redis.call('del', KEYS[1]) else return 0 end"
+)
+
+
+class RedisBackend(PubSubBackend):
+    """
+    Fan-out through a Redis protocol broker, speaking RESP over asyncio
+    streams. Commands share one connection and every topic of the worker
+    is received on a second one, in subscriber mode, where the subscribe
+    commands are queued and written by the listener. Subscriptions are
+    ready when the broker confirms their topic.
+
+    :param url: ``redis://[:password@]host[:port][/db]``
+    """
+
+    def __init__(self, url: str = "redis://localhost:6379/0"):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.strip("/") or 0)
+        self.topics: _t.Dict[str, _t.Set[Subscription]] = {}
+        self._commands: _t.Optional[RespConnection] = None
+        self._connecting: _t.Optional[asyncio.Future] = None
+        # subscribe commands waiting for the listener to write them
+        self._requests: asyncio.Queue = asyncio.Queue()
+        # SUBSCRIBE commands of a topic the broker has not confirmed yet
+        self._pending: _t.Dict[str, int] = {}
+        self._listener: _t.Optional[asyncio.Task] = None
+
+    async def _open(self):
+        return await RespConnection.open(self.host, self.port, self.password, self.db)
+
+    async def command(self, *args):
+        for attempt in (1, 2):
+            try:
+                if self._commands is None or self._commands.closed:
+                    # concurrent commands wait for the same connection
+                    connecting = self._connecting
+                    if connecting is None:
+                        connecting = self._connecting = asyncio.ensure_future(
+                            self._open()
+                        )
+                    try:
+                        self._commands = await asyncio.shield(connecting)
+                    finally:
+                        if connecting.done() and self._connecting is connecting:
+                            self._connecting = None
+                return await self._commands.command(*args)
+            except (ConnectionError, OSError, asyncio.IncompleteReadError):
+                # the broker restarted, try again once on a new connection
+                if self._commands is not None:
+                    await self._commands.close()
+                    self._commands = None
+                if attempt == 2:
+                    raise
+        return None  # pragma: no cover
+
+    async def publish(self, topic, data):
+        await self.command("PUBLISH", topic, data)
+
+    def subscribe(self, topic, size=0):
+        subscription = Subscription(topic, self._unsubscribe, size)
+        subscriptions = self.topics.setdefault(topic, set())
+        subscriptions.add(subscription)
+        if self._listener is None:
+            self._listener = asyncio.ensure_future(self._listen())
+        elif len(subscriptions) == 1:
+            self._pending[topic] = self._pending.get(topic, 0) + 1
+            self._requests.put_nowait(encode_command("SUBSCRIBE", topic))
+        elif not self._pending.get(topic) and any(
+            other.ready.done() for other in subscriptions
+        ):
+            # the topic is already received
+            subscription.subscribed()
+        return subscription
+
+    def _unsubscribe(self, subscription):
+        subscriptions = self.topics.get(subscription.topic)
+        if subscriptions is None:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self.topics[subscription.topic]
+            self._requests.put_nowait(encode_command("UNSUBSCRIBE", subscription.topic))
+
+    async def _send(self, connection: RespConnection):
+        while True:
+            connection.writer.write(await self._requests.get())
+            await connection.writer.drain()
+
+    async def _receive(self, connection: RespConnection):
+        while True:
+            reply = await read_reply(connection.reader)
+            if not isinstance(reply, list):
+                continue
+            topic = reply[1].decode("utf-8")
+            if reply[0] == b"message":
+                for subscription in self.topics.get(topic, ()):
+                    subscription.deliver(reply[2])
+            elif reply[0] == b"subscribe":
+                self._confirm(topic)
+
+    def _confirm(self, topic):
+        pending = self._pending.pop(topic, 0) - 1
+        if pending > 0:
+            # a later SUBSCRIBE follows an UNSUBSCRIBE of the topic
+            self._pending[topic] = pending
+            return
+        for subscription in self.topics.get(topic, ()):
+            subscription.subscribed()
+
+    async def _listen(self):
+        """Receive the messages of every topic, reconnecting when needed."""
+        while True:
+            try:
+                connection = await self._open()
+            except (ConnectionError, OSError) as err:
+                logger.warning("Cannot connect to the pub/sub broker: %s", err)
+                await asyncio.sleep(RECONNECT_DELAY)
+                continue
+
+            # commands queued while disconnected are covered by this one
+            self._requests = asyncio.Queue()
+            self._pending = dict.fromkeys(self.topics, 1)
+            if self.topics:
+                self._requests.put_nowait(encode_command("SUBSCRIBE", *self.topics))
+            tasks = (
+                asyncio.ensure_future(self._send(connection)),
+                asyncio.ensure_future(self._receive(connection)),
+            )
+            try:
+                done, _ = await asyncio.wait(
+                    tasks, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    task.result()
+            except (ConnectionError, OSError, asyncio.IncompleteReadError) as err:
+                logger.warning("Lost the pub/sub broker connection: %s", err)
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.wait(tasks)
+                await connection.close()
+            await asyncio.sleep(RECONNECT_DELAY)
+
+    async def acquire(self, name, token, ttl):
+        reply = await self.command("SET", name, token, "NX", "PX", int(ttl * 1000))
+        return reply == "OK"
+
+    async def renew(self, name, token, ttl):
+        reply = await self.command(
+            "EVAL", _RENEW_SCRIPT, 1, name, token, int(ttl * 1000)
+        )
+        return reply == 1
+
+    async def release(self, name, token):
+        await self.command("EVAL", _RELEASE_SCRIPT, 1, name, token)
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.wait((self._listener,))
+            self._listener = None
+        if self._commands is not None:
+            await self._commands.close()
+            self._commands = None
+
+
+def get_backend(pubsub) -> PubSubBackend:
+    """
+    Resolve the ``pubsub`` argument of `Flash`: ``None`` or ``"memory"``, a
+    ``redis://`` url or a `PubSubBackend`.
+    """
+    if pubsub is None or pubsub == "memory":
+        return MemoryBackend()
+    if isinstance(pubsub, PubSubBackend):
+        return pubsub
+    if isinstance(pubsub, str) and pubsub.startswith(("redis://", "rediss://")):
+        if pubsub.startswith("rediss://"):
+            raise ValueError("TLS connections to the pub/sub broker are not supported.")
+        return RedisBackend(pubsub)
+    raise ValueError(
+        f"Unknown pubsub {pubsub!r}, expected 'memory', a redis:// url "
+        "or a PubSubBackend."
+    )
@@ -0,0 +1,300 @@
+import asyncio
+import collections
+import os
+import secrets
+import shutil
+import tempfile
+import typing as _t
+
+# frames a resumable stream keeps for replay, by default
+REPLAY_SIZE = 1000
+# seconds a resumable stream waits for its client to reconnect
+RESUME_TIMEOUT = 30.0
+
+DONE_FRAME: _t.Final = b"data: [DONE]\n\n"
+
+
+def with_event_id(item: _t.Union[bytes, str], event_id: str) -> bytes:
+    """Give the last event of an encoded SSE message the id `event_id`."""
+    if isinstance(item, str):
+        item = item.encode("utf-8")
+    return item.rstrip(b"\n") + b"\nid: " + event_id.encode("utf-8") + b"\n\n"
+
+
+class MemoryReplayBuffer:
+    """The last `size` frames of a stream, by sequence number."""
+
+    def __init__(self, size: int):
+        self.frames: _t.Deque[_t.Tuple[int, bytes]] = collections.deque(maxlen=size)
+
+    @property
+    def first(self) -> int:
+        return self.frames[0][0] if self.frames else 0
+
+    async def append(self, seq: int, frame: bytes):
+        self.frames.append((seq, frame))
+
+    async def since(self, after: int) -> _t.List[_t.Tuple[int, bytes]]:
+        return [(seq, frame) for seq, frame in self.frames if seq > after]
+
+    async def close(self):
+        self.frames.clear()
+
+
+class DiskReplayBuffer:
+    """
+    The last `size` frames of a stream in files of a local directory, for
+    streams sending large frames. Frames are appended to segment files, a
+    segment is deleted once all of its frames fell out of the window.
+
+    The files are written and read in a thread, one operation at a time, so
+    a slow disk doesn't hold the event loop.
+    """
+
+    def __init__(self, size: int, directory: str):
+        self.size = size
+        self.directory = directory
+        self.path: _t.Optional[str] = None
+        self.segment_size = max(size // 4, 1)
+        # (seq, segment, offset, length)
+        self.index: _t.Deque[_t.Tuple[int, int, int, int]] = collections.deque()
+        # segments out of the window, deleted with the next write
+        self.expired: _t.List[int] = []
+        self._segment = -1
+        self._file: _t.Optional[_t.BinaryIO] = None
+        self._written = 0
+        self._lock = asyncio.Lock()
+
+    @property
+    def first(self) -> int:
+        return self.index[0][0] if self.index else 0
+
+    def _segment_path(self, segment):
+        return os.path.join(self.path, str(segment))
+
+    async def _in_thread(self, func, *args):
+        future = asyncio.get_running_loop().run_in_executor(None, func, *args)
+        try:
+            return await asyncio.shield(future)
+        finally:
+            # the lock is held until the file operation is over, even if cancelled
+            if not future.done():
+                await asyncio.wait((future,))
+
+    def _write(self, frame, expired):
+        if self.path is None:
+            self.path = tempfile.mkdtemp(prefix="stream-", dir=self.directory)
+        for segment in expired:
+            os.unlink(self._segment_path(segment))
+        if self._file is None or self._written >= self.segment_size:
+            if self._file is not None:
+                self._file.close()
+            self._segment += 1
+            # pylint: disable-next=consider-using-with
+            self._file = open(self._segment_path(self._segment), "ab")
+            self._written = 0
+        offset = self._file.tell()
+        self._file.write(frame)
+        self._file.flush()
+        self._written += 1
+        return self._segment, offset
+
+    async def append(self, seq: int, frame: bytes):
+        async with self._lock:
+            expired, self.expired = self.expired, []
+            segment, offset = await self._in_thread(self._write, frame, expired)
+            self.index.append((seq, segment, offset, len(frame)))
+            while len(self.index) > self.size:
+                _, segment, _, _ = self.index.popleft()
+                if self.index[0][1] != segment:
+                    self.expired.append(segment)
+
+    def _read(self, entries):
+        frames = []
+        handles = {}
+        try:
+            for seq, segment, offset, length in entries:
+                f = handles.get(segment)
+                if f is None:
+                    # pylint: disable-next=consider-using-with
+                    f = handles[segment] = open(self._segment_path(segment), "rb")
+                f.seek(offset)
+                frames.append((seq, f.read(length)))
+        finally:
+            for f in handles.values():
+                f.close()
+        return frames
+
+    async def since(self, after: int) -> _t.List[_t.Tuple[int, bytes]]:
+        async with self._lock:
+            entries = [entry for entry in self.index if entry[0] > after]
+            if not entries:
+                return []
+            return await self._in_thread(self._read, entries)
+
+    def _remove(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self.path is not None:
+            shutil.rmtree(self.path, ignore_errors=True)
+
+    async def close(self):
+        self.index.clear()
+        async with self._lock:
+            await self._in_thread(self._remove)
+
+
+class ReplayStream:
+    """
+    An `event_callback` stream surviving the loss of its connection. The
+    generator runs in its own task, every frame gets the id
+    ``<key>:<sequence number>`` and is kept in a replay buffer, so a client
+    reconnecting with ``Last-Event-ID`` gets the frames it missed.
+
+    The generator is paused when the client is `size` frames behind, and
+    cancelled when no client reconnected within `RESUME_TIMEOUT`.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        callback_id: str,
+        frames: _t.AsyncIterator,
+        buffer: _t.Union[MemoryReplayBuffer, DiskReplayBuffer],
+        size: int,
+        on_close: _t.Callable[[str], None],
+    ):
+        self.key = key
+        self.callback_id = callback_id
+        self.buffer = buffer
+        self.size = size
+        self.seq = 0
+        self.done = False
+        # sequence number of the last frame sent to the client
+        self.sent = 0
+        self.reader: _t.Optional[asyncio.Task] = None
+        # removal of the buffer, once closed
+        self.closed: _t.Optional[asyncio.Future] = None
+        self._on_close = on_close
+        self._changed = asyncio.Event()
+        self._expiry: _t.Optional[asyncio.TimerHandle] = None
+        self.task = asyncio.ensure_future(self._produce(frames))
+        self._schedule_expiry()
+
+    def _notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def _append(self, item):
+        seq = self.seq + 1
+        await self.buffer.append(seq, with_event_id(item, f"{self.key}:{seq}"))
+        # readers only see frames already in the buffer
+        self.seq = seq
+        self._notify()
+
+    async def _produce(self, frames):
+        try:
+            async for item in frames:
+                while self.seq - self.sent >= self.size:
+                    await self._changed.wait()
+                await self._append(item)
+            # tells the client not to reconnect
+            await self._append(DONE_FRAME)
+        finally:
+            self.done = True
+            self._notify()
+
+    def can_resume(self, after: int) -> bool:
+        """Whether every frame after `after` can still be replayed."""
+        return self.buffer.first - 1 <= after <= self.seq
+
+    async def read(self, after: int = 0):
+        """Frames after the sequence number `after`, then the live ones."""
+        if self.reader is not None:
+            self.reader.cancel("replaced")
+        if self._expiry is not None:
+            self._expiry.cancel()
+            self._expiry = None
+        self.reader = asyncio.current_task()
+        try:
+            while self.closed is None:
+                changed = self._changed
+                for seq, frame in await self.buffer.since(after):
+                    yield frame
+                    after = self.sent = seq
+                    self._notify()
+                if self.done and after >= self.seq:
+                    return
+                if after >= self.seq:
+                    await changed.wait()
+        finally:
+            if self.reader is asyncio.current_task():
+                self.reader = None
+                self._schedule_expiry()
+
+    def _schedule_expiry(self):
+        if self._expiry is None and self.closed is None:
+            self._expiry = asyncio.get_running_loop().call_later(
+                RESUME_TIMEOUT, self._expire
+            )
+
+    def _expire(self):
+        self._expiry = None
+        if self.reader is None:
+            self.close("disconnect")
+
+    def close(self, reason: str = "disconnect"):
+        self.task.cancel(reason)
+        if self._expiry is not None:
+            self._expiry.cancel()
+            self._expiry = None
+        if self.closed is None:
+            self.closed = asyncio.ensure_future(self.buffer.close())
+        self._on_close(self.key)
+
+
+class ReplayHub:
+    """
+    The resumable streams of the app, by key.
+
+    :param directory: Keep the replay buffers in files of this directory
+        instead of in memory.
+    """
+
+    def __init__(self, directory: _t.Optional[str] = None):
+        self.directory = directory
+        self.streams: _t.Dict[str, ReplayStream] = {}
+
+    def start(self, callback_id: str, frames: _t.AsyncIterator, size: int):
+        key = secrets.token_urlsafe(16)
+        if self.directory is None:
+            buffer = MemoryReplayBuffer(size)
+        else:
+            buffer = DiskReplayBuffer(size, self.directory)
+        stream = self.streams[key] = ReplayStream(
+            key, callback_id, frames, buffer, size, self._remove
+        )
+        return stream
+
+    def resume(self, callback_id: str, last_event_id: str):
+        """
+        The stream and sequence number a ``Last-Event-ID`` resumes from,
+        ``(None, 0)`` if the frames it missed are gone.
+        """
+        key, _, seq = last_event_id.rpartition(":")
+        stream = self.streams.get(key)
+        if stream is None or stream.callback_id != callback_id or not seq.isdigit():
+            return None, 0
+        if not stream.can_resume(int(seq)):
+            return None, 0
+        return stream, int(seq)
+
+    def _remove(self, key: str):
+        self.streams.pop(key, None)
+
+    async def close(self):
+        streams = list(self.streams.values())
+        for stream in streams:
+            stream.close("shutdown")
+        await asyncio.gather(*(stream.closed for stream in streams))
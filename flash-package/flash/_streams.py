@@ -0,0 +1,444 @@
+import asyncio
+import base64
+import collections
+import hashlib
+import hmac
+import json
+import re
+import secrets
+import typing as _t
+
+from ._event_callback import STREAM_QUEUE_SIZE, stream_props
+from ._pubsub import PubSubBackend
+
+TRANSPORTS: _t.Final = ("sse", "multiplex", "websocket")
+
+# seconds a session without an open connection keeps its streams running
+SESSION_TIMEOUT = 30.0
+# frames waiting for the connection of a session before the oldest are dropped,
+# whatever the ``overflow`` of their streams
+SESSION_QUEUE_SIZE = 1024
+# seconds between the comments keeping idle connections open through proxies
+KEEPALIVE_INTERVAL = 15.0
+
+KEEPALIVE_FRAME: _t.Final = b": keepalive\n\n"
+
+# http-only cookie with the random key of a client, its sessions are signed
+# with it so other clients can't read them or control their streams
+SESSION_COOKIE: _t.Final = "_flash_streams"
+
+# messages of the control topic of a session, and the probe sent to its readers
+CONTROL_SUFFIX: _t.Final = ":control"
+ALIVE: _t.Final = b"alive"
+STOP_PREFIX: _t.Final = b"stop:"
+PROBE: _t.Final = b"probe"
+
+_stream_id_re = re.compile(r"^[\w.:-]{1,128}$")
+
+
+def valid_stream_id(stream_id) -> bool:
+    """Ids are written in the ``event:`` field, so no line breaks allowed."""
+    return isinstance(stream_id, str) and bool(_stream_id_re.match(stream_id))
+
+
+def tag_frame(stream_id: str, item: _t.Union[bytes, str]) -> bytes:
+    """
+    Name every event of an encoded SSE message after its stream, the client
+    listens to each stream as an event type of the shared connection.
+    """
+    if isinstance(item, str):
+        item = item.encode("utf-8")
+    prefix = b"event: " + stream_id.encode("utf-8") + b"\n"
+    return b"".join(prefix + event + b"\n\n" for event in item.split(b"\n\n") if event)
+
+
+def done_frame(stream_id: str) -> bytes:
+    return tag_frame(stream_id, b"data: [DONE]\n\n")
+
+
+def event_data(item: _t.Union[bytes, str]) -> _t.List[str]:
+    """The ``data`` of every event of an encoded SSE message."""
+    if isinstance(item, bytes):
+        item = item.decode("utf-8")
+    events = []
+    for event in item.split("\n\n"):
+        lines = [
+            line[6:] if line.startswith("data: ") else line[5:]
+            for line in event.split("\n")
+            if line.startswith("data:")
+        ]
+        if lines:
+            events.append("\n".join(lines))
+    return events
+
+
+class Coalescer:
+    """
+    Frames waiting for the next send of a throttled stream. `stream_props`
+    updates are merged, keeping the latest value of each component prop,
+    other messages are kept as they are and in order.
+    """
+
+    def __init__(self):
+        self.frames: _t.List[bytes] = []
+        self.props: _t.Dict[tuple, tuple] = {}
+        # updates replaced by a later value before being sent
+        self.merged = 0
+
+    def __bool__(self):
+        return bool(self.frames or self.props)
+
+    def add(self, item: _t.Union[bytes, str]):
+        updates = getattr(item, "updates", None)
+        if updates is None:
+            self._close_batch()
+            self.frames.append(item.encode("utf-8") if isinstance(item, str) else item)
+            return
+        for component_id, props in updates:
+            key = (
+                component_id
+                if isinstance(component_id, str)
+                else json.dumps(component_id, sort_keys=True)
+            )
+            for prop, value in props.items():
+                if (key, prop) in self.props:
+                    self.merged += 1
+                self.props[(key, prop)] = (component_id, value)
+
+    def _close_batch(self):
+        if not self.props:
+            return
+        batch = {}
+        for (key, prop), (component_id, value) in self.props.items():
+            batch.setdefault(key, (component_id, {}))[1][prop] = value
+        self.frames.append(stream_props(batch=list(batch.values())))
+        self.props = {}
+
+    def flush(self) -> bytes:
+        self._close_batch()
+        data = b"".join(self.frames)
+        self.frames = []
+        return data
+
+
+async def throttle(
+    items: _t.AsyncIterator, min_interval: float, coalescer: Coalescer
+) -> _t.AsyncIterator[bytes]:
+    """
+    The items of `items`, at most one every `min_interval` seconds. Items
+    produced in between are merged by `coalescer` and sent together.
+    """
+    loop = asyncio.get_running_loop()
+    next_send = 0.0
+    step = asyncio.ensure_future(anext(items))
+    try:
+        while True:
+            timeout = max(next_send - loop.time(), 0) if coalescer else None
+            done, _ = await asyncio.wait((step,), timeout=timeout)
+            if done:
+                try:
+                    item = step.result()
+                except StopAsyncIteration:
+                    break
+                except Exception:
+                    if coalescer:
+                        yield coalescer.flush()
+                    raise
+                # the generator keeps producing while the frame is written
+                step = asyncio.ensure_future(anext(items))
+                if item is None:
+                    # left to the caller to warn about
+                    yield item
+                    continue
+                if not coalescer and loop.time() >= next_send:
+                    next_send = loop.time() + min_interval
+                    yield item
+                    continue
+                coalescer.add(item)
+            if coalescer and loop.time() >= next_send:
+                next_send = loop.time() + min_interval
+                yield coalescer.flush()
+        if coalescer:
+            yield coalescer.flush()
+    finally:
+        if not step.done():
+            step.cancel()
+        await asyncio.wait((step,))
+        if not step.cancelled():
+            # retrieved, the error was already raised or is moot
+            step.exception()
+
+
+class FrameQueue:
+    """
+    Frames of a stream produced and not written yet. The generator fills it
+    from its own task with `feed` while the response reads it with
+    ``async for``, so writing to a slow client does not hold it back until
+    `size` frames are waiting. Then the ``overflow`` policy applies:
+
+    - ``"block"`` pauses the generator until a frame is written,
+    - ``"drop-oldest"`` drops the oldest waiting frame,
+    - ``"coalesce"`` merges the waiting `stream_props` updates, keeping the
+      latest value of each component prop. Other messages wait for room.
+    """
+
+    def __init__(self, size: int = STREAM_QUEUE_SIZE, overflow: str = "block"):
+        self.size = size
+        self.overflow = overflow
+        self.frames: _t.Deque = collections.deque()
+        self.coalescer = Coalescer()
+        # frames dropped for the client
+        self.dropped = 0
+        self.done = False
+        self.error: _t.Optional[BaseException] = None
+        self._changed = asyncio.Event()
+
+    def __len__(self):
+        return len(self.frames) + bool(self.coalescer)
+
+    @property
+    def merged(self) -> int:
+        return self.coalescer.merged
+
+    def _notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def put(self, item):
+        if (
+            self.overflow == "coalesce"
+            and getattr(item, "updates", None) is not None
+            and (self.coalescer or len(self.frames) >= self.size)
+        ):
+            self.coalescer.add(item)
+            self._notify()
+            return
+        # frames merged earlier are sent first, they were produced first
+        while self.coalescer or len(self.frames) >= self.size:
+            if self.overflow == "drop-oldest":
+                self.frames.popleft()
+                self.dropped += 1
+            else:
+                await self._changed.wait()
+        self.frames.append(item)
+        self._notify()
+
+    async def feed(self, items: _t.AsyncIterator):
+        """Put the items of `items`, then end the queue with their error if any."""
+        try:
+            async for item in items:
+                await self.put(item)
+                # a generator that never awaits would hold the event loop
+                await asyncio.sleep(0)
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            self.error = err
+        finally:
+            self.done = True
+            self._notify()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while not self:
+            if self.done:
+                if self.error is not None:
+                    raise self.error
+                raise StopAsyncIteration
+            await self._changed.wait()
+        item = self.frames.popleft() if self.frames else self.coalescer.flush()
+        self._notify()
+        return item
+
+
+async def buffered(items: _t.AsyncIterator, queue: FrameQueue) -> _t.AsyncIterator:
+    """The items of `items` through `queue`, produced in a task of their own."""
+    producer = asyncio.ensure_future(queue.feed(items))
+    try:
+        async for item in queue:
+            yield item
+    finally:
+        producer.cancel()
+        await asyncio.wait((producer,))
+
+
+def session_topic(session_id: str) -> str:
+    return f"flash:session:{session_id}"
+
+
+class StreamSession:
+    """
+    The `event_callback` streams of one page started on this worker. Their
+    tagged frames are published to the topic of the session, read by the
+    worker holding the page connection, which may be another one.
+
+    Streams only start once the connection of the page is known to be open
+    and are stopped when a stop is published on the control topic of the
+    session, or when its connection sent no heartbeat for `SESSION_TIMEOUT`.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        backend: PubSubBackend,
+        on_close: _t.Callable[[str], None],
+    ):
+        self.id = session_id
+        self.topic = session_topic(session_id)
+        self.backend = backend
+        self.streams: _t.Dict[str, asyncio.Task] = {}
+        self.alive = asyncio.Event()
+        self._on_close = on_close
+        self._expiry: _t.Optional[asyncio.TimerHandle] = None
+        self._control = backend.subscribe(self.topic + CONTROL_SUFFIX)
+        self._listener = asyncio.ensure_future(self._listen())
+        self._schedule_expiry()
+
+    async def _listen(self):
+        # asks a connection opened earlier for a heartbeat, once its answer on
+        # the control topic is received
+        await self._control.ready
+        await self.backend.publish(self.topic, PROBE)
+        async for message in self._control:
+            if message == ALIVE:
+                self.alive.set()
+                self._schedule_expiry()
+            elif message.startswith(STOP_PREFIX):
+                self.stop(message[len(STOP_PREFIX) :].decode("utf-8"))
+
+    def start(self, stream_id: str, frames: _t.AsyncIterator[bytes]):
+        self._cancel(stream_id, "restarted")
+        self.streams[stream_id] = asyncio.ensure_future(self._pump(stream_id, frames))
+
+    async def _pump(self, stream_id, frames):
+        try:
+            await self.alive.wait()
+            async for item in frames:
+                await self.backend.publish(self.topic, tag_frame(stream_id, item))
+            await self.backend.publish(self.topic, done_frame(stream_id))
+        finally:
+            if self.streams.get(stream_id) is asyncio.current_task():
+                del self.streams[stream_id]
+                if not self.streams:
+                    self.close("done")
+
+    def _cancel(self, stream_id, reason):
+        task = self.streams.pop(stream_id, None)
+        if task is not None:
+            task.cancel(reason)
+        return task is not None
+
+    def stop(self, stream_id: str, reason: str = "stopped"):
+        if self._cancel(stream_id, reason) and not self.streams:
+            self.close("done")
+
+    def _schedule_expiry(self):
+        if self._expiry is not None:
+            self._expiry.cancel()
+        self._expiry = asyncio.get_running_loop().call_later(
+            SESSION_TIMEOUT, self.close, "disconnect"
+        )
+
+    def close(self, reason: str = "disconnect"):
+        for stream_id in list(self.streams):
+            self._cancel(stream_id, reason)
+        if self._expiry is not None:
+            self._expiry.cancel()
+            self._expiry = None
+        self._listener.cancel()
+        self._control.close()
+        self._on_close(self.id)
+
+
+def _signature(secret: bytes, client_key: str, token: str) -> str:
+    digest = hmac.new(
+        secret, f"{client_key}:{token}".encode("utf-8"), hashlib.sha256
+    ).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
+
+
+class StreamHub:
+    """
+    The multiplexed stream sessions of the app: the streams started on this
+    worker by session id, and the connections reading them.
+    """
+
+    def __init__(self, backend: PubSubBackend):
+        self.backend = backend
+        self.sessions: _t.Dict[str, StreamSession] = {}
+        # signs the session ids when the server has no ``secret_key``, only
+        # this worker accepts them then
+        self.secret = secrets.token_bytes(32)
+
+    def _secret(self, secret) -> bytes:
+        if not secret:
+            return self.secret
+        return secret.encode("utf-8") if isinstance(secret, str) else secret
+
+    def issue(self, client_key: str, secret=None) -> str:
+        """
+        A new session id for the client holding `client_key`, signed with
+        `secret` so every worker sharing it accepts the session.
+        """
+        token = secrets.token_urlsafe(16)
+        return f"{token}.{_signature(self._secret(secret), client_key, token)}"
+
+    def verify(self, session_id, client_key, secret=None) -> bool:
+        """Whether `session_id` was issued to the client holding `client_key`."""
+        if not (valid_stream_id(session_id) and client_key):
+            return False
+        token, _, signature = session_id.partition(".")
+        return hmac.compare_digest(
+            signature, _signature(self._secret(secret), client_key, token)
+        )
+
+    def get(self, session_id: str) -> StreamSession:
+        session = self.sessions.get(session_id)
+        if session is None:
+            session = self.sessions[session_id] = StreamSession(
+                session_id, self.backend, self._remove
+            )
+        return session
+
+    async def stop(self, session_id: str, stream_id: str):
+        """Stop a stream of the session, on whichever worker runs it."""
+        await self.backend.publish(
+            session_topic(session_id) + CONTROL_SUFFIX,
+            STOP_PREFIX + stream_id.encode("utf-8"),
+        )
+
+    async def read(self, session_id: str):
+        """
+        Frames of the session for its connection, with keepalive comments
+        while idle and heartbeats keeping its streams running.
+        """
+        topic = session_topic(session_id)
+        frames = self.backend.subscribe(topic, SESSION_QUEUE_SIZE)
+        loop = asyncio.get_running_loop()
+        try:
+            # the streams start on ALIVE, their first frames must be received
+            await frames.ready
+            await self.backend.publish(topic + CONTROL_SUFFIX, ALIVE)
+            heartbeat = loop.time() + KEEPALIVE_INTERVAL
+            while True:
+                try:
+                    frame = await asyncio.wait_for(
+                        anext(frames), max(heartbeat - loop.time(), 0)
+                    )
+                except asyncio.TimeoutError:
+                    yield KEEPALIVE_FRAME
+                    frame = None
+                if frame == PROBE or loop.time() >= heartbeat:
+                    await self.backend.publish(topic + CONTROL_SUFFIX, ALIVE)
+                    heartbeat = loop.time() + KEEPALIVE_INTERVAL
+                if frame is not None and frame != PROBE:
+                    yield frame
+        finally:
+            frames.close()
+
+    def _remove(self, session_id: str):
+        self.sessions.pop(session_id, None)
+
+    def close(self):
+        for session in list(self.sessions.values()):
+            session.close("shutdown")
@@ -4,10 +4,20 @@ from quart.utils import run_sync
 
 
 async def _invoke_callback(func, *func_args, **func_kwargs):
+    return await _run_callback(
+        func, inspect.iscoroutinefunction(func), func_args, func_kwargs
+    )
 
-    if inspect.iscoroutinefunction(func):
+
+async def _run_callback(func, is_coroutine, func_args, func_kwargs, executor=None):
+    if is_coroutine:
         output_value = await func(*func_args, **func_kwargs)  # %% callback invoked %%
 
+    elif executor is not None:
+        output_value = await executor(
+            func, func_args, func_kwargs
+        )  # %% callback invoked %%
+
     else:
         output_value = await run_sync(func)(
             *func_args, **func_kwargs
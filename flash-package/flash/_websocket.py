@@ -0,0 +1,162 @@
+import asyncio
+import collections
+import json
+import logging
+import typing as _t
+
+logger = logging.getLogger(__name__)
+
+# messages of a stream waiting for a slow client before its generator waits
+SEND_QUEUE_SIZE = 64
+# callback requests of a connection running at once, the others wait for a slot
+MAX_IN_FLIGHT = 16
+
+# messages of a stream, sent in order through its queue
+STREAM_KINDS: _t.Final = frozenset(("event", "done"))
+
+
+def frame(kind: str, msg_id: str, payload: str = "", **fields) -> str:
+    """
+    A message for the client, a JSON header line with its type and the id of
+    the request or stream it answers followed by the raw payload, so callback
+    responses and stream events are sent without being encoded again.
+    """
+    header = json.dumps({"type": kind, "id": msg_id, **fields}, separators=(",", ":"))
+    return f"{header}\n{payload}"
+
+
+class SocketConnection:
+    """
+    The websocket of a page, carrying its callback requests and its
+    `event_callback` streams. Each one runs in its own task under the id
+    given by the client, which can cancel it at any time.
+
+    Every stream has its own bounded queue of outgoing messages, a client
+    reading slowly pauses the generator writing to it instead of letting
+    its messages pile up in memory. The queues are written in turns, so a
+    busy stream doesn't hold back the others, and callback responses are
+    written before any of them.
+    """
+
+    def __init__(
+        self,
+        send: _t.Callable[[str], _t.Awaitable[None]],
+        close: _t.Callable[[int], _t.Awaitable[None]],
+    ):
+        self._send = send
+        self._close = close
+        self.outboxes: _t.Dict[str, asyncio.Queue] = {}
+        # callback responses, one per request and at most `MAX_IN_FLIGHT`
+        self.responses: _t.Deque[str] = collections.deque()
+        self.tasks: _t.Dict[str, asyncio.Task] = {}
+        self._slots = asyncio.Semaphore(MAX_IN_FLIGHT)
+        # ids of the queues with messages waiting, in the order of their turns
+        self._turns: _t.Dict[str, None] = {}
+        self._waiting = asyncio.Event()
+        self._writer: _t.Optional[asyncio.Task] = None
+
+    async def put(self, kind: str, msg_id: str, payload: str = "", **fields):
+        message = frame(kind, msg_id, payload, **fields)
+        outbox = self.outboxes.get(msg_id)
+        if outbox is None and kind not in STREAM_KINDS:
+            self.responses.append(message)
+        else:
+            if outbox is None:
+                outbox = self.outboxes[msg_id] = asyncio.Queue(SEND_QUEUE_SIZE)
+            await outbox.put(message)
+            self._turns[msg_id] = None
+        self._waiting.set()
+
+    def _next(self) -> _t.Optional[str]:
+        if self.responses:
+            return self.responses.popleft()
+        for msg_id in self._turns:
+            break
+        else:
+            return None
+        del self._turns[msg_id]
+        outbox = self.outboxes[msg_id]
+        message = outbox.get_nowait()
+        if not outbox.empty():
+            self._turns[msg_id] = None
+        elif msg_id not in self.tasks:
+            del self.outboxes[msg_id]
+        return message
+
+    async def writer(self):
+        while True:
+            message = self._next()
+            if message is None:
+                self._waiting.clear()
+                await self._waiting.wait()
+                continue
+            await self._send(message)
+
+    def start(self) -> asyncio.Task:
+        """Start writing the messages, a failed write closes the connection."""
+        self._writer = asyncio.ensure_future(self.writer())
+        self._writer.add_done_callback(self._writer_done)
+        return self._writer
+
+    def _writer_done(self, task: asyncio.Task):
+        if task.cancelled():
+            return
+        logger.error("Websocket writer failed", exc_info=task.exception())
+        self.close("error")
+        # ends the receive loop of the connection as well
+        asyncio.ensure_future(self._close(1011))
+
+    def run(self, msg_id: str, coro: _t.Coroutine, limited: bool = False):
+        """
+        Run `coro` for the request or stream `msg_id`, `limited` ones wait for
+        one of the `MAX_IN_FLIGHT` slots of the connection.
+        """
+        self.cancel(msg_id, "restarted")
+        self.tasks[msg_id] = asyncio.ensure_future(self._run(msg_id, coro, limited))
+
+    async def _run(self, msg_id, coro, limited):
+        try:
+            if limited:
+                async with self._slots:
+                    await coro
+            else:
+                await coro
+        except asyncio.CancelledError:
+            raise
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception("Websocket message %s failed", msg_id)
+            await self.put("error", msg_id)
+        finally:
+            # never awaited if cancelled while waiting for a slot
+            coro.close()
+            if self.tasks.get(msg_id) is asyncio.current_task():
+                del self.tasks[msg_id]
+                self._drop_outbox(msg_id)
+
+    def _drop_outbox(self, msg_id):
+        # the writer drops it once sent otherwise
+        outbox = self.outboxes.get(msg_id)
+        if outbox is not None and outbox.empty():
+            del self.outboxes[msg_id]
+
+    def cancel(self, msg_id: str, reason: str = "stopped"):
+        task = self.tasks.pop(msg_id, None)
+        if task is not None:
+            task.cancel(reason)
+            self._drop_outbox(msg_id)
+
+    def close(self, reason: str = "disconnect") -> _t.List[str]:
+        """Cancel everything still running, returns the ids of the cancelled."""
+        cancelled = list(self.tasks)
+        for msg_id in cancelled:
+            self.cancel(msg_id, reason)
+        return cancelled
+
+    async def shutdown(self):
+        """Tell the client the server gave up on its requests and streams."""
+        for msg_id in self.close("shutdown"):
+            try:
+                await self._send(frame("cancel", msg_id, reason="shutdown"))
+            except Exception:  # pylint: disable=broad-exception-caught
+                # the client is already gone
+                return
@@ -1 +1 @@
-"use strict";(self.webpackChunkflash=self.webpackChunkflash||[]).push([[57],{384:(t,e,s)=>{s.r(e),s.d(e,{default:()=>h});var n=s(295),i=s.n(n),r=function(t,e){if(!(this instanceof r))return new r(t,e);this.url=t,e=e||{},this.headers=e.headers||{},this.payload=void 0!==e.payload?e.payload:"",this.method=e.method||(this.payload?"POST":"GET"),this.withCredentials=!!e.withCredentials,this.debug=!!e.debug,this.FIELD_SEPARATOR=":",this.listeners={},this.xhr=null,this.readyState=r.INITIALIZING,this.progress=0,this.chunk="",this.lastEventId="",this.addEventListener=function(t,e){void 0===this.listeners[t]&&(this.listeners[t]=[]),-1===this.listeners[t].indexOf(e)&&this.listeners[t].push(e)},this.removeEventListener=function(t,e){if(void 0===this.listeners[t])return;const s=[];this.listeners[t].forEach(function(t){t!==e&&s.push(t)}),0===s.length?delete this.listeners[t]:this.listeners[t]=s},this.dispatchEvent=function(t){if(!t)return!0;this.debug&&console.debug(t),t.source=this;const e="on"+t.type;return(!this.hasOwnProperty(e)||(this[e].call(this,t),!t.defaultPrevented))&&(!this.listeners[t.type]||this.listeners[t.type].every(function(e){return e(t),!t.defaultPrevented}))},this._markClosed=function(){this.xhr=null,this.progress=0,this.chunk="",this._setReadyState(r.CLOSED)},this._setReadyState=function(t){const e=new CustomEvent("readystatechange");e.readyState=t,this.readyState=t,this.dispatchEvent(e)},this._onStreamFailure=function(t){const e=new CustomEvent("error");e.responseCode=t.currentTarget.status,e.data=t.currentTarget.response,this.dispatchEvent(e),this._markClosed()},this._onStreamAbort=function(){this.dispatchEvent(new CustomEvent("abort")),this._markClosed()},this._onStreamProgress=function(t){if(!this.xhr)return;if(this.xhr.status<200||this.xhr.status>=300)return void this._onStreamFailure(t);const e=this.xhr.responseText.substring(this.progress);this.progress+=e.length;const s=(this.chunk+e).split(/(\r\n\r\n|\r\r|\n\n)/g),n=s.pop();s.forEach(function(t){t.trim().length>0&&this.dispatchEvent(this._parseEventChunk(t))}.bind(this)),this.chunk=n},this._onStreamLoaded=function(t){this._onStreamProgress(t),this.dispatchEvent(this._parseEventChunk(this.chunk)),this.chunk="",this._markClosed()},this._parseEventChunk=function(t){if(!t||0===t.length)return null;this.debug&&console.debug(t);const e={id:null,retry:null,data:null,event:null};t.split(/\n|\r\n|\r/).forEach(function(t){const s=t.indexOf(this.FIELD_SEPARATOR);let n,i;if(s>0){const e=" "===t[s+1]?2:1;n=t.substring(0,s),i=t.substring(s+e)}else{if(!(s<0))return;n=t,i=""}n in e&&("data"===n&&null!==e[n]?e.data+="\n"+i:e[n]=i)}.bind(this)),null!==e.id&&(this.lastEventId=e.id);const s=new CustomEvent(e.event||"message");return s.id=e.id,s.data=e.data||"",s.lastEventId=this.lastEventId,s},this._onReadyStateChange=function(){if(this.xhr&&this.xhr.readyState===XMLHttpRequest.HEADERS_RECEIVED){const t={},e=this.xhr.getAllResponseHeaders().trim().split("\r\n");for(const s of e){const[e,...n]=s.split(":"),i=n.join(":").trim();t[e.trim().toLowerCase()]=t[e.trim().toLowerCase()]||[],t[e.trim().toLowerCase()].push(i)}const s=new CustomEvent("open");s.responseCode=this.xhr.status,s.headers=t,this.dispatchEvent(s),this._setReadyState(r.OPEN)}},this.stream=function(){if(!this.xhr){this._setReadyState(r.CONNECTING),this.xhr=new XMLHttpRequest,this.xhr.addEventListener("progress",this._onStreamProgress.bind(this)),this.xhr.addEventListener("load",this._onStreamLoaded.bind(this)),this.xhr.addEventListener("readystatechange",this._onReadyStateChange.bind(this)),this.xhr.addEventListener("error",this._onStreamFailure.bind(this)),this.xhr.addEventListener("abort",this._onStreamAbort.bind(this)),this.xhr.open(this.method,this.url);for(let t in this.headers)this.xhr.setRequestHeader(t,this.headers[t]);this.lastEventId.length>0&&this.xhr.setRequestHeader("Last-Event-ID",this.lastEventId),this.xhr.withCredentials=this.withCredentials,this.xhr.send(this.payload)}},this.close=function(){this.readyState!==r.CLOSED&&this.xhr.abort()},(void 0===e.start||e.start)&&this.stream()};r.INITIALIZING=-1,r.CONNECTING=0,r.OPEN=1,r.CLOSED=2,"undefined"!=typeof exports&&(exports.SSE=r);const h=function(t){var e=t.url,s=t.options,h=t.concat,a=void 0===h||h,o=t.setProps,d=t.done,u=t.update_component,l=(0,n.useState)(""),c=l[0],f=l[1],p=(0,n.useState)(d||!1),E=p[0],v=p[1];return(0,n.useEffect)(function(){if(v(!1),f(""),e){var t=new r(e,s);return t.onmessage=function(e){var s;if("[DONE]"===e.data)return v(!0),void t.close();var n=null===(s=window.dash_clientside)||void 0===s?void 0:s.set_props;if(u&&n)try{var i=JSON.parse(e.data);if(Array.isArray(i)){var r=i[0],h=i[1],a=i[2];switch(r){case"[ERROR]":a.handle_error&&window.alert("Error from SSE stream: ".concat(a.error)),a.reset_props&&a.reset_props.forEach(function(t){if(Array.isArray(t)&&2===t.length){var e=t[0],s=t[1];n(e,s)}}),t.close();break;case"[SINGLE]":n(h,a);break;case"[BATCH]":Array.isArray(a)&&a.forEach(function(t){if(Array.isArray(t)&&2===t.length){var e=t[0],s=t[1];n(e,s)}});break;default:console.warn("Unknown stream type:",r)}}}catch(t){console.log("Not a JSON message, ignoring for update_component",e.data)}},t.onerror=function(e){console.log("Unhandled SSE ERROR",e),t.close()},function(){t.close()}}},[e,s,a]),(0,n.useEffect)(function(){o&&o({value:c,done:E})},[c,E,o]),i().createElement(i().Fragment,null)}}}]);
\ No newline at end of file
+"use strict";(self.webpackChunkflash=self.webpackChunkflash||[]).push([[57],{384:(t,e,s)=>{s.r(e),s.d(e,{default:()=>h});var n=s(295),i=s.n(n),r=function(t,e){if(!(this instanceof r))return new r(t,e);this.url=t,e=e||{},this.headers=e.headers||{},this.payload=void 0!==e.payload?e.payload:"",this.method=e.method||(this.payload?"POST":"GET"),this.withCredentials=!!e.withCredentials,this.debug=!!e.debug,this.FIELD_SEPARATOR=":",this.listeners={},this.xhr=null,this.readyState=r.INITIALIZING,this.progress=0,this.chunk="",this.lastEventId="",this.addEventListener=function(t,e){void 0===this.listeners[t]&&(this.listeners[t]=[]),-1===this.listeners[t].indexOf(e)&&this.listeners[t].push(e)},this.removeEventListener=function(t,e){if(void 0===this.listeners[t])return;const s=[];this.listeners[t].forEach(function(t){t!==e&&s.push(t)}),0===s.length?delete this.listeners[t]:this.listeners[t]=s},this.dispatchEvent=function(t){if(!t)return!0;this.debug&&console.debug(t),t.source=this;const e="on"+t.type;return(!this.hasOwnProperty(e)||(this[e].call(this,t),!t.defaultPrevented))&&(!this.listeners[t.type]||this.listeners[t.type].every(function(e){return e(t),!t.defaultPrevented}))},this._markClosed=function(){this.xhr=null,this.progress=0,this.chunk="",this._setReadyState(r.CLOSED)},this._setReadyState=function(t){const e=new CustomEvent("readystatechange");e.readyState=t,this.readyState=t,this.dispatchEvent(e)},this._onStreamFailure=function(t){const e=new CustomEvent("error");e.responseCode=t.currentTarget.status,e.data=t.currentTarget.response,this.dispatchEvent(e),this._markClosed()},this._onStreamAbort=function(){this.dispatchEvent(new CustomEvent("abort")),this._markClosed()},this._onStreamProgress=function(t){if(!this.xhr)return;if(this.xhr.status<200||this.xhr.status>=300)return void this._onStreamFailure(t);const e=this.xhr.responseText.substring(this.progress);this.progress+=e.length;const s=(this.chunk+e).split(/(\r\n\r\n|\r\r|\n\n)/g),n=s.pop();s.forEach(function(t){t.trim().length>0&&this.dispatchEvent(this._parseEventChunk(t))}.bind(this)),this.chunk=n},this._onStreamLoaded=function(t){this._onStreamProgress(t),this.dispatchEvent(this._parseEventChunk(this.chunk)),this.chunk="",this._markClosed()},this._parseEventChunk=function(t){if(!t||0===t.length)return null;this.debug&&console.debug(t);const e={id:null,retry:null,data:null,event:null};t.split(/\n|\r\n|\r/).forEach(function(t){const s=t.indexOf(this.FIELD_SEPARATOR);let n,i;if(s>0){const e=" "===t[s+1]?2:1;n=t.substring(0,s),i=t.substring(s+e)}else{if(!(s<0))return;n=t,i=""}n in e&&("data"===n&&null!==e[n]?e.data+="\n"+i:e[n]=i)}.bind(this)),null!==e.id&&(this.lastEventId=e.id);const s=new CustomEvent(e.event||"message");return s.id=e.id,s.data=e.data||"",s.lastEventId=this.lastEventId,s},this._onReadyStateChange=function(){if(this.xhr&&this.xhr.readyState===XMLHttpRequest.HEADERS_RECEIVED){const t={},e=this.xhr.getAllResponseHeaders().trim().split("\r\n");for(const s of e){const[e,...n]=s.split(":"),i=n.join(":").trim();t[e.trim().toLowerCase()]=t[e.trim().toLowerCase()]||[],t[e.trim().toLowerCase()].push(i)}const s=new CustomEvent("open");s.responseCode=this.xhr.status,s.headers=t,this.dispatchEvent(s),this._setReadyState(r.OPEN)}},this.stream=function(){if(!this.xhr){this._setReadyState(r.CONNECTING),this.xhr=new XMLHttpRequest,this.xhr.addEventListener("progress",this._onStreamProgress.bind(this)),this.xhr.addEventListener("load",this._onStreamLoaded.bind(this)),this.xhr.addEventListener("readystatechange",this._onReadyStateChange.bind(this)),this.xhr.addEventListener("error",this._onStreamFailure.bind(this)),this.xhr.addEventListener("abort",this._onStreamAbort.bind(this)),this.xhr.open(this.method,this.url);for(let t in this.headers)this.xhr.setRequestHeader(t,this.headers[t]);this.lastEventId.length>0&&this.xhr.setRequestHeader("Last-Event-ID",this.lastEventId),this.xhr.withCredentials=this.withCredentials,this.xhr.send(this.payload)}},this.close=function(){this.readyState!==r.CLOSED&&this.xhr.abort()},(void 0===e.start||e.start)&&this.stream()};r.INITIALIZING=-1,r.CONNECTING=0,r.OPEN=1,r.CLOSED=2,"undefined"!=typeof exports&&(exports.SSE=r);var m=function(){return m=Object.assign||function(t){for(var e,s=1,n=arguments.length;s<n;s++)for(var i in e=arguments[s])Object.prototype.hasOwnProperty.call(e,i)&&(t[i]=e[i]);return t},m.apply(this,arguments)},g=function(){function t(t){this.url=t,this.session=null,this.source=null,this.listeners=new Map,this.counter=0}return t.prototype.getSession=function(t){var e=this;if(!this.session){var s=fetch("".concat(this.url,"/session"),{method:"POST",headers:m({},null==t?void 0:t.headers),credentials:(null==t?void 0:t.withCredentials)?"include":"same-origin"}).then(function(t){if(!t.ok)throw new Error("SSE session refused: ".concat(t.status));return t.json()}).then(function(t){return t.session});s.catch(function(){e.session===s&&(e.session=null)}),this.session=s}return this.session},t.prototype.connect=function(t,e){return this.source||(this.source=new r("".concat(this.url,"/session/").concat(t),{method:"GET",withCredentials:null==e?void 0:e.withCredentials}),this.source.onerror=function(t){console.log("Unhandled SSE ERROR",t)}),this.source},t.prototype.control=function(t,e,s){return fetch("".concat(this.url,"/control"),{method:"POST",headers:m(m({},null==s?void 0:s.headers),{"Content-Type":"application/json"}),credentials:(null==s?void 0:s.withCredentials)?"include":"same-origin",body:JSON.stringify(m({session:t},e)),keepalive:!0})},t.prototype.start=function(t,e){var s=this,n="s".concat(++this.counter);this.listeners.set(n,e);var i=JSON.parse(t.payload||"{}");return this.getSession(t).then(function(r){s.listeners.get(n)===e&&(s.connect(r,t).addEventListener(n,e),s.control(r,{action:"start",stream:n,content:i.content},t))},function(t){return console.log("Unhandled SSE ERROR",t)}),n},t.prototype.stop=function(t,e){var s,n,i=this;void 0===e&&(e=!0);var r=this.listeners.get(t);r&&(this.listeners.delete(t),null===(s=this.source)||void 0===s||s.removeEventListener(t,r),e&&this.session&&this.session.then(function(e){return i.control(e,{action:"stop",stream:t})},function(){}),0===this.listeners.size&&(null===(n=this.source)||void 0===n||n.close(),this.source=null))},t}(),y={},b=function(t){return y[t]=y[t]||new g(t)};const h=function(t){var e=t.url,s=t.options,c=t.concat,a=void 0===c||c,o=t.setProps,d=t.done,u=t.update_component,h=t.transport,l=void 0===h?"sse":h,f=(0,n.useState)(""),p=f[0],E=f[1],v=(0,n.useState)(d||!1),w=v[0],S=v[1];return(0,n.useEffect)(function(){var t,k;if(S(!1),E(""),e){var x=function(e){var s;if("[DONE]"===e.data)return S(!0),void t(!1);var n=null===(s=window.dash_clientside)||void 0===s?void 0:s.set_props;if(u&&n)try{var i=JSON.parse(e.data);if(Array.isArray(i)){var r=i[0],h=i[1],a=i[2];switch(r){case"[ERROR]":a.handle_error&&window.alert("Error from SSE stream: ".concat(a.error)),a.reset_props&&a.reset_props.forEach(function(t){if(Array.isArray(t)&&2===t.length){var e=t[0],s=t[1];n(e,s)}}),t(!1);break;case"[SINGLE]":n(h,a);break;case"[BATCH]":Array.isArray(a)&&a.forEach(function(t){if(Array.isArray(t)&&2===t.length){var e=t[0],s=t[1];n(e,s)}});break;default:console.warn("Unknown stream type:",r)}}}catch(t){console.log("Not a JSON message, ignoring for update_component",e.data)}},C=null===(k=window.dash_component_api)||void 0===k?void 0:k.getSocket;if("websocket"===l&&C&&s){var D=C(),P=JSON.parse(s.payload||"{}"),O=D.start(P.content,function(t){return x({data:t})});t=function(t){return void 0===t&&(t=!0),t&&D.stop(O)}}else if("multiplex"===l&&s){var L=b(e),j=L.start(s,x);t=function(t){return void 0===t&&(t=!0),L.stop(j,t)}}else{var _,A="",N=0,I=!1,T=void 0,R=function(){var t=m({},null==s?void 0:s.headers);A&&(t["Last-Event-ID"]=A);var n=_=new r(e,m(m({},s),{headers:t}));n.onmessage=function(t){t.id&&(A=t.id,N=0),x(t)},n.onerror=function(t){A||console.log("Unhandled SSE ERROR",t),n.close()},n.addEventListener("readystatechange",function(t){2!==t.readyState||n!==_||I||!A||N>=5||(N+=1,T=setTimeout(R,1e3*N))})};R(),t=function(){I=!0,clearTimeout(T),_.close()}}return function(){t()}}},[e,s,a,l]),(0,n.useEffect)(function(){o&&o({value:p,done:w})},[p,w,o]),i().createElement(i().Fragment,null)}}}]);
\ No newline at end of file
@@ -3,9 +3,9 @@ import functools
 import os
 import sys
 import collections
+import contextlib
 import importlib
 import warnings
-from contextvars import copy_context
 from importlib.machinery import ModuleSpec
 from importlib.util import find_spec
 from importlib import metadata
@@ -15,10 +15,12 @@ import logging
 import time
 import mimetypes
 import hashlib
+import json
 import base64
+import secrets
 import traceback
 import inspect
-import json
+from concurrent.futures import Executor
 from urllib.parse import urlparse
 from typing import Any, Callable, Dict, Optional, Union, Sequence
 
@@ -55,8 +57,6 @@ from dash._utils import (
     interpolate_str,
     patch_collections_abc,
     split_callback_id,
-    to_json,
-    convert_to_AttributeDict,
     gen_salt,
     hooks_to_js_object,
     parse_version,
@@ -65,12 +65,24 @@ from dash._utils import (
 from dash import _dash_renderer
 from dash import _validate
 from dash import _get_paths
+from . import _assets
+from . import _bundles
 from . import _callback
+from . import _dispatch
+from . import _executors
+from . import _limits
+from . import _memoize
+from . import _metrics
+from . import _channels
+from . import _pubsub
+from . import _replay
+from . import _streams
+from . import _websocket
+from . import _json
 from . import _watch
 from . import _get_app
 from ._get_app import with_app_context_async, with_app_context_factory
 
-from dash._grouping import map_grouping, grouping_len, update_args_group
 from dash._obsolete import ObsoleteChecker
 
 from . import _pages
@@ -83,9 +95,8 @@ from ._pages import (
 from ._event_callback import (
     SSE_CALLBACK_ENDPOINT,
     SSE_CALLBACK_ID_KEY,
-    ERROR_TOKEN,
-    ServerSentEvent,
     _SSEServerObjects,
+    error_signal,
     get_callback_id,
 )
 from dash._jupyter import jupyter_dash
@@ -197,6 +208,12 @@ _app_entry = """
 </div>
 """
 
+# inline clientside callbacks, served with the suites of this package
+_inline_scripts_path = "inline_clientside.js"
+
+# callbacks one `_dash-update-component-batch` request may run, by default
+MAX_BATCH_SIZE = 64
+
 _re_index_entry = "{%app_entry%}", "{%app_entry%}"
 _re_index_config = "{%config%}", "{%config%}"
 _re_index_scripts = "{%scripts%}", "{%scripts%}"
@@ -238,7 +255,7 @@ def _get_traceback(secret, error: Exception):
 
     def _get_skip(error):
         from ._utils import (  # pylint: disable=import-outside-toplevel
-            _invoke_callback,
+            _run_callback,
         )
 
         tb = error.__traceback__
@@ -246,19 +263,19 @@ def _get_traceback(secret, error: Exception):
         while tb.tb_next is not None:
             skip += 1
             tb = tb.tb_next
-            if tb.tb_frame.f_code is _invoke_callback.__code__:
+            if tb.tb_frame.f_code is _run_callback.__code__:
                 return skip
 
         return skip
 
     def _do_skip(error):
         from ._utils import (  # pylint: disable=import-outside-toplevel
-            _invoke_callback,
+            _run_callback,
         )
 
         tb = error.__traceback__
         while tb.tb_next is not None:
-            if tb.tb_frame.f_code is _invoke_callback.__code__:
+            if tb.tb_frame.f_code is _run_callback.__code__:
                 return tb.tb_next
             tb = tb.tb_next
         return error.__traceback__
@@ -381,7 +398,8 @@ class Flash(ObsoleteChecker):
         If ``False`` we will use CDN links where available.
     :type serve_locally: boolean
 
-    :param compress: Use gzip to compress files and data served by Quart.
+    :param compress: Use gzip to compress files and data served by Quart,
+        and serve the pre-compressed variants of the component suites.
         To use this option, you need to install dash[compress]
         Default ``False``
     :type compress: boolean
@@ -470,6 +488,82 @@ class Flash(ObsoleteChecker):
         an exception is raised. Receives the exception object as first argument.
         The callback_context can be used to access the original callback inputs,
         states and output.
+
+    :param json_engine: Default ``"auto"``. Encoder used for callback responses,
+        the layout, the dependencies and SSE messages. ``"orjson"`` encodes
+        components, numpy, pandas, dates and decimals natively and falls back to
+        plotly for unknown types, ``"plotly"`` always uses plotly's ``to_json``.
+        ``"auto"`` picks ``"orjson"`` if it is installed. Also accepts a callable,
+        or an object with a ``dumps`` method, returning ``str`` or ``bytes``.
+
+    :param executors: Named ``concurrent.futures`` executors for synchronous
+        callbacks, selected with ``@callback(..., executor=name)``. The
+        ``"threads"`` (bounded thread pool) and ``"processes"`` (process pool
+        using every core) executors are created on first use unless given here.
+        Process pools used by a callback are started with the server.
+
+    :param max_concurrency: Maximum number of callbacks running at the same
+        time across the app, further requests wait for a free slot. Callbacks
+        also accept their own ``max_concurrency``.
+
+    :param max_queue: Maximum number of requests waiting for a slot when
+        ``max_concurrency`` is set. Requests beyond it get an empty 503
+        response, which the renderer treats like ``PreventUpdate``.
+
+    :param callback_timeout: Default timeout in seconds of the callback
+        requests, callbacks can set their own with ``timeout``. Callbacks
+        exceeding it are cancelled and the request gets a 504.
+
+    :param batch_callbacks: Default ``True``. Serve
+        ``_dash-update-component-batch`` and let the renderer send the
+        callbacks of the initial load as one request.
+
+    :param max_batch_size: Default ``64``. Maximum number of callbacks in one
+        batch request, larger batches get a 413. The renderer splits its
+        batches to fit. ``None`` removes the limit.
+
+    :param serve_metrics: Default ``False``. Serve the callback and stream
+        metrics of ``app.metrics`` in the Prometheus text format at
+        ``_flash/metrics``. The endpoint has no authentication of its own and
+        exposes callback ids and traffic, keep it behind the server's auth
+        or a private network. The metrics are always recorded.
+
+    :param layout_cache_ttl: Seconds the serialized result of a layout
+        function, or of the ``layout`` hooks, is reused. ``None`` (default)
+        calls them on every page load. Static layouts without ``layout`` hooks
+        are always serialized once and served from memory with an ``ETag``,
+        reading ``app.layout`` to change it in place serializes it again.
+
+    :param layout_cache_key: Callable, or list of callables, called in the
+        request context when ``layout_cache_ttl`` is set. Their return values
+        make the cache key, so layouts can vary per user, cookie, header...
+
+    :param inline_initial_data: Default ``False``. Embed the layout and the
+        callback graph in the index page next to ``_dash-config``, the
+        renderer then starts without requesting ``_dash-layout`` and
+        ``_dash-dependencies``.
+
+    :param stream_transport: Default ``"sse"``. How the pages receive the
+        ``event_callback`` streams. ``"sse"`` opens a connection per stream,
+        ``"multiplex"`` carries every stream of a page over one connection,
+        which stays below the browser limit of six connections per origin.
+        ``"websocket"`` carries them over the websocket of ``websocket``,
+        which it turns on.
+
+    :param stream_replay_dir: Directory keeping the replay buffers of the
+        ``resumable`` event callbacks, in memory by default.
+
+    :param pubsub: Default ``"memory"``. How the workers of the app share the
+        frames of the broadcast channels and of the multiplexed stream
+        sessions: ``"memory"`` within the process, a ``redis://`` url for a
+        Redis protocol broker reached by every worker, or a
+        `_pubsub.PubSubBackend`. The multiplexed sessions are signed with the
+        ``secret_key`` of the server, set it so every worker accepts them.
+
+    :param websocket: Default ``False``. Serve ``_flash/ws`` and let the pages
+        send their callback requests over one websocket instead of a POST
+        each. Background callbacks still use HTTP, and cookies set by
+        callbacks are not sent to the browser over the socket.
     """
 
     _plotlyjs_url: str
@@ -514,6 +608,23 @@ class Flash(ObsoleteChecker):
         routing_callback_inputs: Optional[Dict[str, Union[Input, State]]] = None,
         description: Optional[str] = None,
         on_error: Optional[Callable[[Exception], Any]] = None,
+        json_engine: Union[str, Callable[[Any], Union[str, bytes]]] = "auto",
+        executors: Optional[Dict[str, Executor]] = None,
+        max_concurrency: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        callback_timeout: Optional[float] = None,
+        batch_callbacks: bool = True,
+        max_batch_size: Optional[int] = MAX_BATCH_SIZE,
+        serve_metrics: bool = False,
+        layout_cache_ttl: Optional[float] = None,
+        layout_cache_key: Optional[
+            Union[Callable[[], Any], Sequence[Callable[[], Any]]]
+        ] = None,
+        inline_initial_data: bool = False,
+        stream_transport: str = "sse",
+        stream_replay_dir: Optional[str] = None,
+        pubsub: Optional[Union[str, _pubsub.PubSubBackend]] = None,
+        websocket: bool = False,
         **obsolete,
     ):
         router = obsolete.pop("router", None)
@@ -592,6 +703,8 @@ class Flash(ObsoleteChecker):
 
         _get_paths.CONFIG = self.config
         _pages.CONFIG = self.config
+        # per app, the encoders find it with `_get_app.app_context`
+        self.json_engine = _json.get_engine(json_engine)
 
         self.pages_folder = str(pages_folder)
         self.use_pages = (pages_folder != "pages") if use_pages is None else use_pages
@@ -604,10 +717,31 @@ class Flash(ObsoleteChecker):
         self.callback_map = {}
         # same deps as a list to catch duplicate outputs, and to send to the front end
         self._callback_list = []
+        # (callback count, serialized `_callback_list`) for `dependencies`
+        self._dependencies_cache = None
         self.callback_api_paths = {}
+        # request independent dispatch data per callback, see `_dispatch`
+        self._dispatch_plans = {}
+        # executors for sync callbacks with an `executor` option
+        self.executors = _executors.CallbackExecutors(executors)
+        # app wide bound on running callbacks, callbacks can have their own
+        self._limiter = _limits.CallbackLimiter.from_options(
+            max_concurrency, max_queue, status=503
+        )
+        self._callback_timeout = callback_timeout
+        if max_batch_size is not None and max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self._batch_callbacks = batch_callbacks
+        self._max_batch_size = max_batch_size
+        self.metrics = _metrics.FlashMetrics(self.callback_queue_stats)
+        self._serve_metrics = serve_metrics
+        # (client id, callback id, outputs) -> latest `supersede` callback task
+        self._latest_calls = {}
 
         # list of inline scripts
         self._inline_scripts = []
+        # request independent parts of the index page, see `_index_static`
+        self._index_cache = None
 
         # index_string has special setter so can't go in config
         if handle_theme is not None:
@@ -624,12 +758,47 @@ class Flash(ObsoleteChecker):
         self.scripts = Scripts(serve_locally, eager_loading)
 
         self.registered_paths = collections.defaultdict(set)
+        # component suite files served from memory
+        self._bundles = _bundles.BundleCache(self.config.compress)
+        self._bundles_task = None
 
         # urls
         self.routes = []
 
         self._layout = None
         self._layout_is_function = False
+        # (layout hooks, body, etag) of a static layout
+        self._layout_static = None
+        # serialized layout function results, with `layout_cache_ttl`
+        self._layout_cache = (
+            None
+            if layout_cache_ttl is None
+            else _memoize.CallbackCache(ttl=layout_cache_ttl)
+        )
+        if callable(layout_cache_key):
+            layout_cache_key = [layout_cache_key]
+        self._layout_cache_key = list(layout_cache_key or [])
+        self._inline_initial_data = inline_initial_data
+        if stream_transport not in _streams.TRANSPORTS:
+            raise ValueError(
+                f"Unknown stream_transport {stream_transport!r}, "
+                f"expected one of {list(_streams.TRANSPORTS)}."
+            )
+        self.stream_transport = stream_transport
+        # pages sharing a connection for their streams, see `setup_sse_endpoint`
+        self._pubsub = _pubsub.get_backend(pubsub)
+        self._stream_sessions = _streams.StreamHub(self._pubsub)
+        # broadcast channels of the `channel` event callbacks and `publish`
+        self.channels = _channels.ChannelHub(self._pubsub)
+        # `resumable` event callback streams, by key
+        self._replay_streams = _replay.ReplayHub(stream_replay_dir)
+        self._websocket = websocket or stream_transport == "websocket"
+        # open `_flash/ws` connections, see `serve_websocket`
+        self._socket_connections = set()
+        # (layout etag, dependencies etag, script tags) of `inline_initial_data`
+        self._inline_data_html = None
+        # (config without validation layout, extra components, script tag)
+        self._config_html = None
         self.validation_layout = None
         self._on_error = on_error
         self._extra_components = []
@@ -644,6 +813,8 @@ class Flash(ObsoleteChecker):
         )
 
         self._assets_files = []
+        # content hashed asset names, see `_get_fingerprinted_asset_url`
+        self._assets_manifest = _assets.AssetManifest()
 
         self._background_manager = background_callback_manager
 
@@ -680,8 +851,6 @@ class Flash(ObsoleteChecker):
                 "JupyterDash is deprecated, use Dash instead.\n"
                 "See https://dash.plotly.com/dash-in-jupyter for more details."
             )
-        self.setup_startup_routes()
-        self.setup_sse_endpoint()
 
     def _setup_hooks(self):
         # pylint: disable=import-outside-toplevel,protected-access
@@ -737,12 +906,13 @@ class Flash(ObsoleteChecker):
         assets_blueprint_name = f"{bp_prefix}dash_assets"
 
         self.server.register_blueprint(
-            quart.Blueprint(
+            _assets.AssetsBlueprint(
                 assets_blueprint_name,
                 config.name,
                 static_folder=self.config.assets_folder,
                 static_url_path=config.routes_pathname_prefix
                 + self.config.assets_url_path.lstrip("/"),
+                manifest=self._assets_manifest,
             )
         )
 
@@ -775,7 +945,20 @@ class Flash(ObsoleteChecker):
             """Handle a halted callback and return an empty 204 response."""
             return "", 204
 
+        @self.server.errorhandler(_limits.CallbackQueueFull)
+        async def _handle_queue_full(err):
+            """Shed load with an empty 429 or 503 response."""
+            return "", err.status, {"Retry-After": "1"}
+
+        @self.server.errorhandler(_limits.CallbackTimeout)
+        async def _handle_timeout(err):
+            """Answer a callback that exceeded its timeout with a 504."""
+            return str(err), 504
+
         self.server.before_serving(self._setup_server)
+        self.server.after_serving(self.executors.shutdown)
+        self.server.after_serving(self._close_stream_sessions)
+        self.server.after_serving(self._close_socket_connections)
 
         # add a handler for components suites errors to return 404
         self.server.errorhandler(InvalidResourceError)(self._invalid_resources_handler)
@@ -786,6 +969,8 @@ class Flash(ObsoleteChecker):
         self.enable_pages()
 
         self._setup_plotlyjs()
+        self.setup_startup_routes()
+        self.setup_sse_endpoint()
 
     def _add_url(self, name, view_func, methods=("GET",)):
         full_name = self.config.routes_pathname_prefix + name
@@ -806,8 +991,20 @@ class Flash(ObsoleteChecker):
         self._add_url("_dash-layout", self.serve_layout)
         self._add_url("_dash-dependencies", self.dependencies)
         self._add_url("_dash-update-component", self.async_dispatch, ["POST"])
+        if self._batch_callbacks:
+            self._add_url(
+                "_dash-update-component-batch", self.async_dispatch_batch, ["POST"]
+            )
         self._add_url("_reload-hash", self.serve_reload_hash)
         self._add_url("_favicon.ico", self._serve_default_favicon)
+        if self._serve_metrics:
+            self._add_url("_flash/metrics", self.serve_metrics)
+        if self._websocket:
+            full_name = self.config.routes_pathname_prefix + "_flash/ws"
+            self.server.add_websocket(
+                full_name, endpoint=full_name, view_func=self.serve_websocket
+            )
+            self.routes.append(full_name)
         self._add_url("", self.index)
 
         if jupyter_dash.active:
@@ -883,6 +1080,8 @@ class Flash(ObsoleteChecker):
 
     @property
     def layout(self):
+        # the caller may change the layout in place
+        self._layout_static = None
         return self._layout
 
     @layout.setter
@@ -890,18 +1089,30 @@ class Flash(ObsoleteChecker):
         _validate.validate_layout_type(value)
         self._layout_is_function = callable(value)
         self._layout = value
+        self.clear_layout_cache()
 
         # for using Quart.has_request_context() to deliver a full layout for
         # validation inside a layout function - track if a user might be doing this.
         if (
             self._layout_is_function
-            and not self.validation_layout
+            and not self._validation_layout
             and not self.config.suppress_callback_exceptions
         ):
             layout_value = self._layout_value()
             _validate.validate_layout(value, layout_value)
             self.validation_layout = layout_value
 
+    @property
+    def validation_layout(self):
+        # the caller may change it in place
+        self._config_html = None
+        return self._validation_layout
+
+    @validation_layout.setter
+    def validation_layout(self, value):
+        self._validation_layout = value
+        self._config_html = None
+
     def _layout_value(self):
         layout = self._layout() if self._layout_is_function else self._layout
 
@@ -921,18 +1132,60 @@ class Flash(ObsoleteChecker):
         _validate.validate_index("index string", checks, value)
         self._index_string = value
 
-    @with_app_context_async
-    async def serve_layout(self):
+    def clear_layout_cache(self):
+        """Drop the serialized layouts, the next page load serializes it again."""
+        self._layout_static = None
+        if self._layout_cache is not None:
+            self._layout_cache.clear()
+
+    def _serialize_layout(self):
         layout = self._layout_value()
 
         for hook in self._hooks.get_hooks("layout"):
             layout = hook(layout)
 
-        # TODO - Set browser cache limit - pass hash into frontend
-        return quart.Response(
-            to_json(layout),
-            mimetype="application/json",
+        body = _json.dumps(layout, self.json_engine)
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        return body, hashlib.sha256(body).hexdigest()
+
+    def _cached_layout(self):
+        # layout hooks may depend on the request (user, locale...), like
+        # layout functions their output is only cached with `layout_cache_ttl`
+        hooks = self._hooks.get_hooks("layout")
+
+        if not self._layout_is_function and all(hook.static for hook in hooks):
+            # static hooks, like the ones of `event_callback`, are applied once
+            hooks_key = tuple(map(id, hooks))
+            if self._layout_static is None or self._layout_static[0] != hooks_key:
+                self._layout_static = (hooks_key, self._serialize_layout())
+            return self._layout_static[1]
+
+        if self._layout_cache is None:
+            return self._serialize_layout()
+
+        key = (
+            tuple(map(id, hooks)),
+            *(get_key() for get_key in self._layout_cache_key),
         )
+        cached = self._layout_cache.get(key)
+        if cached is None:
+            cached = self._serialize_layout()
+            self._layout_cache.set(key, cached)
+        return cached
+
+    @with_app_context_async
+    async def serve_layout(self):
+        body, etag = self._cached_layout()
+
+        if etag in quart.request.if_none_match:
+            response = quart.Response(status=304)
+        else:
+            response = quart.Response(body, mimetype="application/json")
+        response.set_etag(etag)
+        # the browser keeps the layout but revalidates it on every page load
+        response.headers["Cache-Control"] = "no-cache"
+        return response
 
     def _config(self):
         # pieces of config needed by the front end
@@ -952,16 +1205,22 @@ class Flash(ObsoleteChecker):
             "ddk_version": ddk_version,
             "plotly_version": plotly_version,
         }
+        if self._batch_callbacks:
+            # the renderer sends the callbacks of the initial load as batches
+            config["batch_callbacks"] = True
+            config["max_batch_size"] = self._max_batch_size
         if not self.config.serve_locally:
             config["plotlyjs_url"] = self._plotlyjs_url
+        if self._websocket:
+            config["websocket"] = True
         if self._dev_tools.hot_reload:
             config["hot_reload"] = {
                 # convert from seconds to msec as used by js `setInterval`
                 "interval": int(self._dev_tools.hot_reload_interval * 1000),
                 "max_retry": self._dev_tools.hot_reload_max_retry,
             }
-        if self.validation_layout and not self.config.suppress_callback_exceptions:
-            validation_layout = self.validation_layout
+        if self._validation_layout and not self.config.suppress_callback_exceptions:
+            validation_layout = self._validation_layout
 
             # Add extra components
             if self._extra_components:
@@ -1058,20 +1317,14 @@ class Flash(ObsoleteChecker):
             elif "absolute_path" in resource:
                 raise Exception("Serving files from absolute_path isn't supported yet")
             elif "asset_path" in resource:
-                static_url = self.get_asset_url(resource["asset_path"])
+                static_url = self._get_fingerprinted_asset_url(
+                    resource["asset_path"], resource["ts"]
+                )
                 # Import .mjs files with type=module script tag
-                if static_url.endswith(".mjs"):
-                    srcs.append(
-                        {
-                            "src": static_url
-                            + f"?m={resource['ts']}",  # Add a cache-busting query param
-                            "type": "module",
-                        }
-                    )
+                if resource["asset_path"].endswith(".mjs"):
+                    srcs.append({"src": static_url, "type": "module"})
                 else:
-                    srcs.append(
-                        static_url + f"?m={resource['ts']}"
-                    )  # Add a cache-busting query param
+                    srcs.append(static_url)
 
         return srcs
 
@@ -1138,8 +1391,8 @@ class Flash(ObsoleteChecker):
             )
         )
 
-        self._inline_scripts.extend(_callback.GLOBAL_INLINE_SCRIPTS)
-        _callback.GLOBAL_INLINE_SCRIPTS.clear()
+        if self._collect_inline_scripts():
+            srcs.append(self._bundle_inline_scripts())
 
         return "\n".join(
             [
@@ -1150,11 +1403,69 @@ class Flash(ObsoleteChecker):
                 )
                 for src in srcs
             ]
-            + [f"<script>{src}</script>" for src in self._inline_scripts]
         )
 
+    def _collect_inline_scripts(self):
+        # clientside callbacks registered with `dash.clientside_callback`
+        self._inline_scripts.extend(_callback.GLOBAL_INLINE_SCRIPTS)
+        _callback.GLOBAL_INLINE_SCRIPTS.clear()
+        return self._inline_scripts
+
+    def _bundle_inline_scripts(self):
+        """
+        Join the inline clientside callbacks into one script served with the
+        component suites, so browsers cache it and the index page stays small.
+        The script tag carries the sha256 of the bundle, see `csp_hashes`.
+        """
+        data = "\n".join(self._inline_scripts).encode("utf-8")
+        bundle = _bundles.Bundle(data, mimetypes.types_map[".js"])
+        self._bundles.put(__package__, _inline_scripts_path, bundle)
+        self.registered_paths[__package__].add(_inline_scripts_path)
+
+        fingerprint = build_fingerprint(
+            _inline_scripts_path, __version__, bundle.etag[:16]
+        )
+        prefix = self.config.requests_pathname_prefix
+        digest = base64.b64encode(hashlib.sha256(data).digest()).decode("utf-8")
+        return {
+            "src": f"{prefix}_dash-component-suites/{__package__}/{fingerprint}",
+            "integrity": f"sha256-{digest}",
+        }
+
     def _generate_config_html(self):
-        return f'<script id="_dash-config" type="application/json">{to_json(self._config())}</script>'
+        # encoding the validation layout is the costly part, the script is
+        # built again only when a setting, the validation layout or the extra
+        # components changed
+        config = self._config()
+        settings = {k: v for k, v in config.items() if k != "validation_layout"}
+        extra_components = tuple(map(id, self._extra_components))
+
+        cached = self._config_html
+        if cached is None or cached[:2] != (settings, extra_components):
+            data = _json.to_json(config, self.json_engine)
+            cached = self._config_html = (
+                settings,
+                extra_components,
+                f'<script id="_dash-config" type="application/json">{data}</script>',
+            )
+        return cached[2]
+
+    def _generate_inline_data_html(self):
+        layout, layout_etag = self._cached_layout()
+        dependencies = self._dependencies_bundle()
+
+        cached = self._inline_data_html
+        if cached is None or cached[:2] != (layout_etag, dependencies.etag):
+            # custom json engines may not escape `</script>`
+            layout = _json.safe(layout).decode("utf-8")
+            dependencies_json = _json.safe(dependencies.data).decode("utf-8")
+            cached = self._inline_data_html = (
+                layout_etag,
+                dependencies.etag,
+                f'<script id="_dash-inline-layout" type="application/json">{layout}</script>\n'
+                f'<script id="_dash-inline-dependencies" type="application/json">{dependencies_json}</script>',
+            )
+        return cached[2]
 
     def _generate_renderer(self):
         return f'<script id="_dash-renderer" type="application/javascript">{self.renderer}</script>'
@@ -1184,9 +1495,6 @@ class Flash(ObsoleteChecker):
 
         _validate.validate_js_path(self.registered_paths, package_name, path_in_pkg)
 
-        extension = "." + path_in_pkg.split(".")[-1]
-        mimetype = mimetypes.types_map.get(extension, "application/octet-stream")
-
         package = sys.modules[package_name]
         self.logger.debug(
             "serving -- package: %s[%s] resource: %s => location: %s",
@@ -1196,31 +1504,64 @@ class Flash(ObsoleteChecker):
             package.__path__,
         )
 
-        response = quart.Response(
-            pkgutil.get_data(package_name, path_in_pkg), mimetype=mimetype
+        bundle = self._bundles.get(package_name, path_in_pkg)
+        response = await _bundles.bundle_response(
+            bundle, quart.request, compress=self._bundles.compress
         )
 
         if has_fingerprint:
             # Fingerprinted resources are good forever (1 year)
-            # No need for ETag as the fingerprint changes with each build
             response.cache_control.max_age = 31536000  # 1 year
-        else:
-            # Non-fingerprinted resources are given an ETag that
-            # will be used / check on future requests
-            await response.add_etag()
-            tag = response.get_etag()[0]
+            response.cache_control.immutable = True
 
-            request_etag = quart.request.headers.get("If-None-Match")
+        return response
 
-            if f'"{tag}"' == request_etag:
-                response = quart.Response("", status=304)
+    def _generate_favicon(self):
+        if self._favicon:
+            favicon_url = self._get_fingerprinted_asset_url(
+                self._favicon,
+                os.path.getmtime(
+                    os.path.join(self.config.assets_folder, self._favicon)
+                ),
+            )
+        else:
+            prefix = self.config.requests_pathname_prefix
+            favicon_url = f"{prefix}_favicon.ico?v={__version__}"
 
-        return response
+        return format_tag(
+            "link",
+            {"rel": "icon", "type": "image/x-icon", "href": favicon_url},
+            opened=True,
+        )
+
+    def clear_index_cache(self):
+        """Rebuild the scripts, css and config of the index page on the next load."""
+        self._index_cache = None
+        self._config_html = None
+
+    def _index_static(self):
+        # Building the script and css tags imports every component package and
+        # stats its bundles for the fingerprints, so it is done once and redone
+        # when assets change, pages are registered or `clear_index_cache` is
+        # called. Clientside callbacks added since add inline scripts. The
+        # config script is cached on its own, see `_generate_config_html`.
+        cache = self._index_cache
+        if (
+            cache is None
+            or _callback.GLOBAL_INLINE_SCRIPTS
+            or cache.inline_scripts != len(self._inline_scripts)
+        ):
+            cache = self._index_cache = AttributeDict(
+                scripts=self._generate_scripts_html(),
+                css=self._generate_css_dist_html(),
+                favicon=self._generate_favicon(),
+                inline_scripts=len(self._inline_scripts),
+            )
+        return cache
 
     @with_app_context_async
     async def index(self, *args, **kwargs):  # pylint: disable=unused-argument
-        scripts = self._generate_scripts_html()
-        css = self._generate_css_dist_html()
+        static = self._index_static()
         config = self._generate_config_html()
         metas = self._generate_meta()
         renderer = self._generate_renderer()
@@ -1231,21 +1572,6 @@ class Flash(ObsoleteChecker):
         if self.use_pages and self.config.include_pages_meta:
             metas = _page_meta_tags(self) + metas
 
-        if self._favicon:
-            favicon_mod_time = os.path.getmtime(
-                os.path.join(self.config.assets_folder, self._favicon)
-            )
-            favicon_url = f"{self.get_asset_url(self._favicon)}?m={favicon_mod_time}"
-        else:
-            prefix = self.config.requests_pathname_prefix
-            favicon_url = f"{prefix}_favicon.ico?v={__version__}"
-
-        favicon = format_tag(
-            "link",
-            {"rel": "icon", "type": "image/x-icon", "href": favicon_url},
-            opened=True,
-        )
-
         tags = "\n      ".join(
             format_tag("meta", x, opened=True, sanitize=True) for x in metas
         )
@@ -1253,11 +1579,15 @@ class Flash(ObsoleteChecker):
         index = self.interpolate_index(
             metas=tags,
             title=title,
-            css=css,
-            config=config,
-            scripts=scripts,
+            css=static.css,
+            config=(
+                f"{config}\n{self._generate_inline_data_html()}"
+                if self._inline_initial_data
+                else config
+            ),
+            scripts=static.scripts,
             app_entry=_app_entry,
-            favicon=favicon,
+            favicon=static.favicon,
             renderer=renderer,
         )
 
@@ -1331,12 +1661,27 @@ class Flash(ObsoleteChecker):
             app_entry=app_entry,
         )
 
+    def _dependencies_bundle(self):
+        # The callback graph only grows, with callbacks registered after the
+        # server started, so its length tells if the cached one is current.
+        count = len(self._callback_list)
+        if self._dependencies_cache is None or self._dependencies_cache[0] != count:
+            data = _json.dumps(self._callback_list, self.json_engine)
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+            self._dependencies_cache = (
+                count,
+                _bundles.Bundle(data, "application/json"),
+            )
+        return self._dependencies_cache[1]
+
     @with_app_context_async
     async def dependencies(self):
-        return quart.Response(
-            to_json(self._callback_list),
-            content_type="application/json",
+        response = await _bundles.bundle_response(
+            self._dependencies_bundle(), quart.request, compress=self._bundles.compress
         )
+        response.headers["Cache-Control"] = "no-cache"
+        return response
 
     def clientside_callback(self, clientside_function, *args, **kwargs):
         """Create a callback that updates the output by calling a clientside
@@ -1437,8 +1782,23 @@ class Flash(ObsoleteChecker):
         )
 
     # pylint: disable=R0915
-    def _initialize_context(self, body):
+    @staticmethod
+    def _request_info(request=None):
+        """Request data shared by every callback dispatched in a request."""
+        if request is None:
+            request = quart.request
+        return AttributeDict(
+            cookies=dict(**request.cookies),
+            headers=dict(**request.headers),
+            path=request.full_path,
+            remote=request.remote_addr,
+            origin=request.origin,
+        )
+
+    def _initialize_context(self, body, request_info=None):
         """Initialize the global context for the request."""
+        if request_info is None:
+            request_info = self._request_info()
         g = AttributeDict({})
         g.inputs_list = body.get("inputs", [])
         g.states_list = body.get("state", [])
@@ -1450,79 +1810,50 @@ class Flash(ObsoleteChecker):
             for x in body.get("changedPropIds", [])
         ]
         g.dash_response = quart.Response(mimetype="application/json")
-        g.cookies = dict(**quart.request.cookies)
-        g.headers = dict(**quart.request.headers)
-        g.path = quart.request.full_path
-        g.remote = quart.request.remote_addr
-        g.origin = quart.request.origin
+        g.cookies = dict(request_info.cookies)
+        g.headers = dict(request_info.headers)
+        g.path = request_info.path
+        g.remote = request_info.remote
+        g.origin = request_info.origin
         g.updated_props = {}
         return g
 
-    def _prepare_callback(self, g, body):
+    def _get_dispatch_plan(self, output):
+        plan = self._dispatch_plans.get(output)
+        if plan is None:
+            try:
+                cb = self.callback_map[output]
+            except KeyError as e:
+                raise KeyError(
+                    f"Callback function not found for output '{output}'."
+                ) from e
+            # Callbacks registered after `_setup_server` get their plan lazily.
+            plan = self._dispatch_plans[output] = _dispatch.DispatchPlan(output, cb)
+        return plan
+
+    def _prepare_callback(self, g, body, plan):
         """Prepare callback-related data."""
-        output = body["output"]
-        try:
-            cb = self.callback_map[output]
-            func = cb["callback"]
-            g.background_callback_manager = (
-                cb.get("manager") or self._background_manager
-            )
-            g.ignore_register_page = cb.get("background", False)
-
-            # Add args_grouping
-            inputs_state_indices = cb["inputs_state_indices"]
-            inputs_state = convert_to_AttributeDict(g.inputs_list + g.states_list)
-
-            if cb.get("no_output"):
-                g.outputs_list = []
-            elif not g.outputs_list:
-                # Legacy support for older renderers
-                split_callback_id(output)
-
-            # Update args_grouping attributes
-            for s in inputs_state:
-                # check for pattern matching: list of inputs or state
-                if isinstance(s, list):
-                    for pattern_match_g in s:
-                        update_args_group(
-                            pattern_match_g, body.get("changedPropIds", [])
-                        )
-                update_args_group(s, body.get("changedPropIds", []))
-
-            g.args_grouping, g.using_args_grouping = self._prepare_grouping(
-                inputs_state, inputs_state_indices
-            )
-            g.outputs_grouping, g.using_outputs_grouping = self._prepare_grouping(
-                g.outputs_list, cb.get("outputs_indices", [])
-            )
-        except KeyError as e:
-            raise KeyError(f"Callback function not found for output '{output}'.") from e
-        return func
-
-    def _prepare_grouping(self, data_list, indices):
-        """Prepare grouping logic for inputs or outputs."""
-        if not isinstance(data_list, list):
-            flat_data = [data_list]
-        else:
-            flat_data = data_list
-
-        if len(flat_data) > 0:
-            grouping = map_grouping(lambda ind: flat_data[ind], indices)
-            using_grouping = not isinstance(indices, int) and indices != list(
-                range(grouping_len(indices))
-            )
-        else:
-            grouping, using_grouping = [], False
-
-        return grouping, using_grouping
+        cb = self.callback_map[plan.callback_id]
+        g.background_callback_manager = cb.get("manager") or self._background_manager
+        g.ignore_register_page = plan.is_background
+
+        if plan.no_output:
+            g.outputs_list = []
+        elif not g.outputs_list:
+            # Legacy support for older renderers
+            split_callback_id(body["output"])
+
+        inputs_state = plan.prepare_args(
+            g.inputs_list + g.states_list, body.get("changedPropIds", [])
+        )
+        g.args_grouping, g.using_args_grouping = plan.args_grouping(inputs_state)
+        g.outputs_grouping, g.using_outputs_grouping = plan.outputs_grouping(
+            g.outputs_list
+        )
+        return plan.func
 
-    def _execute_callback(self, func, args, outputs_list, g):
+    def _execute_callback(self, func, args, outputs_list, g, plan=None):
         """Execute the callback with the prepared arguments."""
-        g.cookies = dict(**quart.request.cookies)
-        g.headers = dict(**quart.request.headers)
-        g.path = quart.request.full_path
-        g.remote = quart.request.remote_addr
-        g.origin = quart.request.origin
         g.custom_data = AttributeDict({})
 
         for hook in self._hooks.get_hooks("custom_data"):
@@ -1537,29 +1868,195 @@ class Flash(ObsoleteChecker):
             callback_context=g,
             app=self,
             app_on_error=self._on_error,
+            dispatch_plan=plan,
         )
         return partial_func
 
+    async def _dispatch(self, body, request_info=None, started=None):
+        """Run the callback described by `body`, returns the response."""
+        if started is None:
+            started = time.perf_counter()
+        g = self._initialize_context(body, request_info)
+        plan = self._get_dispatch_plan(body["output"])
+        stats = self.metrics.callback(plan.callback_id)
+        stats.in_flight += 1
+        outcome = "error"
+        try:
+            func = self._prepare_callback(g, body, plan)
+            args = inputs_to_vals(g.inputs_list + g.states_list)
+
+            partial_func = self._execute_callback(
+                func, args, g.outputs_list, g, plan
+            )
+            stats.phases["parse"].observe(time.perf_counter() - started)
+            if plan.supersede:
+                response_data = await self._call_superseding(plan, g, partial_func)
+            else:
+                response_data = await self._call_limited(plan, partial_func)
+            outcome = "ok"
+        except PreventUpdate:
+            outcome = "prevent_update"
+            raise
+        except _limits.CallbackQueueFull:
+            outcome = "rejected"
+            raise
+        except _limits.CallbackTimeout:
+            outcome = "timeout"
+            raise
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            stats.in_flight -= 1
+            stats.outcomes[outcome] += 1
+            stats.phases["total"].observe(time.perf_counter() - started)
+            for phase, seconds in g.get("phase_times", {}).items():
+                stats.phases[phase].observe(seconds)
+
+        stats.response_bytes.observe(len(response_data))
+        g.dash_response.set_data(response_data)
+        return g.dash_response
+
+    def callback_queue_stats(self):
+        """
+        Counters of the concurrency limiters, by callback id and ``"app"`` for
+        the app wide limiter. ``queue_time`` is the total time in seconds
+        requests waited for a slot.
+        """
+        stats = {
+            callback_id: callback["limiter"].stats()
+            for callback_id, callback in self.callback_map.items()
+            if "limiter" in callback
+        }
+        if self._limiter is not None:
+            stats["app"] = self._limiter.stats()
+        return stats
+
+    async def _call_limited(self, plan, partial_func):
+        """
+        Wait for a slot of the callback limiter, then of the app limiter and
+        run the callback within its timeout.
+        """
+        timeout = self._callback_timeout if plan.timeout is None else plan.timeout
+        try:
+            async with asyncio.timeout(timeout) as deadline:
+                async with contextlib.AsyncExitStack() as slots:
+                    if plan.limiter is not None:
+                        await slots.enter_async_context(plan.limiter.slot())
+                    if self._limiter is not None:
+                        await slots.enter_async_context(self._limiter.slot())
+                    return await partial_func()
+        except TimeoutError as err:
+            if not deadline.expired():
+                raise
+            self._callback_cancelled(plan.callback_id, "timeout")
+            raise _limits.CallbackTimeout(
+                f"Callback {plan.callback_id} exceeded its timeout of {timeout}s"
+            ) from err
+        except asyncio.CancelledError as err:
+            # Quart cancels the request when the client disconnects
+            reason = "superseded" if err.args == ("superseded",) else "disconnect"
+            self._callback_cancelled(plan.callback_id, reason)
+            raise
+
+    async def _call_superseding(self, plan, g, partial_func):
+        """
+        Run a `supersede` callback, cancelling the previous request of the same
+        page for the same outputs. A superseded request returns a 204.
+        """
+        client_id = g.headers.get("X-Dash-Client-Id")
+        if not client_id:
+            return await self._call_limited(plan, partial_func)
+
+        key = (client_id, plan.callback_id, str(g.outputs_list))
+        task = asyncio.ensure_future(self._call_limited(plan, partial_func))
+        previous = self._latest_calls.get(key)
+        self._latest_calls[key] = task
+        if previous is not None:
+            previous.cancel("superseded")
+
+        try:
+            return await task
+        except asyncio.CancelledError as err:
+            if err.args == ("superseded",) and not asyncio.current_task().cancelling():
+                raise PreventUpdate from None
+            raise
+        finally:
+            if self._latest_calls.get(key) is task:
+                del self._latest_calls[key]
+
+    def _callback_cancelled(self, callback_id, reason, stream=False):
+        if stream:
+            stats = self.metrics.stream(callback_id)
+        else:
+            stats = self.metrics.callback(callback_id)
+        stats.cancelled[reason] += 1
+        self.logger.debug("Callback %s cancelled: %s", callback_id, reason)
+
+    async def serve_metrics(self):
+        return quart.Response(
+            self.metrics.render(), mimetype="text/plain; version=0.0.4"
+        )
+
     # pylint: disable=R0915
     @with_app_context_async
     async def async_dispatch(self):
+        started = time.perf_counter()
         body = await quart.request.get_json()
-        g = self._initialize_context(body)
-        func = self._prepare_callback(g, body)
-        args = inputs_to_vals(g.inputs_list + g.states_list)
-
-        ctx = copy_context()
-        partial_func = self._execute_callback(func, args, g.outputs_list, g)
-        if asyncio.iscoroutine(func):
-            response_data = await ctx.run(partial_func)
-        else:
-            response_data = ctx.run(partial_func)
+        return await self._dispatch(body, started=started)
 
-        if asyncio.iscoroutine(response_data):
-            response_data = await response_data
+    async def _dispatch_batch_item(self, body, request_info, started):
+        try:
+            return await self._dispatch(body, request_info, started)
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            # Same handlers as a single request, PreventUpdate gives a 204.
+            try:
+                return await self.server.make_response(
+                    await self.server.handle_user_exception(err)
+                )
+            except Exception:  # pylint: disable=broad-exception-caught
+                self.server.log_exception(sys.exc_info())
+                return quart.Response("Internal Server Error", 500)
 
-        g.dash_response.set_data(response_data)
-        return g.dash_response
+    @with_app_context_async
+    async def async_dispatch_batch(self):
+        """
+        Run a list of `_dash-update-component` payloads concurrently and
+        return a list with one ``{"status": ..., "data": ...}`` item per
+        payload, in the same order. ``data`` is the callback response for a
+        200 and the error body as a string otherwise. Cookies set by the
+        callbacks are set on the batch response. Batches larger than
+        ``max_batch_size`` get a 413.
+        """
+        started = time.perf_counter()
+        bodies = await quart.request.get_json()
+        if not isinstance(bodies, list):
+            quart.abort(400)
+        if self._max_batch_size is not None and len(bodies) > self._max_batch_size:
+            quart.abort(413)
+
+        request_info = self._request_info()
+        responses = await asyncio.gather(
+            *(
+                self._dispatch_batch_item(body, request_info, started)
+                for body in bodies
+            )
+        )
+
+        batch_response = quart.Response(mimetype="application/json")
+        items = []
+        for response in responses:
+            data = await response.get_data()
+            if response.status_code == 200 and response.mimetype == "application/json":
+                item = data or b"null"
+            else:
+                item = json.dumps(data.decode("utf-8")).encode("utf-8")
+            items.append(b'{"status":%d,"data":%s}' % (response.status_code, item))
+            for cookie in response.headers.getlist("Set-Cookie"):
+                batch_response.headers.add("Set-Cookie", cookie)
+
+        batch_response.set_data(b"[" + b",".join(items) + b"]")
+        return batch_response
 
     async def _setup_server(self):
         if self._got_first_request["setup_server"]:
@@ -1587,6 +2084,13 @@ class Flash(ObsoleteChecker):
         self._generate_scripts_html()
         self._generate_css_dist_html()
 
+        if self.config.serve_locally:
+            # load and compress the registered bundles while the server starts,
+            # early requests wait for the bundles they need
+            self._bundles_task = asyncio.get_running_loop().create_task(
+                self._bundles.warm(self.registered_paths)
+            )
+
         # Copy over global callback data structures assigned with `dash.callback`
         for k in list(_callback.GLOBAL_CALLBACK_MAP):
             if k in self.callback_map:
@@ -1602,6 +2106,12 @@ class Flash(ObsoleteChecker):
 
         _validate.validate_background_callbacks(self.callback_map)
 
+        self._dispatch_plans.update(_dispatch.build_dispatch_plans(self.callback_map))
+
+        await self.executors.warm(
+            {cb["executor"] for cb in self.callback_map.values() if "executor" in cb}
+        )
+
         cancels = {}
 
         for callback in self.callback_map.values():
@@ -1635,8 +2145,20 @@ class Flash(ObsoleteChecker):
         if self.config.assets_external_path:
             res["external_url"] = self.get_asset_url(url_path.lstrip("/"))
         self._assets_files.append(file_path)
+        self._assets_manifest.update(url_path, file_path)
         return res
 
+    def _get_fingerprinted_asset_url(self, path, modified):
+        """
+        Url of an asset with its content hash in the file name, served with an
+        immutable one year cache. Files missing from the manifest keep the
+        modification time query param.
+        """
+        fingerprinted = self._assets_manifest.get(path)
+        if fingerprinted is None:
+            return f"{self.get_asset_url(path)}?m={modified}"
+        return self.get_asset_url(fingerprinted)
+
     def _walk_assets_directory(self):
         walk_dir = self.config.assets_folder
         slash_splitter = re.compile(r"[\\/]+")
@@ -1670,6 +2192,7 @@ class Flash(ObsoleteChecker):
                     self.css.append_css(self._add_assets_resource(path, full))
                 elif f == "favicon.ico":
                     self._favicon = path
+                    self._assets_manifest.update(path, full)
 
     @staticmethod
     def _invalid_resources_handler(err):
@@ -1684,10 +2207,12 @@ class Flash(ObsoleteChecker):
     def csp_hashes(self, hash_algorithm="sha256"):
         """Calculates CSP hashes (sha + base64) of all inline scripts, such that
         one of the biggest benefits of CSP (disallowing general inline scripts)
-        can be utilized together with Dash clientside callbacks (inline scripts).
+        can be utilized. Clientside callbacks given as strings are bundled into
+        a script served with the component suites, leaving the renderer script
+        as the only inline script. The bundle is loaded with a sha256
+        ``integrity`` attribute, its sha256 hash allows it too.
 
-        Calculate these hashes after all inline callbacks are defined,
-        and add them to your CSP headers before starting the server, for example
+        Add them to your CSP headers before starting the server, for example
         with the Quart-talisman package from PyPI:
 
         Quart_talisman.Talisman(app.server, content_security_policy={
@@ -1712,13 +2237,11 @@ class Flash(ObsoleteChecker):
                 "utf-8"
             )
 
-        self._inline_scripts.extend(_callback.GLOBAL_INLINE_SCRIPTS)
-        _callback.GLOBAL_INLINE_SCRIPTS.clear()
+        scripts = [self.renderer]
+        if self._collect_inline_scripts():
+            scripts.insert(0, "\n".join(self._inline_scripts))
 
-        return [
-            f"'{hash_algorithm}-{_hash(script)}'"
-            for script in (self._inline_scripts + [self.renderer])
-        ]
+        return [f"'{hash_algorithm}-{_hash(script)}'" for script in scripts]
 
     def get_asset_url(self, path):
         """
@@ -1910,6 +2433,9 @@ class Flash(ObsoleteChecker):
             default=False,
         )
 
+        # the props check and dev bundles change the scripts of the index
+        self._index_cache = None
+
         return dev_tools
 
     def enable_dev_tools(
@@ -2147,6 +2673,8 @@ class Flash(ObsoleteChecker):
     async def _on_assets_change(self, filename, modified, deleted):
         _reload = self._hot_reload
         async with _reload.lock:
+            self.clear_index_cache()
+            self._bundles.clear()
             _reload.hard = True
             _reload.hash = generate_hash()
 
@@ -2160,14 +2688,22 @@ class Flash(ObsoleteChecker):
                     .lstrip("/")
                 )
 
+                # The renderer swaps the css links containing this url, so it
+                # is the fingerprinted url the page loaded, if any.
+                fingerprinted = self._assets_manifest.get(asset_path)
                 _reload.changed_assets.append(
                     {
-                        "url": self.get_asset_url(asset_path),
+                        "url": self.get_asset_url(fingerprinted or asset_path),
                         "modified": int(modified),
                         "is_css": filename.endswith("css"),
                     }
                 )
 
+                if deleted:
+                    self._assets_manifest.remove(asset_path)
+                elif filename in self._assets_files or asset_path == self._favicon:
+                    self._assets_manifest.update(asset_path, filename)
+
                 if filename not in self._assets_files and not deleted:
                     res = self._add_assets_resource(asset_path, filename)
                     if filename.endswith("js"):
@@ -2517,7 +3053,7 @@ class Flash(ObsoleteChecker):
                     ]
                 )
 
-                if _ID_CONTENT not in self.validation_layout:
+                if _ID_CONTENT not in self._validation_layout:
                     raise Exception("`dash.page_container` not found in the layout")
 
             # Update the page title on page navigation
@@ -2531,6 +3067,161 @@ class Flash(ObsoleteChecker):
                 Input(_ID_STORE, "data"),
             )
 
+    async def _event_stream(self, callback_id, content):
+        """
+        Messages of an `event_callback` invocation, errors of the generator
+        are sent as an error signal.
+        """
+        # `stream_props` and the error frames encode with the engine of the app
+        _get_app.app_context.set(self)
+        sse_obj = _SSEServerObjects.get_func(callback_id)
+
+        if not sse_obj:
+            error_message = f"Could not find function for sse id {callback_id}"
+            yield error_signal({"error": error_message})
+            return
+
+        if sse_obj.channel:
+            # every page shares the generator started by the first subscriber
+            stream = self.channels.subscribe(
+                sse_obj.channel,
+                functools.partial(self._channel_frames, sse_obj, callback_id, content),
+            )
+        else:
+            stream = sse_obj.func(**content)
+        throttled = stream
+        coalescer = None
+        if sse_obj.min_interval:
+            coalescer = _streams.Coalescer()
+            throttled = _streams.throttle(stream, sse_obj.min_interval, coalescer)
+        # the generator runs ahead of a slow client up to the queue size
+        queue = _streams.FrameQueue(sse_obj.queue_size, sse_obj.overflow)
+        frames = _streams.buffered(throttled, queue)
+        stats = self.metrics.stream(callback_id)
+        stats.in_flight += 1
+        started = time.perf_counter()
+        queued = dropped = 0
+
+        try:
+            async for item in frames:
+                stats.queued += len(queue) - queued
+                stats.dropped += queue.dropped - dropped
+                queued, dropped = len(queue), queue.dropped
+                if item is None:
+                    warnings.warn(
+                        f"Callback generator functions should not return None values - Callback: {sse_obj.func_name} | {callback_id}"
+                    )
+                    continue
+
+                stats.messages += 1
+                stats.bytes += len(item)
+                yield item
+                # a generator that never awaits would hold the event loop
+                await asyncio.sleep(0)
+
+        except Exception as e:
+            stats.errors += 1
+            for frame in self._stream_error_frames(sse_obj, e):
+                yield frame
+
+        except asyncio.CancelledError as err:
+            # the client disconnected or stopped the stream
+            reason = err.args[0] if err.args else "disconnect"
+            self._callback_cancelled(callback_id, reason, stream=True)
+            raise
+
+        finally:
+            stats.in_flight -= 1
+            stats.duration.observe(time.perf_counter() - started)
+            stats.queued -= queued
+            stats.dropped += queue.dropped - dropped
+            stats.coalesced += queue.merged
+            await frames.aclose()
+            if coalescer is not None:
+                stats.coalesced += coalescer.merged
+                await throttled.aclose()
+            await stream.aclose()
+
+    @staticmethod
+    def _stream_error_frames(sse_obj, err):
+        """Frames telling the page its event callback generator failed."""
+        handle_error = True
+        if sse_obj.on_error:
+            handle_error = False
+            yield sse_obj.on_error(err)
+
+        yield error_signal(
+            {
+                "error": str(err),
+                "handle_error": handle_error,
+                "reset_props": sse_obj.reset_props,
+            },
+        )
+
+    async def _channel_frames(self, sse_obj, callback_id, content):
+        """
+        Frames of the single generator of a `channel` event callback. It runs
+        in the app context, without the request of any subscriber.
+        """
+        _get_app.app_context.set(self)
+        async with self.server.app_context():
+            stream = sse_obj.func(**content)
+            try:
+                async for item in stream:
+                    yield item
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                self.metrics.stream(callback_id).errors += 1
+                for frame in self._stream_error_frames(sse_obj, e):
+                    yield frame
+            finally:
+                await stream.aclose()
+
+    @staticmethod
+    def _event_stream_request(content):
+        """Callback id and generator arguments of a stream request payload."""
+        content = content.copy()
+        content.pop("callback_context", {})
+        callback_id = get_callback_id(content.pop(SSE_CALLBACK_ID_KEY))
+
+        if not callback_id:
+            raise ValueError("callback_id is required")
+
+        return callback_id, content
+
+    @staticmethod
+    def _event_stream_response(frames):
+        response = quart.Response(frames)
+        response.headers.update(
+            {
+                "Content-Type": "text/event-stream",
+                "Cache-Control": "no-cache",
+                "Transfer-Encoding": "chunked",
+            }
+        )
+        response.timeout = None  # Disable timeout for SSE
+        return response
+
+    async def _close_stream_sessions(self):
+        self._stream_sessions.close()
+        await self._replay_streams.close()
+        self.channels.close()
+        await self._pubsub.close()
+
+    def _resumable_stream(self, callback_id, content, replay_size):
+        """
+        Frames of a `resumable` stream, the ones missed since the
+        ``Last-Event-ID`` of the request if they are still buffered.
+        """
+        last_event_id = quart.request.headers.get("Last-Event-ID", "")
+        stream, after = self._replay_streams.resume(callback_id, last_event_id)
+        if stream is None:
+            # the generator outlives this request, keep its context
+            frames = quart.stream_with_context(self._event_stream)
+            stream = self._replay_streams.start(
+                callback_id, frames(callback_id, content), replay_size
+            )
+        return stream.read(after)
+
     def setup_sse_endpoint(self):
         prefix = self.config.routes_pathname_prefix.rstrip("/")
         sse_url = f"{prefix}{SSE_CALLBACK_ENDPOINT}"
@@ -2540,64 +3231,160 @@ class Flash(ObsoleteChecker):
                 quart.abort(400)
 
             data = await quart.request.get_json()
-            content = data["content"].copy()
-            ctx = content.pop("callback_context", {})
-            callback_id = get_callback_id(content.pop(SSE_CALLBACK_ID_KEY))
+            callback_id, content = self._event_stream_request(data["content"])
 
-            if not callback_id:
-                raise ValueError("callback_id is required")
+            sse_obj = _SSEServerObjects.get_func(callback_id)
+            if sse_obj is not None and sse_obj.resumable:
+                return self._event_stream_response(
+                    self._resumable_stream(callback_id, content, sse_obj.replay_size)
+                )
 
-            def send_signal(payload: Dict = {}):
-                response = [ERROR_TOKEN, None, payload]
-                event = ServerSentEvent(json.dumps(response))
-                return event.encode()
+            callback_generator = quart.stream_with_context(self._event_stream)
+            return self._event_stream_response(callback_generator(callback_id, content))
+
+        # `stream_transport="multiplex"`, a page asks for a session, opens its
+        # stream and starts and stops its event callbacks with the control
+        # endpoint. Sessions are bound to the client they were issued to.
+        def own_session(session_id):
+            return self._stream_sessions.verify(
+                session_id,
+                quart.request.cookies.get(_streams.SESSION_COOKIE),
+                self.server.secret_key,
+            )
+
+        @self.server.post(f"{sse_url}/session")
+        async def sse_new_session_endpoint():
+            client_key = quart.request.cookies.get(
+                _streams.SESSION_COOKIE
+            ) or secrets.token_urlsafe(16)
+            response = quart.jsonify(
+                session=self._stream_sessions.issue(client_key, self.server.secret_key)
+            )
+            response.set_cookie(
+                _streams.SESSION_COOKIE,
+                client_key,
+                path=sse_url,
+                secure=quart.request.is_secure,
+                httponly=True,
+                samesite="Strict",
+            )
+            return response
+
+        @self.server.get(f"{sse_url}/session/<session_id>")
+        async def sse_session_endpoint(session_id):
+            if not own_session(session_id):
+                quart.abort(403)
+
+            return self._event_stream_response(
+                self._stream_sessions.read(session_id)
+            )
+
+        @self.server.post(f"{sse_url}/control")
+        async def sse_control_endpoint():
+            data = await quart.request.get_json()
+            session_id = data.get("session")
+            stream_id = data.get("stream")
+            if not _streams.valid_stream_id(stream_id):
+                quart.abort(400)
+            if not own_session(session_id):
+                quart.abort(403)
+
+            action = data.get("action")
+            if action == "start":
+                callback_id, content = self._event_stream_request(data["content"])
+                # the generator outlives this request, keep its context
+                frames = quart.stream_with_context(self._event_stream)
+                self._stream_sessions.get(session_id).start(
+                    stream_id, frames(callback_id, content)
+                )
+            elif action == "stop":
+                await self._stream_sessions.stop(session_id, stream_id)
+            else:
+                quart.abort(400)
 
-            @quart.stream_with_context
-            async def callback_generator():
-                sse_obj = _SSEServerObjects.get_func(callback_id)
+            return "", 204
+
+    async def _close_socket_connections(self):
+        for connection in list(self._socket_connections):
+            await connection.shutdown()
 
-                if not sse_obj:
-                    error_message = f"Could not find function for sse id {callback_id}"
-                    yield send_signal({"error": error_message})
-                    return
+    async def _socket_callback(self, connection, msg_id, body, request_info):
+        started = time.perf_counter()
+        response = await self._dispatch_batch_item(body, request_info, started)
+        data = await response.get_data(as_text=True)
+        await connection.put("response", msg_id, data, status=response.status_code)
 
-                on_error = sse_obj.on_error
+    async def _socket_stream(self, connection, msg_id, callback_id, content):
+        async for item in self._event_stream(callback_id, content):
+            for data in _streams.event_data(item):
+                await connection.put("event", msg_id, data)
+        await connection.put("done", msg_id)
 
+    async def serve_websocket(self):
+        """
+        `_flash/ws`, the callback requests and `event_callback` streams of a
+        page over one connection, see `_websocket.SocketConnection`.
+
+        The client sends JSON messages with a ``type`` and an ``id``:
+        ``callback`` with the `_dash-update-component` ``body`` and extra
+        ``headers``, ``start`` with the ``content`` of a stream and
+        ``cancel``. Requests of other origins are refused, browsers don't
+        apply the same origin policy to websockets.
+        """
+        ws = quart.websocket
+        if ws.origin and urlparse(ws.origin).netloc != ws.host:
+            quart.abort(403)
+        await ws.accept()
+
+        request_info = self._request_info(ws)
+        connection = _websocket.SocketConnection(ws.send, ws.close)
+        self._socket_connections.add(connection)
+        writer = connection.start()
+        try:
+            while True:
                 try:
-                    async for item in sse_obj.func(**content):
-                        if item is None:
-                            warnings.warn(
-                                f"Callback generator functions should not return None values - Callback: {sse_obj.func_name} | {callback_id}"
-                            )
-                            continue
-
-                        yield item
-                        await asyncio.sleep(0.1)
-
-                except Exception as e:
-                    handle_error = True
-                    if on_error:
-                        handle_error = False
-                        yield on_error(e)
-
-                    yield send_signal(
-                        {
-                            "error": str(e),
-                            "handle_error": handle_error,
-                            "reset_props": sse_obj.reset_props,
+                    message = json.loads(await ws.receive())
+                    kind = message["type"]
+                    msg_id = message["id"]
+                except (ValueError, KeyError, TypeError):
+                    self.logger.debug("Invalid websocket message")
+                    continue
+                if not _streams.valid_stream_id(msg_id):
+                    continue
+
+                if kind == "callback":
+                    headers = message.get("headers")
+                    info = AttributeDict(
+                        request_info,
+                        headers={
+                            **request_info.headers,
+                            **(headers if isinstance(headers, dict) else {}),
                         },
                     )
-
-            response = await quart.make_response(callback_generator())
-            response.headers.update(
-                {
-                    "Content-Type": "text/event-stream",
-                    "Cache-Control": "no-cache",
-                    "Transfer-Encoding": "chunked",
-                }
-            )
-            response.timeout = None  # Disable timeout for SSE
-            return response
+                    body = message.get("body", {})
+                    connection.run(
+                        msg_id,
+                        self._socket_callback(connection, msg_id, body, info),
+                        limited=True,
+                    )
+                elif kind == "start":
+                    try:
+                        callback_id, content = self._event_stream_request(
+                            message["content"]
+                        )
+                    except (ValueError, KeyError, TypeError, AttributeError):
+                        self.logger.debug("Invalid websocket stream %s", msg_id)
+                        continue
+                    connection.run(
+                        msg_id,
+                        self._socket_stream(connection, msg_id, callback_id, content),
+                    )
+                elif kind == "cancel":
+                    connection.cancel(msg_id)
+        finally:
+            self._socket_connections.discard(connection)
+            connection.close()
+            writer.cancel()
 
     def __call__(self, *args, **kwargs):
         """
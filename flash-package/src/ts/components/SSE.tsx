@@ -29,6 +29,12 @@ export type Props = DashComponentProps & {
    * A boolean indicating if the strea, should update components.
    */
   update_component?: boolean;
+  /**
+   * How the stream is received. `'sse'` opens a connection per stream,
+   * `'multiplex'` shares one connection per page between every stream,
+   * `'websocket'` streams over the websocket of the page.
+   */
+  transport?: 'sse' | 'multiplex' | 'websocket';
 };
 
 /**
@@ -1,15 +1,26 @@
 import React, { useEffect, useState } from 'react';
 import { SSE as SSEjs, SSEvent } from 'sse.js';
 import { Props as BaseProps } from '../components/SSE'; // reuse the interface
+import { getMultiplexer } from './multiplex';
 
 declare global {
   interface Window {
     dash_clientside?: {
       set_props?: (componentId: string, props: any) => void;
     };
+    dash_component_api?: {
+      getSocket?: () => {
+        start: (content: any, listener: (data: string) => void) => string;
+        stop: (stream: string) => void;
+      };
+    };
   }
 }
 
+// reconnections of a resumable stream before giving up, and their delay in ms
+const MAX_RETRIES = 5;
+const RETRY_DELAY = 1000;
+
 interface Props extends BaseProps {
   update_component?: any;
 }
@@ -21,6 +32,7 @@ const SSE = ({
   setProps,
   done,
   update_component,
+  transport = 'sse',
 }: Props) => {
   const [data, setData] = useState<string>('');
   const [doneData, setDoneData] = useState<boolean>(done || false);
@@ -32,13 +44,13 @@ const SSE = ({
     if (!url) {
       return;
     }
-    // Instantiate EventSource.
-    const sse = new SSEjs(url, options);
-    sse.onmessage = (e: SSEvent) => {
+    // Instantiate EventSource, or a stream on the shared page connection.
+    let close: (notify?: boolean) => void;
+    const onmessage = (e: SSEvent) => {
       // Handle end of stream.
       if (e.data === '[DONE]') {
         setDoneData(true);
-        sse.close();
+        close(false);
         return;
       }
       // If update_component is set, try to parse and update Dash component
@@ -63,7 +75,7 @@ const SSE = ({
                     }
                   });
                 }
-                sse.close()
+                close(false);
                 break;
 
               case '[SINGLE]':
@@ -92,15 +104,71 @@ const SSE = ({
         }
       }
     };
-    sse.onerror = (e: Event) => {
-      console.log('Unhandled SSE ERROR', e);
-      sse.close();
-    };
+    const getSocket = window.dash_component_api?.getSocket;
+    if (transport === 'websocket' && getSocket && options) {
+      const socket = getSocket();
+      const payload = JSON.parse((options.payload as string) || '{}');
+      const stream = socket.start(payload.content, (data: string) =>
+        onmessage({ data } as unknown as SSEvent)
+      );
+      close = (notify = true) => notify && socket.stop(stream);
+    } else if (transport === 'multiplex' && options) {
+      const multiplexer = getMultiplexer(url);
+      const stream = multiplexer.start(options, onmessage);
+      close = (notify = true) => multiplexer.stop(stream, notify);
+    } else {
+      // Resumable streams send event ids, a lost connection resumes from
+      // the last one received instead of running the callback again.
+      let sse: SSEjs;
+      let lastEventId = '';
+      let retries = 0;
+      let finished = false;
+      let timer: ReturnType<typeof setTimeout> | undefined;
+      const open = () => {
+        const headers: Record<string, string> = { ...options?.headers };
+        if (lastEventId) {
+          headers['Last-Event-ID'] = lastEventId;
+        }
+        const source = (sse = new SSEjs(url, { ...options, headers }));
+        source.onmessage = (e: SSEvent) => {
+          if (e.id) {
+            lastEventId = e.id;
+            retries = 0;
+          }
+          onmessage(e);
+        };
+        source.onerror = (e: Event) => {
+          if (!lastEventId) {
+            console.log('Unhandled SSE ERROR', e);
+          }
+          source.close();
+        };
+        source.addEventListener('readystatechange', (e: any) => {
+          if (
+            e.readyState !== 2 || // CLOSED
+            source !== sse ||
+            finished ||
+            !lastEventId ||
+            retries >= MAX_RETRIES
+          ) {
+            return;
+          }
+          retries += 1;
+          timer = setTimeout(open, RETRY_DELAY * retries);
+        });
+      };
+      open();
+      close = () => {
+        finished = true;
+        clearTimeout(timer);
+        sse.close();
+      };
+    }
     // Close on unmount.
     return () => {
-      sse.close();
+      close();
     };
-  }, [url, options, concat]);
+  }, [url, options, concat, transport]);
 
   useEffect(() => {
     if (setProps) {
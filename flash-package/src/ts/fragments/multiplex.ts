@@ -0,0 +1,118 @@
+import { SSE as SSEjs, SSEOptions, SSEvent } from 'sse.js';
+
+type Listener = (e: SSEvent) => void;
+
+/**
+ * One SSE connection per page carrying every `event_callback` stream.
+ * The server issues the session, bound to this client by a cookie. Streams
+ * are started and stopped with the control endpoint and each one arrives
+ * as its own event type on the shared connection.
+ */
+class StreamMultiplexer {
+  private session: Promise<string> | null = null;
+  private source: SSEjs | null = null;
+  private listeners = new Map<string, Listener>();
+  private counter = 0;
+
+  constructor(private readonly url: string) {}
+
+  private getSession(options?: SSEOptions) {
+    if (!this.session) {
+      const session = fetch(`${this.url}/session`, {
+        method: 'POST',
+        headers: { ...options?.headers },
+        credentials: options?.withCredentials ? 'include' : 'same-origin',
+      })
+        .then((res) => {
+          if (!res.ok) {
+            throw new Error(`SSE session refused: ${res.status}`);
+          }
+          return res.json();
+        })
+        .then((data) => data.session as string);
+      // asked again by the next stream
+      session.catch(() => {
+        if (this.session === session) {
+          this.session = null;
+        }
+      });
+      this.session = session;
+    }
+    return this.session;
+  }
+
+  private connect(session: string, options?: SSEOptions) {
+    if (this.source) {
+      return this.source;
+    }
+    this.source = new SSEjs(`${this.url}/session/${session}`, {
+      method: 'GET',
+      withCredentials: options?.withCredentials,
+    });
+    this.source.onerror = (e: Event) => {
+      console.log('Unhandled SSE ERROR', e);
+    };
+    return this.source;
+  }
+
+  private control(
+    session: string,
+    body: Record<string, any>,
+    options?: SSEOptions
+  ) {
+    return fetch(`${this.url}/control`, {
+      method: 'POST',
+      headers: { ...options?.headers, 'Content-Type': 'application/json' },
+      credentials: options?.withCredentials ? 'include' : 'same-origin',
+      body: JSON.stringify({ session, ...body }),
+      keepalive: true,
+    });
+  }
+
+  start(options: SSEOptions, listener: Listener): string {
+    const stream = `s${++this.counter}`;
+    this.listeners.set(stream, listener);
+
+    const payload = JSON.parse((options.payload as string) || '{}');
+    this.getSession(options).then(
+      (session) => {
+        if (this.listeners.get(stream) !== listener) {
+          // stopped before the session was known
+          return;
+        }
+        this.connect(session, options).addEventListener(stream, listener);
+        this.control(
+          session,
+          { action: 'start', stream, content: payload.content },
+          options
+        );
+      },
+      (err) => console.log('Unhandled SSE ERROR', err)
+    );
+    return stream;
+  }
+
+  stop(stream: string, notify = true) {
+    const listener = this.listeners.get(stream);
+    if (!listener) {
+      return;
+    }
+    this.listeners.delete(stream);
+    this.source?.removeEventListener(stream, listener);
+    if (notify && this.session) {
+      this.session.then(
+        (session) => this.control(session, { action: 'stop', stream }),
+        () => undefined
+      );
+    }
+    if (this.listeners.size === 0) {
+      this.source?.close();
+      this.source = null;
+    }
+  }
+}
+
+const multiplexers: Record<string, StreamMultiplexer> = {};
+
+export const getMultiplexer = (url: string) =>
+  (multiplexers[url] = multiplexers[url] || new StreamMultiplexer(url));
@@ -0,0 +1,26 @@
+import pytest
+
+from flash import _callback
+from flash._event_callback import _SSEServerObjects
+
+
+@pytest.fixture(autouse=True)
+def clear_callbacks():
+    """Callbacks registered with `flash.callback` are global, drop them after each test."""
+    yield
+    _callback.GLOBAL_CALLBACK_LIST.clear()
+    _callback.GLOBAL_CALLBACK_MAP.clear()
+    _callback.GLOBAL_INLINE_SCRIPTS.clear()
+    _callback.GLOBAL_API_PATHS.clear()
+    _SSEServerObjects.funcs.clear()
+
+
+def update_body(output, inputs, outputs=None, state=None, changed=None):
+    """A `_dash-update-component` request body."""
+    return {
+        "output": output,
+        "outputs": outputs,
+        "inputs": inputs,
+        "state": state or [],
+        "changedPropIds": changed or [],
+    }
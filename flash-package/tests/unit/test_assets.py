@@ -0,0 +1,82 @@
+import re
+
+import pytest
+from dash import html
+
+from flash import Flash, _assets
+
+
+def _write_assets(folder):
+    folder.mkdir()
+    (folder / "style.css").write_text("body { color: red; }")
+    (folder / "app.js").write_text("window.loaded = true;")
+    (folder / "noext").write_text("plain")
+
+
+def test_manifest_follows_the_file_content(tmp_path):
+    path = tmp_path / "style.css"
+    path.write_text("a")
+    manifest = _assets.AssetManifest()
+
+    manifest.update("style.css", str(path))
+    first = manifest.get("style.css")
+    assert re.fullmatch(r"style\.v[\w_-]+m[0-9a-f]{16}\.css", first)
+
+    path.write_text("b")
+    manifest.update("style.css", str(path))
+    assert manifest.get("style.css") not in (None, first)
+
+    manifest.update("noext", str(path))
+    assert manifest.get("noext") is None
+
+    manifest.update("missing.css", str(tmp_path / "missing.css"))
+    assert manifest.get("missing.css") is None
+
+    manifest.remove("style.css")
+    assert manifest.get("style.css") is None
+
+
+@pytest.mark.asyncio
+async def test_fingerprinted_assets_are_immutable(tmp_path):
+    _write_assets(tmp_path / "assets")
+    app = Flash(__name__, assets_folder=str(tmp_path / "assets"))
+    app.layout = html.Div(id="root")
+
+    client = app.server.test_client()
+    async with app.server.test_app():
+        page = await (await client.get("/")).get_data(as_text=True)
+        css_url = re.search(r'href="(/assets/style\.[^"]+\.css)"', page).group(1)
+        js_url = re.search(r'src="(/assets/app\.[^"]+\.js)"', page).group(1)
+
+        response = await client.get(css_url)
+        assert response.status_code == 200
+        assert await response.get_data(as_text=True) == "body { color: red; }"
+        assert response.cache_control.immutable
+        assert response.cache_control.max_age == 31536000
+
+        response = await client.get(js_url)
+        assert await response.get_data(as_text=True) == "window.loaded = true;"
+        assert response.cache_control.immutable
+
+        response = await client.get("/assets/style.css")
+        assert response.status_code == 200
+        assert not response.cache_control.immutable
+
+
+@pytest.mark.asyncio
+async def test_outdated_fingerprint_gets_the_current_file(tmp_path):
+    _write_assets(tmp_path / "assets")
+    app = Flash(__name__, assets_folder=str(tmp_path / "assets"))
+    app.layout = html.Div(id="root")
+
+    client = app.server.test_client()
+    async with app.server.test_app():
+        # pylint: disable-next=protected-access
+        current = app._assets_manifest.get("style.css")
+        outdated = re.sub(r"m[0-9a-f]{16}", "m" + "0" * 16, current)
+        assert outdated != current
+
+        response = await client.get(f"/assets/{outdated}")
+        assert response.status_code == 200
+        assert await response.get_data(as_text=True) == "body { color: red; }"
+        assert not response.cache_control.immutable
@@ -0,0 +1,117 @@
+import json
+
+import pytest
+from dash import html
+from dash.exceptions import PreventUpdate
+
+from flash import Flash, Input, Output, callback, ctx
+
+from .conftest import update_body
+
+
+def _body(output, value):
+    return update_body(
+        f"{output}.children",
+        [{"id": "in", "property": "value", "value": value}],
+        outputs={"id": output, "property": "children"},
+        changed=["in.value"],
+    )
+
+
+@pytest.fixture
+def app():
+    app = Flash(__name__)
+    app.layout = html.Div()
+
+    @callback(Output("a", "children"), Input("in", "value"))
+    async def a(value):
+        ctx.response.set_cookie("seen", "a")
+        return value * 2
+
+    @callback(Output("b", "children"), Input("in", "value"))
+    async def b(value):
+        raise PreventUpdate
+
+    @callback(Output("c", "children"), Input("in", "value"))
+    async def c(value):
+        raise ValueError("boom")
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_batch_answers_each_payload_in_order(app):
+    client = app.server.test_client()
+    async with app.server.test_app():
+        response = await client.post(
+            "/_dash-update-component-batch",
+            json=[_body("a", 2), _body("b", 2), _body("c", 2), _body("a", 5)],
+        )
+        assert response.status_code == 200
+        items = json.loads(await response.get_data(as_text=True))
+        cookies = response.headers.getlist("Set-Cookie")
+
+    assert [item["status"] for item in items] == [200, 204, 500, 200]
+    assert items[0]["data"]["response"]["a"]["children"] == 4
+    assert items[3]["data"]["response"]["a"]["children"] == 10
+    assert isinstance(items[2]["data"], str)
+    assert len(cookies) == 2 and cookies[0].startswith("seen=a")
+
+
+@pytest.mark.asyncio
+async def test_batch_rejects_non_lists(app):
+    client = app.server.test_client()
+    async with app.server.test_app():
+        response = await client.post("/_dash-update-component-batch", json=_body("a", 1))
+        assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_config_tells_the_renderer_to_batch(app):
+    client = app.server.test_client()
+    async with app.server.test_app():
+        response = await client.get("/")
+        html_page = await response.get_data(as_text=True)
+    assert '"batch_callbacks": true' in html_page or '"batch_callbacks":true' in html_page
+
+
+@pytest.mark.asyncio
+async def test_batch_size_is_limited():
+    app = Flash(__name__, max_batch_size=2)
+    app.layout = html.Div()
+
+    @callback(Output("a", "children"), Input("in", "value"))
+    async def a(value):
+        return value
+
+    client = app.server.test_client()
+    async with app.server.test_app():
+        response = await client.post(
+            "/_dash-update-component-batch", json=[_body("a", i) for i in range(3)]
+        )
+        assert response.status_code == 413
+        response = await client.post(
+            "/_dash-update-component-batch", json=[_body("a", i) for i in range(2)]
+        )
+        assert response.status_code == 200
+        config = await (await client.get("/")).get_data(as_text=True)
+    assert '"max_batch_size":2' in config.replace(" ", "")
+
+    with pytest.raises(ValueError):
+        Flash(__name__, max_batch_size=0)
+
+
+@pytest.mark.asyncio
+async def test_batching_can_be_turned_off():
+    app = Flash(__name__, batch_callbacks=False)
+    app.layout = html.Div()
+
+    client = app.server.test_client()
+    async with app.server.test_app():
+        response = await client.post(
+            "/_dash-update-component-batch", json=[_body("a", 1)]
+        )
+        # only the GET of the pages matches the path now
+        assert response.status_code == 405
+        html_page = await (await client.get("/")).get_data(as_text=True)
+    assert "batch_callbacks" not in html_page
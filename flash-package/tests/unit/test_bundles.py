@@ -0,0 +1,164 @@
+import base64
+import gzip
+import hashlib
+import re
+
+import pytest
+import quart
+from dash import Input, Output, html
+
+from flash import Flash, _bundles, _callback
+
+DATA = b"console.log('flash');\n" * 100
+
+
+def _server(bundle, compress=True):
+    server = quart.Quart(__name__)
+
+    @server.route("/bundle.js")
+    async def serve():
+        return await _bundles.bundle_response(bundle, quart.request, compress=compress)
+
+    return server
+
+
+@pytest.mark.asyncio
+async def test_bundle_serves_the_accepted_encoding():
+    bundle = _bundles.Bundle(DATA, "application/javascript")
+    server = _server(bundle)
+    client = server.test_client()
+
+    response = await client.get("/bundle.js", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert response.headers["ETag"] == f'"{bundle.etag}-gzip"'
+    assert gzip.decompress(await response.get_data()) == DATA
+
+    response = await client.get("/bundle.js")
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["ETag"] == f'"{bundle.etag}"'
+    assert await response.get_data() == DATA
+
+
+@pytest.mark.asyncio
+async def test_bundle_answers_if_none_match_and_range():
+    bundle = _bundles.Bundle(DATA, "application/javascript")
+    client = _server(bundle).test_client()
+
+    response = await client.get(
+        "/bundle.js", headers={"If-None-Match": f'"{bundle.etag}"'}
+    )
+    assert response.status_code == 304
+    assert await response.get_data() == b""
+
+    response = await client.get("/bundle.js", headers={"Range": "bytes=0-9"})
+    assert response.status_code == 206
+    assert await response.get_data() == DATA[:10]
+
+
+@pytest.mark.asyncio
+async def test_bundle_without_compress_serves_the_raw_data():
+    bundle = _bundles.Bundle(DATA, "application/javascript")
+    client = _server(bundle, compress=False).test_client()
+
+    response = await client.get("/bundle.js", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["ETag"] == f'"{bundle.etag}"'
+    assert await response.get_data() == DATA
+
+
+def test_small_or_binary_bundles_are_not_compressed():
+    assert not _bundles.Bundle(b"x" * 10, "application/javascript").compressible
+    assert not _bundles.Bundle(DATA, "image/png").compressible
+    assert _bundles.Bundle(DATA, "text/css").compressible
+
+
+@pytest.mark.asyncio
+async def test_failed_compression_is_retried(monkeypatch):
+    calls = []
+
+    def flaky(data):
+        calls.append(data)
+        if len(calls) == 1:
+            raise RuntimeError("compression failed")
+        return b"compressed"
+
+    monkeypatch.setitem(_bundles.COMPRESSORS, "gzip", flaky)
+    bundle = _bundles.Bundle(DATA, "application/javascript")
+
+    with pytest.raises(RuntimeError):
+        await bundle.encoded("gzip")
+    assert await bundle.encoded("gzip") == b"compressed"
+    assert await bundle.encoded("gzip") == b"compressed"
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_warm_follows_compress():
+    # pylint: disable=protected-access
+    cache = _bundles.BundleCache(compress=False)
+    bundle = _bundles.Bundle(DATA, "application/javascript")
+    cache._bundles[("pkg", "bundle.js")] = bundle
+
+    await cache.warm({"pkg": {"bundle.js"}})
+    assert not bundle._encoded
+
+    cache.compress = True
+    await cache.warm({"pkg": {"bundle.js"}})
+    assert set(bundle._encoded) == set(_bundles.COMPRESSORS)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("compress", [False, True])
+async def test_flash_dependencies_follow_compress(compress):
+    if compress:
+        pytest.importorskip("quart_compress")
+    app = Flash(__name__, compress=compress)
+    app.layout = html.Div([html.Div(id=f"in-{i}") for i in range(20)])
+    for i in range(20):
+        app.callback(Output(f"in-{i}", "title"), Input(f"in-{i}", "children"))(str)
+
+    client = app.server.test_client()
+    async with app.server.test_app():
+        response = await client.get(
+            "/_dash-dependencies", headers={"Accept-Encoding": "gzip"}
+        )
+    assert response.status_code == 200
+    assert ("Content-Encoding" in response.headers) is compress
+
+
+@pytest.mark.asyncio
+async def test_inline_clientside_callbacks_are_bundled():
+    app = Flash(__name__)
+    app.layout = html.Div([html.Div(id="in"), html.Div(id="a"), html.Div(id="b")])
+    app.clientside_callback(
+        "function (value) { return 'a' + value; }",
+        Output("a", "children"),
+        Input("in", "children"),
+    )
+    _callback.clientside_callback(
+        "function (value) { return 'b' + value; }",
+        Output("b", "children"),
+        Input("in", "children"),
+    )
+
+    client = app.server.test_client()
+    async with app.server.test_app():
+        first = await (await client.get("/")).get_data(as_text=True)
+        assert await (await client.get("/")).get_data(as_text=True) == first
+        src, integrity = re.search(
+            r'<script src="([^"]*inline_clientside[^"]*)" integrity="([^"]*)">',
+            first,
+        ).groups()
+        response = await client.get(src)
+        script = await response.get_data()
+
+    assert "return 'a' + value" not in first
+    # pylint: disable-next=protected-access
+    assert script == "\n".join(app._inline_scripts).encode("utf-8")
+    assert b"return 'a' + value" in script and b"return 'b' + value" in script
+    digest = base64.b64encode(hashlib.sha256(script).digest()).decode("utf-8")
+    assert integrity == f"sha256-{digest}"
+    assert app.csp_hashes()[0] == f"'sha256-{digest}'"
+    assert len(app.csp_hashes()) == 2
@@ -0,0 +1,133 @@
+import asyncio
+import contextlib
+
+import pytest
+import quart
+from dash import html
+
+from flash import (
+    Flash,
+    Input,
+    _channels,
+    _pubsub,
+    event_callback,
+    get_app,
+    stream_props,
+)
+from flash._event_callback import SSE_CALLBACK_ENDPOINT, _SSEServerObjects
+from flash._hooks import HooksManager
+
+
+async def _take(items, count):
+    taken = []
+    async with contextlib.aclosing(items):
+        async for item in items:
+            taken.append(item)
+            if len(taken) == count:
+                break
+    return taken
+
+
+@pytest.mark.asyncio
+async def test_channel_shares_one_producer():
+    hub = _channels.ChannelHub(_pubsub.MemoryBackend())
+    runs = []
+
+    async def producer():
+        runs.append("started")
+        try:
+            for i in range(1000):
+                yield f"data: {i}\n\n".encode()
+                await asyncio.sleep(0.001)
+        finally:
+            runs.append("stopped")
+
+    first = asyncio.ensure_future(_take(hub.subscribe("prices", producer), 3))
+    second = asyncio.ensure_future(_take(hub.subscribe("prices", producer), 6))
+    await asyncio.sleep(0)
+    assert hub.subscribers("prices") == 2
+
+    assert len(await first) == 3
+    assert hub.subscribers("prices") == 1
+    assert len(await second) == 6
+    await asyncio.sleep(0.01)
+
+    assert runs == ["started", "stopped"]
+    assert hub.subscribers("prices") == 0
+    assert "prices" not in hub.channels
+
+
+@pytest.mark.asyncio
+async def test_channel_ends_with_its_producer():
+    hub = _channels.ChannelHub(_pubsub.MemoryBackend())
+
+    async def producer():
+        for i in range(3):
+            yield f"data: {i}\n\n".encode()
+
+    frames = [frame async for frame in hub.subscribe("once", producer)]
+    assert frames == [f"data: {i}\n\n".encode() for i in range(3)]
+
+
+@pytest.mark.asyncio
+async def test_published_frames_reach_every_subscriber():
+    hub = _channels.ChannelHub(_pubsub.MemoryBackend())
+    readers = [
+        asyncio.ensure_future(_take(hub.subscribe("news"), 2)) for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+
+    await hub.publish("news", b"data: a\n\n")
+    await hub.publish("news", b"data: b\n\n")
+    for reader in readers:
+        assert await reader == [b"data: a\n\n", b"data: b\n\n"]
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_loses_its_oldest_frames(monkeypatch, caplog):
+    monkeypatch.setattr(_channels, "SUBSCRIBER_QUEUE_SIZE", 2)
+    hub = _channels.ChannelHub(_pubsub.MemoryBackend())
+    subscription = hub.subscribe("news")
+    reader = asyncio.ensure_future(anext(subscription))
+    await asyncio.sleep(0)
+    await hub.publish("news", b"0")
+    assert await reader == b"0"
+
+    for i in range(1, 6):
+        await hub.publish("news", str(i).encode())
+    await asyncio.sleep(0)
+
+    assert await anext(subscription) == b"4"
+    assert await anext(subscription) == b"5"
+    assert hub.channels["news"].dropped == 3
+    assert caplog.text.count("Slow subscriber of channel news") == 1
+    await subscription.aclose()
+
+
+@pytest.mark.asyncio
+async def test_channel_producer_runs_without_a_request(monkeypatch):
+    monkeypatch.setitem(HooksManager.hooks._ns, "layout", [])
+    app = Flash(__name__)
+    app.layout = html.Div([html.Button(id="b"), html.Div(id="o")])
+    seen = []
+
+    @event_callback(Input("b", "n_clicks"), channel="ticks")
+    async def ticks(n):
+        seen.append(
+            (n, quart.has_request_context(), quart.has_app_context(), get_app())
+        )
+        for i in range(2):
+            yield stream_props("o", {"children": i})
+
+    (callback_id,) = _SSEServerObjects.funcs
+    client = app.server.test_client()
+    async with app.server.test_app():
+        response = await client.post(
+            SSE_CALLBACK_ENDPOINT,
+            json={"content": {"sse_callback_id": callback_id, "n": 1}},
+            headers={"Accept": "text/event-stream"},
+        )
+        data = await response.get_data()
+
+    assert data.count(b"[SINGLE]") == 2
+    assert seen == [(1, False, True, app)]
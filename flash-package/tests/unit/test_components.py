@@ -0,0 +1,30 @@
+import json
+import pathlib
+import re
+
+import pytest
+
+from flash.SSE import SSE
+
+PACKAGE = pathlib.Path(__file__).parents[2]
+
+
+def test_sse_component_matches_its_source():
+    # `npm run build:backends` generates `SSE.py` and `metadata.json` from
+    # the props of the TypeScript component
+    source = (PACKAGE / "src/ts/components/SSE.tsx").read_text()
+    props_type = source.split("export type Props")[1].split("};")[0]
+    props = set(re.findall(r"^  (\w+)\??:", props_type, re.MULTILINE))
+
+    metadata = json.loads((PACKAGE / "flash/metadata.json").read_text())
+    generated = metadata["src/ts/components/SSE.tsx"]["props"]
+
+    assert set(generated) == props | {"id", "setProps"}
+    assert set(SSE().available_properties) == set(generated) - {"setProps"}
+
+
+@pytest.mark.parametrize("bundle", ["flash.js", "async-SSE.js"])
+def test_deps_hold_the_shipped_bundles(bundle):
+    # the bundles built into `flash/` are copied to `deps/`
+    shipped = (PACKAGE / "flash" / bundle).read_bytes()
+    assert (PACKAGE / "deps" / bundle).read_bytes() == shipped
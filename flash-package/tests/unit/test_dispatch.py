@@ -0,0 +1,117 @@
+import json
+
+import pytest
+from dash import html
+from dash.exceptions import CallbackException
+
+from flash import Flash, Input, Output, State, ALL, callback, ctx
+from flash._dispatch import DispatchPlan, build_dispatch_plans
+
+from .conftest import update_body
+
+
+def _plan(app, callback_id):
+    return build_dispatch_plans(app.callback_map)[callback_id]
+
+
+def test_plan_groups_positional_args():
+    app = Flash(__name__)
+    app.callback(Output("out", "children"), Input("a", "value"), State("b", "value"))(
+        lambda a, b: a
+    )
+    plan = _plan(app, "out.children")
+
+    assert plan.group_input_args([1, 2]) == ([1, 2], {})
+    with pytest.raises(CallbackException):
+        plan.group_input_args([1])
+
+
+def test_plan_groups_keyword_args():
+    app = Flash(__name__)
+    app.callback(
+        output=Output("out", "children"),
+        inputs={"a": Input("a", "value"), "rest": {"b": State("b", "value")}},
+    )(lambda a, rest: a)
+    plan = _plan(app, "out.children")
+
+    args, kwargs = plan.group_input_args([1, 2])
+    assert args == []
+    assert kwargs == {"a": 1, "rest": {"b": 2}}
+    assert plan.args_grouping([1, 2])[1] is True
+
+
+def test_plan_prepares_static_and_wildcard_args():
+    app = Flash(__name__)
+    app.callback(
+        Output("out", "children"),
+        Input("a", "value"),
+        Input({"type": "x", "index": ALL}, "value"),
+    )(lambda a, xs: a)
+    plan = _plan(app, "out.children")
+
+    a, xs = plan.prepare_args(
+        [
+            {"id": "a", "property": "value", "value": 1},
+            [{"id": {"type": "x", "index": 0}, "property": "value", "value": 2}],
+        ],
+        ["a.value"],
+    )
+    assert (a.id, a.str_id, a.value, a.triggered) == ("a", "a", 1, True)
+    assert xs[0].id == {"type": "x", "index": 0}
+    assert xs[0].triggered is False
+
+
+def test_plan_validates_output_spec():
+    app = Flash(__name__)
+    app.callback(
+        [Output("a", "children"), Output("b", "children")], Input("i", "value")
+    )(lambda v: (v, v))
+    plan = _plan(app, "..a.children...b.children..")
+
+    plan.validate_output_spec(
+        [{"id": "a", "property": "children"}, {"id": "b", "property": "children"}]
+    )
+    with pytest.raises(CallbackException):
+        plan.validate_output_spec(
+            [{"id": "a", "property": "children"}, {"id": "c", "property": "children"}]
+        )
+    with pytest.raises(CallbackException):
+        plan.validate_output_spec([{"id": "a", "property": "children"}])
+
+
+def test_plan_skips_clientside_callbacks():
+    app = Flash(__name__)
+    app.clientside_callback(
+        "function(v) { return v; }", Output("out", "children"), Input("a", "value")
+    )
+    assert build_dispatch_plans(app.callback_map) == {}
+
+
+@pytest.mark.asyncio
+async def test_dispatch_fills_callback_context():
+    app = Flash(__name__)
+    app.layout = html.Div()
+
+    @callback(
+        output={"out": Output("out", "children")},
+        inputs={"n": Input("btn", "n_clicks"), "s": State("btn", "id")},
+    )
+    async def update(n, s):
+        return {"out": [n, s, ctx.triggered_id, ctx.using_args_grouping]}
+
+    client = app.server.test_client()
+    async with app.server.test_app():
+        response = await client.post(
+            "/_dash-update-component",
+            json=update_body(
+                "..out.children..",
+                [{"id": "btn", "property": "n_clicks", "value": 3}],
+                outputs=[{"id": "out", "property": "children"}],
+                state=[{"id": "btn", "property": "id", "value": "btn"}],
+                changed=["btn.n_clicks"],
+            ),
+        )
+        assert response.status_code == 200
+        data = json.loads(await response.get_data(as_text=True))
+    assert data["response"]["out"]["children"] == [3, "btn", "btn", True]
+    assert isinstance(app._dispatch_plans["..out.children.."], DispatchPlan)
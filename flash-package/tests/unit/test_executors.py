@@ -0,0 +1,110 @@
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+from dash import html
+
+from flash import Flash, Input, Output
+from flash._executors import CallbackExecutors
+
+from .conftest import update_body
+
+
+def current_pid(value):
+    return os.getpid()
+
+
+def current_thread(value):
+    return threading.current_thread().name
+
+
+def identity(value):
+    return value
+
+
+def _app(func, executor, executors=None):
+    app = Flash(__name__, executors=executors)
+    app.layout = html.Div([html.Div(id="in"), html.Div(id="out")])
+    app.callback(Output("out", "children"), Input("in", "children"), executor=executor)(
+        func
+    )
+    return app
+
+
+async def _post(client):
+    response = await client.post(
+        "/_dash-update-component",
+        json=update_body(
+            "out.children",
+            [{"id": "in", "property": "children", "value": 1}],
+            outputs={"id": "out", "property": "children"},
+        ),
+    )
+    assert response.status_code == 200
+    data = json.loads(await response.get_data(as_text=True))
+    return data["response"]["out"]["children"]
+
+
+@pytest.mark.asyncio
+async def test_thread_executor_runs_the_callback():
+    app = _app(current_thread, "threads")
+    client = app.server.test_client()
+    async with app.server.test_app():
+        assert (await _post(client)).startswith("flash-callback_")
+
+
+@pytest.mark.asyncio
+async def test_process_executor_runs_the_callback():
+    app = _app(current_pid, "processes")
+    client = app.server.test_client()
+    async with app.server.test_app():
+        pid = await _post(client)
+    assert isinstance(pid, int) and pid != os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_process_executor_needs_picklable_calls():
+    executors = CallbackExecutors()
+    try:
+        with pytest.raises(ValueError, match="module level function"):
+            await executors.run("processes", lambda value: value, [1], {})
+        with pytest.raises(ValueError, match="arguments of callback 'identity'"):
+            await executors.run("processes", identity, [threading.Lock()], {})
+        assert await executors.run("processes", identity, [1], {}) == 1
+    finally:
+        await executors.shutdown()
+
+
+def test_unknown_executor_names():
+    with pytest.raises(KeyError, match="gpu"):
+        CallbackExecutors().get("gpu")
+    with pytest.raises(ValueError):
+        CallbackExecutors({"gpu": object()})
+
+
+@pytest.mark.asyncio
+async def test_warm_starts_the_process_workers():
+    executors = CallbackExecutors({"processes": ProcessPoolExecutor(max_workers=2)})
+    await executors.warm({"processes", "threads"})
+    # pylint: disable=protected-access
+    assert len(executors.get("processes")._processes) == 2
+    assert isinstance(executors.get("threads"), ThreadPoolExecutor)
+    await executors.shutdown()
+    executors.get("processes").shutdown()
+
+
+@pytest.mark.asyncio
+async def test_app_teardown_shuts_down_its_executors():
+    user_pool = ThreadPoolExecutor(max_workers=1)
+    app = _app(current_thread, "threads", {"mine": user_pool})
+
+    async with app.server.test_app():
+        threads = app.executors.get("threads")
+        assert not threads._shutdown  # pylint: disable=protected-access
+
+    assert threads._shutdown  # pylint: disable=protected-access
+    # executors given to the app are left to their owner
+    assert not user_pool._shutdown  # pylint: disable=protected-access
+    user_pool.shutdown()
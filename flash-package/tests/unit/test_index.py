@@ -0,0 +1,138 @@
+import collections
+import contextvars
+import json
+import re
+
+import pytest
+import quart
+from dash import html
+
+from flash import Flash, Input, Output, _get_app, _json, _pages, register_page
+
+
+async def _index(app):
+    client = app.server.test_client()
+    async with app.server.test_app():
+        response = await client.get("/")
+        return await response.get_data(as_text=True)
+
+
+@pytest.mark.asyncio
+async def test_index_config_follows_settings():
+    app = Flash(__name__)
+    app.layout = html.Div(id="root")
+    assert '"suppress_callback_exceptions":false' in (await _index(app)).replace(
+        " ", ""
+    )
+
+    app.config.suppress_callback_exceptions = True
+
+    page = (await _index(app)).replace(" ", "")
+    assert '"suppress_callback_exceptions":true' in page
+
+
+@pytest.mark.asyncio
+async def test_index_config_holds_the_current_validation_layout():
+    app = Flash(__name__)
+    app.layout = html.Div(id="root")
+    await _index(app)
+
+    app.validation_layout = html.Div([html.Span(id="validation-only")])
+
+    assert "validation-only" in await _index(app)
+
+
+@pytest.mark.asyncio
+async def test_index_config_is_encoded_once():
+    configs = []
+    plotly = _json.get_engine("plotly")
+
+    def dumps(obj):
+        if isinstance(obj, dict) and "validation_layout" in obj:
+            configs.append(obj)
+        return plotly(obj)
+
+    app = Flash(__name__, json_engine=dumps)
+    app.layout = html.Div(id="root")
+    app.validation_layout = html.Div([html.Span(id="first")])
+
+    first = await _index(app)
+    assert await _index(app) == first
+    assert len(configs) == 1
+
+    app.validation_layout.children.append(html.Span(id="in-place"))
+    assert "in-place" in await _index(app)
+    # pylint: disable-next=protected-access
+    app._extra_components.append(html.Span(id="extra-component"))
+    assert "extra-component" in await _index(app)
+    app.config.update_title = "Busy..."
+    assert "Busy..." in await _index(app)
+    assert len(configs) == 4
+
+
+@pytest.mark.asyncio
+async def test_pages_registered_before_init_app(monkeypatch):
+    monkeypatch.setattr(_get_app, "APP", None)
+    monkeypatch.setattr(_pages, "PAGE_REGISTRY", collections.OrderedDict())
+    app = Flash(__name__, server=False, use_pages=True, pages_folder="")
+
+    def register_home():
+        # no app is bound yet, like page modules imported before `init_app`
+        _get_app.app_context.set(None)
+        register_page("home", path="/", layout=html.Div(id="home-page"))
+
+    contextvars.copy_context().run(register_home)
+
+    app.init_app(quart.Quart(__name__))
+    client = app.server.test_client()
+    async with app.server.test_app():
+        response = await client.get("/")
+        assert response.status_code == 200
+        layout = await (await client.get("/_dash-layout")).get_data(as_text=True)
+    assert "_pages_content" in layout
+    assert list(_pages.PAGE_REGISTRY) == ["home"]
+
+
+def _script(page, script_id):
+    tag = f'<script id="{script_id}" type="application/json">(.*?)</script>'
+    match = re.search(tag, page)
+    return json.loads(match.group(1)) if match else None
+
+
+@pytest.mark.asyncio
+async def test_inline_initial_data():
+    app = Flash(__name__, inline_initial_data=True)
+    app.layout = html.Div(
+        [html.Div("</script><b>out</b>", id="in"), html.Div(id="out")]
+    )
+
+    @app.callback(Output("out", "children"), Input("in", "children"))
+    async def copy(value):
+        return value
+
+    client = app.server.test_client()
+    async with app.server.test_app():
+        page = await (await client.get("/")).get_data(as_text=True)
+        layout = await (await client.get("/_dash-layout")).get_json()
+        dependencies = await (await client.get("/_dash-dependencies")).get_json()
+
+    # the layout data can't close the script tag it is embedded in
+    assert "<b>out</b>" not in page
+    assert _script(page, "_dash-inline-layout") == layout
+    assert "</script><b>out</b>" in json.dumps(layout)
+    assert _script(page, "_dash-inline-dependencies") == dependencies
+    assert [dependency["output"] for dependency in dependencies] == ["out.children"]
+    config = _script(page, "_dash-config")
+    assert config["requests_pathname_prefix"] == "/"
+    assert not config["suppress_callback_exceptions"]
+
+
+@pytest.mark.asyncio
+async def test_initial_data_is_not_inlined_by_default():
+    app = Flash(__name__)
+    app.layout = html.Div(id="root")
+    page = await _index(app)
+
+    assert _script(page, "_dash-config") is not None
+    assert _script(page, "_dash-inline-layout") is None
+    assert _script(page, "_dash-inline-dependencies") is None
@@ -0,0 +1,140 @@
+import datetime
+import decimal
+import json
+
+import pytest
+from dash import html
+
+from flash import Flash, Input, Output, _json
+
+from .conftest import update_body
+
+
+def _loads(data):
+    return json.loads(data)
+
+
+@pytest.mark.parametrize("engine", ["orjson", "plotly"])
+def test_engines_encode_components_and_builtins(engine):
+    dumps = _json.get_engine(engine)
+    value = {
+        "layout": html.Div("hi", id="a"),
+        "when": datetime.date(2024, 1, 2),
+        "amount": decimal.Decimal("1.5"),
+    }
+
+    data = _loads(dumps(value))
+
+    assert data["layout"]["props"] == {"children": "hi", "id": "a"}
+    assert data["layout"]["type"] == "Div"
+    assert data["when"] == "2024-01-02"
+    assert data["amount"] == 1.5
+
+
+def test_orjson_escapes_like_plotly():
+    data = _json.get_engine("orjson")({"s": "</script> "})
+
+    assert b"</" not in data
+    assert _loads(data) == {"s": "</script> "}
+    assert _loads(data) == _loads(_json.get_engine("plotly")({"s": "</script> "}))
+
+
+def test_orjson_encodes_numpy_and_pandas():
+    np = pytest.importorskip("numpy")
+    pd = pytest.importorskip("pandas")
+    dumps = _json.get_engine("orjson")
+
+    data = _loads(
+        dumps(
+            {
+                "array": np.arange(3),
+                "scalar": np.float32(0.5),
+                "series": pd.Series([1, 2]),
+                "dates": np.array(["2024-01-01"], dtype="datetime64[D]"),
+                "nat": pd.NaT,
+            }
+        )
+    )
+
+    assert data["array"] == [0, 1, 2]
+    assert data["scalar"] == 0.5
+    assert data["series"] == [1, 2]
+    assert data["dates"][0].startswith("2024-01-01")
+    assert data["nat"] is None
+
+
+def test_orjson_falls_back_for_unknown_types():
+    class Point:
+        pass
+
+    with pytest.raises(TypeError):
+        _json.get_engine("orjson")({"p": Point()})
+
+
+def test_get_engine_accepts_callables_and_modules():
+    def dumps(obj):
+        return "custom"
+
+    assert _json.get_engine(dumps) is dumps
+    assert _json.get_engine(json) is json.dumps
+    with pytest.raises(ValueError):
+        _json.get_engine("yaml")
+
+
+def test_jsonable_copies_without_mutating():
+    value = {1: (html.Span("x"), decimal.Decimal("2")), "set": object()}
+
+    converted = _json.jsonable(value)
+
+    assert converted[1][0]["type"] == "Span"
+    assert converted[1][1] == 2.0
+    assert isinstance(converted["set"], str)
+    assert isinstance(value[1], tuple)
+    json.dumps(converted)
+
+
+def _recording_engine(calls):
+    plotly = _json.get_engine("plotly")
+
+    def dumps(obj):
+        calls.append(obj)
+        return plotly(obj)
+
+    return dumps
+
+
+@pytest.mark.asyncio
+async def test_each_app_keeps_its_engine():
+    calls = {"a": [], "b": []}
+    apps = {
+        name: Flash(__name__, json_engine=_recording_engine(calls[name]))
+        for name in calls
+    }
+    for name, app in apps.items():
+        app.layout = html.Div([html.Div(id="in"), html.Div(id="out")])
+
+        @app.callback(Output("out", "children"), Input("in", "children"))
+        async def tag(value, name=name):
+            return f"{name}:{value}"
+
+    for name, app in apps.items():
+        client = app.server.test_client()
+        async with app.server.test_app():
+            await client.get("/_dash-layout")
+            response = await client.post(
+                "/_dash-update-component",
+                json=update_body(
+                    "out.children",
+                    [{"id": "in", "property": "children", "value": 1}],
+                    outputs={"id": "out", "property": "children"},
+                ),
+            )
+            assert (await response.get_json())["response"]["out"] == {
+                "children": f"{name}:1"
+            }
+
+    # the engine of the last app built is not used by the first one
+    assert calls["a"] and calls["b"]
+    assert all("b:1" not in json.dumps(_json.jsonable(c)) for c in calls["a"])
+    assert any("a:1" in json.dumps(_json.jsonable(c)) for c in calls["a"])
+    assert any("b:1" in json.dumps(_json.jsonable(c)) for c in calls["b"])
@@ -0,0 +1,109 @@
+import json
+
+import pytest
+from dash import html
+
+from flash import Flash, Input, _json, event_callback, stream_props
+from flash._hooks import HooksManager
+
+
+async def _get_layout(app, headers=None):
+    client = app.server.test_client()
+    async with app.server.test_app():
+        response = await client.get("/_dash-layout", headers=headers)
+        return response, await response.get_data(as_text=True)
+
+
+@pytest.mark.asyncio
+async def test_layout_revalidates_with_etag():
+    app = Flash(__name__)
+    app.layout = html.Div("static", id="root")
+
+    response, body = await _get_layout(app)
+    etag = response.headers["ETag"]
+    assert json.loads(body)["props"]["children"] == "static"
+    assert response.headers["Cache-Control"] == "no-cache"
+
+    response, body = await _get_layout(app, {"If-None-Match": etag})
+    assert response.status_code == 304
+    assert body == ""
+
+    app.layout = html.Div("changed", id="root")
+    response, _ = await _get_layout(app, {"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_layout_changed_in_place_is_served():
+    app = Flash(__name__)
+    app.layout = html.Div([html.Span("a")], id="root")
+    await _get_layout(app)
+
+    app.layout.children.append(html.Span("b"))
+
+    _, body = await _get_layout(app)
+    assert len(json.loads(body)["props"]["children"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_layout_hooks_run_on_every_request(monkeypatch):
+    monkeypatch.setitem(HooksManager.hooks._ns, "layout", [])
+    app = Flash(__name__)
+    app.layout = html.Div(id="root")
+    calls = []
+
+    def per_request(layout):
+        calls.append(1)
+        return html.Div(len(calls), id="root")
+
+    HooksManager.hooks.add_hook("layout", per_request)
+
+    _, first = await _get_layout(app)
+    _, second = await _get_layout(app)
+
+    assert json.loads(first)["props"]["children"] == 1
+    assert json.loads(second)["props"]["children"] == 2
+
+
+@pytest.mark.asyncio
+async def test_layout_function_cached_with_ttl():
+    calls = []
+
+    def layout():
+        calls.append(1)
+        return html.Div(len(calls))
+
+    app = Flash(__name__, layout_cache_ttl=60)
+    app.layout = layout
+
+    _, first = await _get_layout(app)
+    served = len(calls)
+    _, second = await _get_layout(app)
+
+    assert first == second
+    assert len(calls) == served
+
+
+@pytest.mark.asyncio
+async def test_event_callback_layout_is_encoded_once(monkeypatch):
+    monkeypatch.setitem(HooksManager.hooks._ns, "layout", [])
+    encoded = []
+    plotly = _json.get_engine("plotly")
+
+    def dumps(obj):
+        encoded.append(obj)
+        return plotly(obj)
+
+    app = Flash(__name__, json_engine=dumps)
+    app.layout = html.Div([html.Button(id="b"), html.Div(id="o")], id="root")
+
+    @event_callback(Input("b", "n_clicks"))
+    async def count(n):
+        yield stream_props("o", {"children": n})
+
+    bodies = [(await _get_layout(app))[1] for _ in range(3)]
+
+    assert len(encoded) == 1
+    assert bodies[0] == bodies[2]
+    assert '"dash-event-stream"' in bodies[0]
@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+from dash import html
+
+from flash import Flash, Input, Output, callback
+from flash._limits import CallbackLimiter, CallbackQueueFull
+
+from .conftest import update_body
+
+
+def _body(output="out"):
+    return update_body(
+        f"{output}.children",
+        [{"id": "in", "property": "value", "value": 1}],
+        outputs={"id": output, "property": "children"},
+        changed=["in.value"],
+    )
+
+
+@pytest.mark.asyncio
+async def test_limiter_queues_then_rejects():
+    limiter = CallbackLimiter(1, max_queue=1, name="cb")
+    release = asyncio.Event()
+
+    async def hold():
+        async with limiter.slot():
+            await release.wait()
+
+    first = asyncio.ensure_future(hold())
+    second = asyncio.ensure_future(hold())
+    await asyncio.sleep(0)
+    assert (limiter.active, limiter.waiting) == (1, 1)
+
+    with pytest.raises(CallbackQueueFull) as err:
+        async with limiter.slot():
+            pass
+    assert err.value.status == 429
+
+    release.set()
+    await asyncio.gather(first, second)
+    assert limiter.stats()["admitted"] == 2
+    assert limiter.stats()["rejected"] == 1
+
+
+def test_limiter_options():
+    assert CallbackLimiter.from_options(None, None) is None
+    with pytest.raises(ValueError):
+        CallbackLimiter.from_options(None, 3)
+    with pytest.raises(ValueError):
+        CallbackLimiter(0)
+
+
+async def _post_concurrently(app, count, output="out"):
+    client = app.server.test_client()
+    async with app.server.test_app():
+        responses = await asyncio.gather(
+            *(
+                client.post("/_dash-update-component", json=_body(output))
+                for _ in range(count)
+            )
+        )
+    return responses
+
+
+@pytest.mark.asyncio
+async def test_callback_limit_answers_429():
+    app = Flash(__name__)
+    app.layout = html.Div()
+
+    @callback(
+        Output("out", "children"),
+        Input("in", "value"),
+        max_concurrency=1,
+        max_queue=0,
+    )
+    async def slow(value):
+        await asyncio.sleep(0.05)
+        return value
+
+    responses = await _post_concurrently(app, 3)
+
+    statuses = sorted(response.status_code for response in responses)
+    assert statuses == [200, 429, 429]
+    rejected = [r for r in responses if r.status_code == 429]
+    assert rejected[0].headers["Retry-After"] == "1"
+    assert app.callback_queue_stats()["out.children"]["rejected"] == 2
+
+
+@pytest.mark.asyncio
+async def test_app_limit_answers_503():
+    app = Flash(__name__, max_concurrency=1, max_queue=0)
+    app.layout = html.Div()
+
+    @callback(Output("out", "children"), Input("in", "value"))
+    async def slow(value):
+        await asyncio.sleep(0.05)
+        return value
+
+    statuses = sorted(r.status_code for r in await _post_concurrently(app, 2))
+    assert statuses == [200, 503]
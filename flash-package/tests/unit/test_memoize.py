@@ -0,0 +1,154 @@
+import json
+import time
+
+import pytest
+from dash import html
+
+from flash import Flash, Input, Output, callback, ctx
+from flash._memoize import (
+    CallbackCache,
+    build_cache_key,
+    get_callback_cache,
+)
+
+from .conftest import update_body
+
+
+def test_cache_evicts_least_recently_used():
+    cache = CallbackCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_cache_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = CallbackCache(ttl=10)
+    cache.set("a", 1)
+
+    now[0] += 5
+    assert cache.get("a") == 1
+    now[0] += 6
+    assert cache.get("a") is None
+
+
+def test_get_callback_cache():
+    assert get_callback_cache(None) is None
+    assert get_callback_cache(False) is None
+    assert get_callback_cache(5).maxsize == 5
+    assert get_callback_cache({"ttl": 3}).ttl == 3
+    cache = CallbackCache()
+    assert get_callback_cache(cache) is cache
+    with pytest.raises(ValueError):
+        get_callback_cache("yes")
+
+
+def test_cache_key_rules():
+    key = build_cache_key("fn", [1, 2], [], [{"id": "a"}], ["in.value"])
+
+    assert key == build_cache_key("fn", [1, 2], [], [{"id": "a"}], ["in.value"])
+    assert key != build_cache_key("fn", [1, 3], [], [{"id": "a"}], ["in.value"])
+    assert key != build_cache_key("fn", [1, 2], [], [{"id": "b"}], ["in.value"])
+    assert build_cache_key("fn", [1, 2], [1], None, None) == build_cache_key(
+        "fn", [1, 3], [1], None, None
+    )
+    assert build_cache_key("fn", {"a": 1, "b": 2}, ["b"], None, None) == (
+        build_cache_key("fn", {"a": 1, "b": 3}, ["b"], None, None)
+    )
+    assert build_cache_key("fn", [1], [], None, None, ["alice"]) != (
+        build_cache_key("fn", [1], [], None, None, ["bob"])
+    )
+
+
+@pytest.mark.asyncio
+async def test_memoized_callback_runs_once_per_input():
+    app = Flash(__name__)
+    app.layout = html.Div()
+    calls = []
+
+    @callback(Output("out", "children"), Input("in", "value"), memoize=True)
+    async def double(value):
+        calls.append(value)
+        return value * 2
+
+    async def post(value):
+        response = await client.post(
+            "/_dash-update-component",
+            json=update_body(
+                "out.children",
+                [{"id": "in", "property": "value", "value": value}],
+                outputs={"id": "out", "property": "children"},
+                changed=["in.value"],
+            ),
+        )
+        data = json.loads(await response.get_data(as_text=True))
+        return data["response"]["out"]["children"]
+
+    client = app.server.test_client()
+    async with app.server.test_app():
+        assert await post(2) == 4
+        assert await post(2) == 4
+        assert await post(3) == 6
+
+    assert calls == [2, 3]
+
+
+def test_memoize_rejects_background_callbacks():
+    with pytest.raises(Exception, match="memoize"):
+
+        @callback(
+            Output("out", "children"),
+            Input("in", "value"),
+            memoize=True,
+            background=True,
+        )
+        def slow(value):
+            return value
+
+
+@pytest.mark.asyncio
+async def test_memoize_key_caches_per_user():
+    app = Flash(__name__)
+    app.layout = html.Div()
+    calls = []
+
+    @callback(
+        Output("out", "children"),
+        Input("in", "value"),
+        memoize=True,
+        memoize_key=lambda: ctx.cookies.get("user"),
+    )
+    async def greet(value):
+        calls.append(ctx.cookies.get("user"))
+        return f"{value} {ctx.cookies.get('user')}"
+
+    async def post(client):
+        response = await client.post(
+            "/_dash-update-component",
+            json=update_body(
+                "out.children",
+                [{"id": "in", "property": "value", "value": "hi"}],
+                outputs={"id": "out", "property": "children"},
+                changed=["in.value"],
+            ),
+        )
+        data = json.loads(await response.get_data(as_text=True))
+        return data["response"]["out"]["children"]
+
+    async with app.server.test_app():
+        alice = app.server.test_client()
+        alice.set_cookie("localhost", "user", "alice")
+        bob = app.server.test_client()
+        bob.set_cookie("localhost", "user", "bob")
+
+        assert await post(alice) == "hi alice"
+        assert await post(bob) == "hi bob"
+        assert await post(alice) == "hi alice"
+
+    assert calls == ["alice", "bob"]
@@ -0,0 +1,101 @@
+import json
+
+import pytest
+from dash import html
+from dash.exceptions import PreventUpdate
+
+from flash import Flash, Input, Output, callback
+from flash._metrics import FlashMetrics, Histogram
+
+from .conftest import update_body
+
+
+def test_histogram_is_cumulative():
+    hist = Histogram((1.0, 2.0))
+    for value in (0.5, 1.5, 1.5, 5.0):
+        hist.observe(value)
+
+    assert list(hist.cumulative()) == [(1.0, 1), (2.0, 3), (float("inf"), 4)]
+    assert hist.snapshot()["count"] == 4
+    assert hist.snapshot()["sum"] == 8.5
+
+
+def test_render_prometheus_text():
+    metrics = FlashMetrics(
+        queue_stats=lambda: {
+            "app": {"waiting": 1, "active": 2, "rejected": 3, "queue_time": 0.5}
+        }
+    )
+    stats = metrics.callback('{"id":"a"}.children')
+    stats.phases["total"].observe(0.02)
+    stats.outcomes["ok"] += 1
+    stream = metrics.stream("stream")
+    stream.messages = 4
+    stream.dropped = 2
+
+    text = metrics.render()
+
+    assert "# TYPE flash_callback_seconds histogram" in text
+    assert (
+        'flash_callback_seconds_bucket{callback="{\\"id\\":\\"a\\"}.children",'
+        'phase="total",le="0.025"} 1'
+    ) in text
+    assert (
+        'flash_callback_requests_total{callback="{\\"id\\":\\"a\\"}.children",'
+        'outcome="ok"} 1'
+    ) in text
+    assert 'flash_queue_rejected_total{limiter="app"} 3' in text
+    assert 'flash_stream_messages_total{callback="stream"} 4' in text
+    assert 'flash_stream_dropped_total{callback="stream"} 2' in text
+    assert text.endswith("\n")
+
+
+def _app(**kwargs):
+    app = Flash(__name__, **kwargs)
+    app.layout = html.Div()
+
+    @callback(Output("out", "children"), Input("in", "value"))
+    async def update(value):
+        if value is None:
+            raise PreventUpdate
+        return value
+
+    return app
+
+
+def _body(value):
+    return update_body(
+        "out.children",
+        [{"id": "in", "property": "value", "value": value}],
+        outputs={"id": "out", "property": "children"},
+        changed=["in.value"],
+    )
+
+
+@pytest.mark.asyncio
+async def test_dispatch_records_outcomes():
+    app = _app()
+    client = app.server.test_client()
+    async with app.server.test_app():
+        await client.post("/_dash-update-component", json=_body(1))
+        await client.post("/_dash-update-component", json=_body(None))
+
+    snapshot = app.metrics.snapshot()["callbacks"]["out.children"]
+    assert snapshot["outcomes"] == {"ok": 1, "prevent_update": 1}
+    assert snapshot["phases"]["total"]["count"] == 2
+    assert snapshot["in_flight"] == 0
+    json.dumps(app.metrics.snapshot())
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_is_opt_in():
+    client = _app().server.test_client()
+    response = await client.get("/_flash/metrics")
+    # falls through to the index page catch-all
+    assert "flash_callback_seconds" not in await response.get_data(as_text=True)
+
+    client = _app(serve_metrics=True).server.test_client()
+    response = await client.get("/_flash/metrics")
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    assert "flash_callback_seconds" in await response.get_data(as_text=True)
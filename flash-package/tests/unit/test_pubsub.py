@@ -0,0 +1,292 @@
+import asyncio
+
+import pytest
+
+from flash import _channels, _pubsub, _streams
+
+
+def _reply(value):
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, str):
+        return b"+%s\r\n" % value.encode()
+    if isinstance(value, bytes):
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+    return b"*%d\r\n" % len(value) + b"".join(_reply(item) for item in value)
+
+
+class _Broker:
+    """A stand-in for the commands of a Redis server the backend uses."""
+
+    def __init__(self, subscribe_delay=0.0):
+        # like a busy broker, messages published meanwhile are not delivered
+        self.subscribe_delay = subscribe_delay
+        self.values = {}
+        self.subscribers = {}
+        self.commands = []
+        self.server = None
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        return f"redis://127.0.0.1:{self.server.sockets[0].getsockname()[1]}/0"
+
+    async def __aexit__(self, *exc_info):
+        self.server.close()
+
+    async def handle(self, reader, writer):
+        topics = set()
+        try:
+            while True:
+                name, *args = await _pubsub.read_reply(reader)
+                name = name.decode()
+                self.commands.append(name)
+                if name == "SUBSCRIBE":
+                    await asyncio.sleep(self.subscribe_delay)
+                writer.write(self.run(name, args, writer, topics))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            for topic in topics:
+                self.subscribers[topic].discard(writer)
+            writer.close()
+
+    def run(self, name, args, writer, topics):
+        if name == "ECHO":
+            return _reply(args[0])
+        if name == "SLOW":
+            # the reply never comes, like a broker stalled mid-command
+            return b""
+        if name == "PUBLISH":
+            topic, data = args
+            subscribers = self.subscribers.get(topic, set())
+            for subscriber in subscribers:
+                subscriber.write(_reply([b"message", topic, data]))
+            return _reply(len(subscribers))
+        if name in ("SUBSCRIBE", "UNSUBSCRIBE"):
+            replies = []
+            for topic in args:
+                if name == "SUBSCRIBE":
+                    self.subscribers.setdefault(topic, set()).add(writer)
+                    topics.add(topic)
+                else:
+                    self.subscribers.get(topic, set()).discard(writer)
+                    topics.discard(topic)
+                replies.append(_reply([name.lower().encode(), topic, len(topics)]))
+            return b"".join(replies)
+        if name == "SET":
+            key, value = args[:2]
+            if key in self.values:
+                return _reply(None)
+            self.values[key] = value
+            return _reply("OK")
+        if name == "EVAL":
+            key, token = args[2:4]
+            if self.values.get(key) != token:
+                return _reply(0)
+            if b"'del'" in args[0]:
+                del self.values[key]
+            return _reply(1)
+        return b"-ERR unknown command\r\n"
+
+
+async def _read(data):
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return await _pubsub.read_reply(reader)
+
+
+def test_encode_command():
+    assert _pubsub.encode_command("SET", b"k", 10) == (
+        b"*3\r\n$3\r\nSET\r\n$1\r\nk\r\n$2\r\n10\r\n"
+    )
+
+
+@pytest.mark.asyncio
+async def test_read_reply():
+    assert await _read(b"+OK\r\n") == "OK"
+    assert await _read(b":42\r\n") == 42
+    assert await _read(b"$5\r\na\r\nbc\r\n") == b"a\r\nbc"
+    assert await _read(b"$-1\r\n") is None
+    assert await _read(b"*2\r\n$1\r\na\r\n*1\r\n:1\r\n") == [b"a", [1]]
+    error = await _read(b"-ERR wrong\r\n")
+    assert isinstance(error, _pubsub.RespError)
+    assert str(error) == "ERR wrong"
+    with pytest.raises(_pubsub.RespError):
+        await _read(b"?\r\n")
+    with pytest.raises(asyncio.IncompleteReadError):
+        await _read(b"$5\r\nab")
+
+
+def test_backends_implement_every_operation():
+    with pytest.raises(TypeError):
+        _pubsub.PubSubBackend()  # pylint: disable=abstract-class-instantiated
+
+    class Partial(_pubsub.PubSubBackend):
+        async def publish(self, topic, data):
+            pass
+
+    with pytest.raises(TypeError):
+        Partial()  # pylint: disable=abstract-class-instantiated
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_fans_out():
+    backend = _pubsub.MemoryBackend()
+    first = backend.subscribe("t")
+    second = backend.subscribe("t", size=2)
+    for data in (b"a", b"b", b"c"):
+        await backend.publish("t", data)
+
+    assert [await anext(first) for _ in range(3)] == [b"a", b"b", b"c"]
+    assert [await anext(second) for _ in range(2)] == [b"b", b"c"]
+    assert second.dropped == 1
+
+    first.close()
+    second.close()
+    assert not backend.topics
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_leases():
+    backend = _pubsub.MemoryBackend()
+    assert await backend.acquire("lease", "a", 10)
+    assert not await backend.acquire("lease", "b", 10)
+    assert await backend.renew("lease", "a", 10)
+    assert not await backend.renew("lease", "b", 10)
+
+    await backend.release("lease", "b")
+    assert not await backend.acquire("lease", "b", 10)
+    await backend.release("lease", "a")
+    assert await backend.acquire("lease", "b", 0.01)
+    await asyncio.sleep(0.02)
+    assert await backend.acquire("lease", "a", 10)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_command_closes_the_connection():
+    async with _Broker() as url:
+        backend = _pubsub.RedisBackend(url)
+        assert await backend.command("ECHO", "a") == b"a"
+        connection = backend._commands  # pylint: disable=protected-access
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(backend.command("SLOW"), 0.05)
+        assert connection.closed
+        with pytest.raises(ConnectionResetError):
+            await connection.command("ECHO", "b")
+
+        # the next command of the backend goes through a new connection
+        assert await backend.command("ECHO", "c") == b"c"
+        assert backend._commands is not connection  # pylint: disable=protected-access
+        await backend.close()
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_subscriptions_are_ready():
+    backend = _pubsub.MemoryBackend()
+    subscription = backend.subscribe("t")
+    assert subscription.ready.done()
+    subscription.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_fans_out():
+    broker = _Broker(subscribe_delay=0.05)
+    async with broker as url:
+        backend = _pubsub.RedisBackend(url)
+        first = backend.subscribe("a")
+        second = backend.subscribe("b")
+        assert not first.ready.done()
+        await asyncio.wait_for(asyncio.gather(first.ready, second.ready), 1)
+
+        await backend.publish("a", b"1")
+        await backend.publish("b", b"2")
+        assert await asyncio.wait_for(anext(first), 1) == b"1"
+        assert await asyncio.wait_for(anext(second), 1) == b"2"
+
+        # a topic already received is ready at once
+        other = backend.subscribe("b")
+        assert other.ready.done()
+        other.close()
+
+        # subscribing again follows the UNSUBSCRIBE of the closed one
+        first.close()
+        again = backend.subscribe("a")
+        await asyncio.wait_for(again.ready, 1)
+        assert broker.commands.count("UNSUBSCRIBE") == 1
+        await backend.publish("a", b"3")
+        assert await asyncio.wait_for(anext(again), 1) == b"3"
+        assert first.queue.empty()
+        await backend.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_channel_ends_with_its_producer():
+    async with _Broker(subscribe_delay=0.05) as url:
+        backend = _pubsub.RedisBackend(url)
+        hub = _channels.ChannelHub(backend)
+
+        async def producer():
+            for i in range(3):
+                yield f"data: {i}\n\n".encode()
+
+        async def read():
+            return [frame async for frame in hub.subscribe("once", producer)]
+
+        # the producer starts once the channel is received, its first frames
+        # and its end are not lost
+        frames = await asyncio.wait_for(read(), 2)
+        assert frames == [f"data: {i}\n\n".encode() for i in range(3)]
+        await backend.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_session_streams_start_with_the_connection():
+    async with _Broker(subscribe_delay=0.05) as url:
+        backend = _pubsub.RedisBackend(url)
+        hub = _streams.StreamHub(backend)
+
+        async def frames():
+            yield b"data: 1\n\n"
+            await asyncio.sleep(10)
+
+        hub.get("s1").start("stream", frames())
+        connection = hub.read("s1")
+        # the stream starts on ALIVE, sent once the connection receives it
+        frame = await asyncio.wait_for(anext(connection), 2)
+        assert frame == _streams.tag_frame("stream", b"data: 1\n\n")
+
+        await connection.aclose()
+        hub.close()
+        await backend.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_leases():
+    async with _Broker() as url:
+        backend = _pubsub.RedisBackend(url)
+        assert await backend.acquire("lease", "a", 10)
+        assert not await backend.acquire("lease", "b", 10)
+        assert await backend.renew("lease", "a", 10)
+        assert not await backend.renew("lease", "b", 10)
+        await backend.release("lease", "a")
+        assert await backend.acquire("lease", "b", 10)
+        await backend.close()
+
+
+def test_get_backend():
+    assert isinstance(_pubsub.get_backend(None), _pubsub.MemoryBackend)
+    backend = _pubsub.get_backend("redis://:secret@broker:6380/2")
+    assert (backend.host, backend.port, backend.password, backend.db) == (
+        "broker",
+        6380,
+        "secret",
+        2,
+    )
+    with pytest.raises(ValueError):
+        _pubsub.get_backend("rediss://broker")
+    with pytest.raises(ValueError):
+        _pubsub.get_backend("kafka://broker")
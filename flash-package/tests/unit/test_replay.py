@@ -0,0 +1,139 @@
+import asyncio
+import os
+import re
+import threading
+
+import pytest
+from dash import html
+
+from flash import Flash, Input, _replay, event_callback, stream_props
+from flash._event_callback import SSE_CALLBACK_ENDPOINT, _SSEServerObjects
+
+
+def test_with_event_id_ids_the_last_event():
+    assert _replay.with_event_id("data: a\n\n", "k:1") == b"data: a\nid: k:1\n\n"
+
+
+@pytest.fixture(params=["memory", "disk"])
+def make_buffer(request, tmp_path):
+    if request.param == "memory":
+        return _replay.MemoryReplayBuffer
+    return lambda size: _replay.DiskReplayBuffer(size, str(tmp_path))
+
+
+@pytest.mark.asyncio
+async def test_buffer_keeps_the_last_frames(make_buffer):
+    buffer = make_buffer(8)
+    for seq in range(1, 21):
+        await buffer.append(seq, f"frame {seq}".encode())
+
+    assert buffer.first == 13
+    assert await buffer.since(17) == [
+        (seq, f"frame {seq}".encode()) for seq in (18, 19, 20)
+    ]
+    assert [seq for seq, _ in await buffer.since(0)] == list(range(13, 21))
+    assert await buffer.since(20) == []
+
+    await buffer.close()
+    assert await buffer.since(0) == []
+
+
+@pytest.mark.asyncio
+async def test_disk_buffer_works_in_a_thread(tmp_path, monkeypatch):
+    threads = set()
+    write = _replay.DiskReplayBuffer._write  # pylint: disable=protected-access
+
+    def recording_write(self, *args):
+        threads.add(threading.get_ident())
+        return write(self, *args)
+
+    monkeypatch.setattr(_replay.DiskReplayBuffer, "_write", recording_write)
+    buffer = _replay.DiskReplayBuffer(8, str(tmp_path))
+    for seq in range(1, 41):
+        await buffer.append(seq, b"x" * 100)
+
+    assert threads and threading.get_ident() not in threads
+    # segments of 2 frames, the ones out of the window are deleted
+    assert len(os.listdir(buffer.path)) <= 6
+
+    await buffer.close()
+    assert not os.path.exists(buffer.path)
+
+
+async def _frames(count):
+    for i in range(count):
+        yield stream_props("o", {"children": i})
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_stream_resumes_after_the_last_event_id():
+    hub = _replay.ReplayHub()
+    stream = hub.start("cb", _frames(5), size=100)
+
+    reader = stream.read()
+    first = [await anext(reader) for _ in range(2)]
+    await reader.aclose()
+    last_event_id = re.search(rb"id: (\S+)", first[-1]).group(1).decode()
+
+    resumed, after = hub.resume("cb", last_event_id)
+    assert resumed is stream
+    assert after == 2
+    rest = [frame async for frame in resumed.read(after)]
+    assert len(rest) == 4
+    assert rest[-1].startswith(_replay.DONE_FRAME.rstrip(b"\n"))
+
+    assert hub.resume("other", last_event_id) == (None, 0)
+    assert hub.resume("cb", "unknown:1") == (None, 0)
+    await hub.close()
+    assert not hub.streams
+
+
+@pytest.mark.asyncio
+async def test_stream_pauses_its_generator_for_a_slow_client():
+    produced = []
+
+    async def frames():
+        for i in range(100):
+            produced.append(i)
+            yield f"data: {i}\n\n"
+
+    hub = _replay.ReplayHub()
+    stream = hub.start("cb", frames(), size=10)
+    await asyncio.sleep(0.05)
+    assert stream.seq == 10
+    assert len(produced) <= 11
+
+    await hub.close()
+    assert stream.task.cancelled() or stream.task.done()
+
+
+@pytest.mark.asyncio
+async def test_resumable_event_callback_over_sse(tmp_path):
+    app = Flash(__name__, stream_replay_dir=str(tmp_path))
+    app.layout = html.Div([html.Button(id="b"), html.Div(id="o")])
+    runs = []
+
+    @event_callback(Input("b", "n_clicks"), resumable=True)
+    async def count(n):
+        runs.append(n)
+        async for frame in _frames(n):
+            yield frame
+
+    (callback_id,) = _SSEServerObjects.funcs
+    body = {"content": {"sse_callback_id": callback_id, "n": 3}}
+    headers = {"Accept": "text/event-stream"}
+    client = app.server.test_client()
+    async with app.server.test_app():
+        response = await client.post(SSE_CALLBACK_ENDPOINT, json=body, headers=headers)
+        data = await response.get_data()
+        ids = re.findall(rb"id: (\S+)", data)
+        assert len(ids) == 4
+
+        response = await client.post(
+            SSE_CALLBACK_ENDPOINT,
+            json=body,
+            headers={**headers, "Last-Event-ID": ids[0].decode()},
+        )
+        assert re.findall(rb"id: (\S+)", await response.get_data()) == ids[1:]
+    assert runs == [3]
@@ -0,0 +1,91 @@
+import asyncio
+import json
+
+import pytest
+from dash import html
+
+from flash import Flash, Input, Output, callback
+
+from .conftest import update_body
+
+
+def _body(value):
+    return update_body(
+        "out.children",
+        [{"id": "in", "property": "value", "value": value}],
+        outputs={"id": "out", "property": "children"},
+        changed=["in.value"],
+    )
+
+
+async def _run_concurrently(app, bodies):
+    client = app.server.test_client()
+    async with app.server.test_app():
+        responses = await asyncio.gather(
+            *(
+                client.post("/_dash-update-component", json=body)
+                for body in bodies
+            )
+        )
+        return [
+            json.loads(await response.get_data(as_text=True))["response"]["out"][
+                "children"
+            ]
+            for response in responses
+        ]
+
+
+def _app(calls, **kwargs):
+    app = Flash(__name__)
+    app.layout = html.Div()
+
+    @callback(Output("out", "children"), Input("in", "value"), **kwargs)
+    async def slow(value):
+        calls.append(value)
+        await asyncio.sleep(0.05)
+        return value * 2
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_requests_run_separately_by_default():
+    calls = []
+    app = _app(calls)
+
+    assert await _run_concurrently(app, [_body(1), _body(1)]) == [2, 2]
+    assert calls == [1, 1]
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_identical_invocations():
+    calls = []
+    app = _app(calls, single_flight=True)
+
+    results = await _run_concurrently(app, [_body(1), _body(1), _body(2)])
+
+    assert results == [2, 2, 4]
+    assert sorted(calls) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_single_flight_keeps_users_apart():
+    calls = []
+    app = _app(calls, single_flight=True)
+    client = app.server.test_client()
+
+    async with app.server.test_app():
+        await asyncio.gather(
+            client.post(
+                "/_dash-update-component",
+                json=_body(1),
+                headers={"Authorization": "Bearer a"},
+            ),
+            client.post(
+                "/_dash-update-component",
+                json=_body(1),
+                headers={"Authorization": "Bearer b"},
+            ),
+        )
+
+    assert calls == [1, 1]
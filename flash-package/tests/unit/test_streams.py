@@ -0,0 +1,266 @@
+import asyncio
+import json
+
+import pytest
+from dash import html
+
+from flash import Flash, Input, _streams, event_callback, stream_props
+from flash._event_callback import SSE_CALLBACK_ENDPOINT, _SSEServerObjects
+
+SESSION_URL = f"{SSE_CALLBACK_ENDPOINT}/session"
+CONTROL_URL = f"{SSE_CALLBACK_ENDPOINT}/control"
+
+
+def _counter_app():
+    app = Flash(__name__, stream_transport="multiplex")
+    app.layout = html.Div([html.Button(id="b"), html.Div(id="o")])
+
+    @event_callback(Input("b", "n_clicks"))
+    async def count(n):
+        for i in range(n):
+            yield stream_props("o", {"children": i})
+
+    (callback_id,) = _SSEServerObjects.funcs
+    return app, callback_id
+
+
+def test_tag_frame_names_every_event():
+    frame = _streams.tag_frame("s1", "data: a\n\ndata: b\n\n")
+    assert frame == b"event: s1\ndata: a\n\nevent: s1\ndata: b\n\n"
+    assert _streams.event_data(frame) == ["a", "b"]
+    assert _streams.done_frame("s1") == b"event: s1\ndata: [DONE]\n\n"
+
+
+def test_session_ids_are_bound_to_the_client():
+    hub = _streams.StreamHub(None)
+    session_id = hub.issue("client-a")
+
+    assert _streams.valid_stream_id(session_id)
+    assert hub.verify(session_id, "client-a")
+    assert not hub.verify(session_id, "client-b")
+    assert not hub.verify(session_id, None)
+    assert not hub.verify(session_id.split(".")[0] + ".forged", "client-a")
+    # signed with the server secret, accepted by every worker sharing it
+    shared = hub.issue("client-a", "secret")
+    assert _streams.StreamHub(None).verify(shared, "client-a", "secret")
+    assert not _streams.StreamHub(None).verify(session_id, "client-a")
+
+
+@pytest.mark.asyncio
+async def test_session_is_refused_to_other_clients():
+    app, callback_id = _counter_app()
+    owner = app.server.test_client()
+    other = app.server.test_client()
+
+    async with app.server.test_app():
+        response = await owner.post(SESSION_URL)
+        assert response.status_code == 200
+        assert "HttpOnly" in response.headers["Set-Cookie"]
+        session_id = (await response.get_json())["session"]
+
+        start = {
+            "session": session_id,
+            "action": "start",
+            "stream": "s1",
+            "content": {"sse_callback_id": callback_id, "n": 2},
+        }
+        response = await other.post(CONTROL_URL, json=start)
+        assert response.status_code == 403
+        response = await other.get(f"{SESSION_URL}/{session_id}")
+        assert response.status_code == 403
+        response = await owner.get(f"{SESSION_URL}/not-issued")
+        assert response.status_code == 403
+        assert not app._stream_sessions.sessions  # pylint: disable=protected-access
+
+        response = await owner.post(CONTROL_URL, json={**start, "stream": "a\nb"})
+        assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_session_streams_frames_of_its_owner():
+    app, callback_id = _counter_app()
+    client = app.server.test_client()
+
+    async with app.server.test_app():
+        session_id = (await (await client.post(SESSION_URL)).get_json())["session"]
+
+        async with client.request(f"{SESSION_URL}/{session_id}") as connection:
+            await connection.send_complete()
+            response = await client.post(
+                CONTROL_URL,
+                json={
+                    "session": session_id,
+                    "action": "start",
+                    "stream": "s1",
+                    "content": {"sse_callback_id": callback_id, "n": 2},
+                },
+            )
+            assert response.status_code == 204
+
+            body = b""
+            while b"[DONE]" not in body:
+                body += await asyncio.wait_for(connection.receive(), 5)
+            await connection.disconnect()
+
+    assert body.count(b"event: s1\n") == 3
+    assert body.endswith(_streams.done_frame("s1"))
+
+
+def _frame_props(frame):
+    """The ``(component_id, props)`` updates of an encoded frame."""
+    updates = []
+    for data in _streams.event_data(frame):
+        kind, component_id, props = json.loads(data)
+        updates.extend(props if kind == "[BATCH]" else [[component_id, props]])
+    return updates
+
+
+def test_coalescer_keeps_the_latest_value_of_each_prop():
+    coalescer = _streams.Coalescer()
+    assert not coalescer
+
+    coalescer.add(stream_props("a", {"children": 1, "title": "x"}))
+    coalescer.add(stream_props({"type": "b", "index": 0}, {"children": 1}))
+    coalescer.add(stream_props("a", {"children": 2}))
+    assert coalescer.merged == 1
+
+    assert _frame_props(coalescer.flush()) == [
+        ["a", {"children": 2, "title": "x"}],
+        [{"type": "b", "index": 0}, {"children": 1}],
+    ]
+    assert not coalescer
+
+
+def test_coalescer_keeps_other_messages_in_order():
+    coalescer = _streams.Coalescer()
+    coalescer.add(stream_props("a", {"children": 1}))
+    coalescer.add("data: plain\n\n")
+    coalescer.add(stream_props("a", {"children": 2}))
+
+    frames = _streams.event_data(coalescer.flush())
+    assert frames[1] == "plain"
+    assert [json.loads(frames[0])[2], json.loads(frames[2])[2]] == [
+        [["a", {"children": 1}]],
+        [["a", {"children": 2}]],
+    ]
+    assert coalescer.merged == 0
+
+
+async def _collect(items):
+    return [item async for item in items]
+
+
+@pytest.mark.asyncio
+async def test_throttle_merges_updates_produced_in_between():
+    async def fast():
+        for i in range(20):
+            yield stream_props("a", {"children": i})
+            await asyncio.sleep(0.001)
+
+    coalescer = _streams.Coalescer()
+    frames = await _collect(_streams.throttle(fast(), 0.05, coalescer))
+
+    assert 2 <= len(frames) < 20
+    # the first goes out at once, the last value always arrives
+    assert _frame_props(frames[0]) == [["a", {"children": 0}]]
+    assert _frame_props(frames[-1])[-1][1] == {"children": 19}
+    assert coalescer.merged == 20 - len(frames)
+
+
+@pytest.mark.asyncio
+async def test_throttle_sends_slow_generators_unchanged():
+    async def slow():
+        for i in range(3):
+            yield stream_props("a", {"children": i})
+            await asyncio.sleep(0.02)
+
+    frames = await _collect(_streams.throttle(slow(), 0.01, _streams.Coalescer()))
+    assert [_frame_props(frame) for frame in frames] == [
+        [["a", {"children": i}]] for i in range(3)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_throttle_flushes_before_raising():
+    async def failing():
+        for i in range(3):
+            yield stream_props("a", {"children": i})
+        raise RuntimeError("generator failed")
+
+    frames = []
+    with pytest.raises(RuntimeError):
+        async for frame in _streams.throttle(failing(), 10, _streams.Coalescer()):
+            frames.append(frame)
+    assert _frame_props(frames[-1]) == [["a", {"children": 2}]]
+
+
+async def _numbers(count, produced):
+    for i in range(count):
+        produced.append(i)
+        yield f"data: {i}\n\n"
+
+
+@pytest.mark.asyncio
+async def test_frame_queue_blocks_the_generator():
+    produced = []
+    queue = _streams.FrameQueue(3, "block")
+    frames = _streams.buffered(_numbers(10, produced), queue)
+
+    assert await anext(frames) == "data: 0\n\n"
+    await asyncio.sleep(0.01)
+    # the one read, the ones waiting and the one waiting for room
+    assert len(produced) == 5
+    assert len(queue) == 3
+
+    rest = [frame async for frame in frames]
+    assert rest == [f"data: {i}\n\n" for i in range(1, 10)]
+    assert queue.dropped == 0
+
+
+@pytest.mark.asyncio
+async def test_frame_queue_drops_the_oldest_frames():
+    queue = _streams.FrameQueue(3, "drop-oldest")
+    await queue.feed(_numbers(10, []))
+
+    assert [frame async for frame in queue] == [
+        f"data: {i}\n\n" for i in range(7, 10)
+    ]
+    assert queue.dropped == 7
+
+
+@pytest.mark.asyncio
+async def test_frame_queue_coalesces_updates():
+    async def updates():
+        for i in range(5):
+            yield stream_props("a", {"children": i})
+        yield "data: plain\n\n"
+        yield stream_props("b", {"children": 0})
+
+    queue = _streams.FrameQueue(2, "coalesce")
+    producer = asyncio.ensure_future(queue.feed(updates()))
+    await asyncio.sleep(0.01)
+    # the plain message waits for room, behind the merged updates
+    assert not producer.done()
+
+    frames = [frame async for frame in queue]
+    assert frames[3] == "data: plain\n\n"
+    assert [_frame_props(frame) for frame in frames[:3] + frames[4:]] == [
+        [["a", {"children": 0}]],
+        [["a", {"children": 1}]],
+        [["a", {"children": 4}]],
+        [["b", {"children": 0}]],
+    ]
+    assert queue.merged == 2
+    assert queue.dropped == 0
+
+
+@pytest.mark.asyncio
+async def test_frame_queue_raises_the_generator_error():
+    async def failing():
+        yield "data: 0\n\n"
+        raise RuntimeError("generator failed")
+
+    frames = _streams.buffered(failing(), _streams.FrameQueue(3))
+    assert await anext(frames) == "data: 0\n\n"
+    with pytest.raises(RuntimeError):
+        await anext(frames)
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+from dash import html
+
+from flash import Flash, Input, Output, callback
+
+from .conftest import update_body
+
+
+def _body(value):
+    return update_body(
+        "out.children",
+        [{"id": "in", "property": "value", "value": value}],
+        outputs={"id": "out", "property": "children"},
+        changed=["in.value"],
+    )
+
+
+def _app(calls):
+    app = Flash(__name__)
+    app.layout = html.Div()
+
+    @callback(Output("out", "children"), Input("in", "value"), supersede=True)
+    async def slow(value):
+        calls.append(value)
+        await asyncio.sleep(0.05)
+        return value
+
+    return app
+
+
+async def _post_in_order(app, values, headers):
+    client = app.server.test_client()
+    async with app.server.test_app():
+        tasks = []
+        for value in values:
+            tasks.append(
+                asyncio.ensure_future(
+                    client.post(
+                        "/_dash-update-component", json=_body(value), headers=headers
+                    )
+                )
+            )
+            await asyncio.sleep(0.01)
+        return [response.status_code for response in await asyncio.gather(*tasks)]
+
+
+@pytest.mark.asyncio
+async def test_newer_request_supersedes_older_one():
+    calls = []
+    app = _app(calls)
+
+    statuses = await _post_in_order(app, [1, 2], {"X-Dash-Client-Id": "page"})
+
+    assert statuses == [204, 200]
+    assert calls == [1, 2]
+    assert app.metrics.callbacks["out.children"].cancelled["superseded"] == 1
+
+
+@pytest.mark.asyncio
+async def test_requests_without_client_id_are_not_superseded():
+    app = _app([])
+
+    assert await _post_in_order(app, [1, 2], {}) == [200, 200]
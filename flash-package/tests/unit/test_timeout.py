@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+from dash import html
+
+from flash import Flash, Input, Output, callback
+
+from .test_limits import _post_concurrently
+
+
+@pytest.mark.asyncio
+async def test_timeout_answers_504():
+    app = Flash(__name__, callback_timeout=0.01)
+    app.layout = html.Div()
+    cancelled = []
+
+    @callback(Output("out", "children"), Input("in", "value"))
+    async def slow(value):
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(value)
+            raise
+        return value
+
+    @callback(Output("fast", "children"), Input("in", "value"), timeout=1)
+    async def fast(value):
+        await asyncio.sleep(0.05)
+        return value
+
+    (response,) = await _post_concurrently(app, 1)
+    (fast_response,) = await _post_concurrently(app, 1, "fast")
+
+    assert response.status_code == 504
+    assert cancelled == [1]
+    assert fast_response.status_code == 200
+    assert app.metrics.callbacks["out.children"].outcomes["timeout"] == 1
@@ -0,0 +1,158 @@
+import asyncio
+import json
+
+import pytest
+from dash import html
+
+from flash import (
+    Flash,
+    Input,
+    Output,
+    _websocket,
+    callback,
+    event_callback,
+    stream_props,
+)
+from flash._event_callback import _SSEServerObjects
+
+from .conftest import update_body
+
+
+def _message(data):
+    header, payload = data.split("\n", 1)
+    return json.loads(header), payload
+
+
+async def _no_close(_code):
+    pass
+
+
+@pytest.mark.asyncio
+async def test_streams_are_written_in_turns_after_responses():
+    sent = []
+    release = asyncio.Event()
+
+    async def send(data):
+        await release.wait()
+        sent.append(_message(data)[0])
+
+    connection = _websocket.SocketConnection(send, _no_close)
+
+    async def busy():
+        for i in range(10):
+            await connection.put("event", "busy", str(i))
+
+    async def quiet():
+        await connection.put("event", "quiet", "x")
+        await connection.put("done", "quiet")
+
+    connection.run("busy", busy())
+    connection.run("quiet", quiet())
+    await asyncio.sleep(0)
+    await connection.put("response", "cb", "{}", status=200)
+    writer = connection.start()
+    release.set()
+    while len(sent) < 13:
+        await asyncio.sleep(0.01)
+    writer.cancel()
+
+    order = [(m["type"], m["id"]) for m in sent]
+    assert order[0] == ("response", "cb")
+    # the quiet stream doesn't wait for the busy one to be written out
+    assert order.index(("done", "quiet")) < 5
+    assert [m for m in order if m[1] == "busy"] == [("event", "busy")] * 10
+    assert not connection.outboxes
+
+
+@pytest.mark.asyncio
+async def test_full_stream_queue_pauses_its_generator_only():
+    connection = _websocket.SocketConnection(lambda data: asyncio.sleep(0), _no_close)
+    produced = []
+
+    async def stream():
+        for i in range(_websocket.SEND_QUEUE_SIZE + 5):
+            await connection.put("event", "s", str(i))
+            produced.append(i)
+
+    connection.run("s", stream())
+    await asyncio.sleep(0.05)
+    assert len(produced) == _websocket.SEND_QUEUE_SIZE
+
+    await connection.put("response", "cb", "{}")
+    assert list(connection.responses)
+
+    writer = connection.start()
+    await asyncio.sleep(0.05)
+    assert len(produced) == _websocket.SEND_QUEUE_SIZE + 5
+    assert not connection.responses
+    writer.cancel()
+
+
+@pytest.mark.asyncio
+async def test_failed_writer_closes_the_connection(caplog):
+    closed = []
+
+    async def send(_data):
+        raise ConnectionError("gone")
+
+    async def close(code):
+        closed.append(code)
+
+    connection = _websocket.SocketConnection(send, close)
+    connection.run("s", asyncio.sleep(10))
+    writer = connection.start()
+    await connection.put("response", "cb", "{}")
+    await asyncio.wait((writer,))
+    await asyncio.sleep(0)
+
+    assert closed == [1011]
+    assert not connection.tasks
+    assert "Websocket writer failed" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_websocket_carries_callbacks_and_streams():
+    app = Flash(__name__, websocket=True)
+    app.layout = html.Div([html.Button(id="b"), html.Div(id="o")])
+
+    @callback(Output("out", "children"), Input("in", "value"))
+    async def echo(value):
+        return f"got {value}"
+
+    @event_callback(Input("b", "n_clicks"))
+    async def count(n):
+        for i in range(n):
+            yield stream_props("o", {"children": i})
+
+    (callback_id,) = _SSEServerObjects.funcs
+    client = app.server.test_client()
+    async with app.server.test_app():
+        async with client.websocket("/_flash/ws") as ws:
+            await ws.send(
+                json.dumps(
+                    {
+                        "type": "callback",
+                        "id": "1",
+                        "body": update_body(
+                            "out.children",
+                            [{"id": "in", "property": "value", "value": 3}],
+                            {"id": "out", "property": "children"},
+                        ),
+                    }
+                )
+            )
+            header, payload = _message(await ws.receive())
+            assert header == {"type": "response", "id": "1", "status": 200}
+            assert "got 3" in payload
+
+            await ws.send(
+                json.dumps(
+                    {
+                        "type": "start",
+                        "id": "s1",
+                        "content": {"sse_callback_id": callback_id, "n": 2},
+                    }
+                )
+            )
+            kinds = [_message(await ws.receive())[0]["type"] for _ in range(3)]
+            assert kinds == ["event", "event", "done"]